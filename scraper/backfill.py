@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+
+from resilience import BatchSummary
+from scraper import HISTORY_DEFAULT_DAYS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def merge_intervals(intervals):
+    """
+    Merge overlapping or adjacent inclusive date intervals
+    
+    Args:
+        intervals (iterable): (start, end) date tuples
+    
+    Returns:
+        list: Sorted, non-overlapping (start, end) tuples
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def find_gaps(covered, start, end):
+    """
+    Find the parts of a date range that are not covered yet
+    
+    Args:
+        covered (list): Merged (start, end) date tuples already stored
+        start (date): First day of the requested range
+        end (date): Last day of the requested range
+    
+    Returns:
+        list: (start, end) date tuples that still need to be fetched
+    """
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class LocalStore:
+    """
+    A JSON document store backed by a local directory
+    """
+    
+    def __init__(self, directory):
+        """
+        Initialize the store
+        
+        Args:
+            directory (str): Directory to keep the documents in
+        """
+        self.directory = directory
+    
+    def read_json(self, key):
+        path = os.path.join(self.directory, key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+    
+    def write_json(self, key, data):
+        path = os.path.join(self.directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+
+class S3Store:
+    """
+    A JSON document store backed by an S3Manager
+    """
+    
+    def __init__(self, s3_manager, prefix='history/'):
+        """
+        Initialize the store
+        
+        Args:
+            s3_manager (S3Manager): Manager for the bucket holding the documents
+            prefix (str, optional): Key prefix for all documents
+        """
+        self.s3_manager = s3_manager
+        self.prefix = prefix
+    
+    def read_json(self, key):
+        content = self.s3_manager.download_data(f"{self.prefix}{key}")
+        if content is None:
+            return None
+        return json.loads(content)
+    
+    def write_json(self, key, data):
+        self.s3_manager.upload_data(data, f"{self.prefix}{key}", file_format='json')
+
+
+class BackfillManager:
+    """
+    A class to keep stored daily history complete while only fetching missing days
+    
+    For every symbol the store holds the history series and a coverage
+    manifest listing the date intervals already scraped. A request fetches
+    only the gaps between the manifest and the requested range.
+    """
+    
+    def __init__(self, scraper, store):
+        """
+        Initialize the backfill manager
+        
+        Args:
+            scraper (StockScraper): Scraper used to fetch missing history
+            store (LocalStore or S3Store): Where series and manifests are kept
+        """
+        self.scraper = scraper
+        self.store = store
+    
+    def _series_key(self, symbol):
+        return f"series/{symbol}.json"
+    
+    def _manifest_key(self, symbol):
+        return f"manifests/{symbol}.json"
+    
+    def load_coverage(self, symbol):
+        """
+        Load the covered date intervals for a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+        
+        Returns:
+            list: Merged (start, end) date tuples
+        """
+        manifest = self.store.read_json(self._manifest_key(symbol)) or {}
+        return merge_intervals(
+            (date.fromisoformat(start), date.fromisoformat(end))
+            for start, end in manifest.get('intervals', [])
+        )
+    
+    def load_series(self, symbol):
+        """
+        Load the stored daily history for a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+        
+        Returns:
+            list: Daily records ordered by date
+        """
+        return self.store.read_json(self._series_key(symbol)) or []
+    
+    def backfill(self, symbol, start_date=None, end_date=None):
+        """
+        Make sure a date range is stored for a symbol and return it
+        
+        Only the gaps in the coverage manifest are scraped. Today is never
+        recorded as covered because its row can still change, so a daily
+        refresh fetches a one-day delta.
+        
+        Args:
+            symbol (str): Stock symbol or URL suffix on investing.com
+            start_date (str, optional): Start date in YYYY-MM-DD format, defaults
+                to HISTORY_DEFAULT_DAYS before end_date, as for scrape_historical_data
+            end_date (str, optional): End date in YYYY-MM-DD format, defaults to today
+        
+        Returns:
+            list: Daily records within the range, ordered by date
+        """
+        today = date.today()
+        end = date.fromisoformat(end_date) if end_date else today
+        start = date.fromisoformat(start_date) if start_date else end - timedelta(days=HISTORY_DEFAULT_DAYS)
+        if start > end:
+            raise ValueError(f"start_date {start} is after end_date {end}")
+        
+        coverage = self.load_coverage(symbol)
+        gaps = find_gaps(coverage, start, end)
+        
+        if gaps:
+            logger.info(f"Backfilling {symbol}: {len(gaps)} missing intervals in {start} to {end}")
+            series = {row['date']: row for row in self.load_series(symbol)}
+            
+            for gap_start, gap_end in gaps:
+                rows = self.scraper.scrape_historical_data(symbol, gap_start.isoformat(), gap_end.isoformat())
+                for row in rows:
+                    series[row['date']] = row
+            
+            final_end = today - timedelta(days=1)
+            newly_covered = [(gap_start, min(gap_end, final_end)) for gap_start, gap_end in gaps if gap_start <= final_end]
+            coverage = merge_intervals(coverage + newly_covered)
+            
+            stored = [series[day] for day in sorted(series)]
+            
+            # Write the series before the manifest so coverage never claims missing rows
+            self.store.write_json(self._series_key(symbol), stored)
+            self.store.write_json(self._manifest_key(symbol), {
+                'symbol': symbol,
+                'intervals': [[s.isoformat(), e.isoformat()] for s, e in coverage],
+                'updated_at': datetime.now().isoformat(),
+            })
+        else:
+            logger.info(f"History for {symbol} from {start} to {end} already stored")
+            stored = self.load_series(symbol)
+        
+        first, last = start.isoformat(), end.isoformat()
+        return [row for row in stored if first <= row['date'] <= last]
+    
+    def backfill_many(self, symbols, start_date=None, end_date=None):
+        """
+        Backfill several symbols, logging and skipping any that fail
+        
+        Each symbol goes through the scraper's per-symbol wrapper, as in
+        scrape_multiple_stocks: transient errors are retried under its retry
+        policy, open circuits are skipped and every outcome is recorded in a
+        fresh batch_summary.
+        
+        Args:
+            symbols (list): Stock symbols or URL suffixes
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+        
+        Returns:
+            list: Daily records for all symbols
+        """
+        self.scraper.batch_summary = BatchSummary()
+        all_rows = []
+        for symbol in symbols:
+            all_rows.extend(self.scraper._scrape_symbol_safe(symbol, start_date, end_date, fetch=self.backfill))
+        return all_rows
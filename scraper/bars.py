@@ -0,0 +1,199 @@
+import logging
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DEFAULT_BAR_INTERVALS, DataProcessor, parse_interval
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+_processor = DataProcessor()
+
+
+def _microseconds(timestamp):
+    """
+    Get a timestamp as wall-clock microseconds since the epoch, and its timezone
+    """
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    elif isinstance(timestamp, np.datetime64):
+        timestamp = pd.Timestamp(timestamp)
+    delta = timestamp.replace(tzinfo=None) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds, timestamp.tzinfo
+
+
+class BarAggregator:
+    """
+    Builds OHLC bars for several intervals as quotes arrive
+    
+    Each symbol holds only its open bar of every interval, so a quote costs
+    O(1) per interval. A quote past the end of an open bar closes it and
+    opens the next, and the bars come out as DataProcessor.resample_bars
+    builds them from the same quotes. Within a symbol, quotes must arrive in
+    time order; a quote older than the open bar of an interval is counted in
+    late and left out of that interval.
+    """
+    
+    def __init__(self, intervals=DEFAULT_BAR_INTERVALS):
+        """
+        Initialize the aggregator
+        
+        Args:
+            intervals (iterable, optional): Bar intervals such as '5m', see
+                data_processor.parse_interval
+        """
+        self.intervals = tuple(intervals)
+        self._steps = [parse_interval(interval) * 1000000 for interval in self.intervals]
+        # Open bars of every symbol, one per interval: [start, open, high, low, close, ticks, timezone]
+        self._bars = {}
+        self.late = 0
+    
+    def symbols(self):
+        """
+        List the symbols the aggregator holds bars for
+        
+        Returns:
+            list: Sorted stock symbols
+        """
+        return sorted(self._bars)
+    
+    def update(self, symbol, price, timestamp):
+        """
+        Add one quote to the open bars of its symbol
+        
+        Args:
+            symbol (str): Stock symbol
+            price (float): Price of the quote
+            timestamp (datetime or str): Time of the quote
+        
+        Returns:
+            list: Bars the quote closed, as dictionaries like those of current()
+        """
+        now, timezone = _microseconds(timestamp)
+        bars = self._bars.get(symbol)
+        if bars is None:
+            bars = self._bars[symbol] = [None] * len(self._steps)
+        
+        closed = []
+        for index, step in enumerate(self._steps):
+            start = now - now % step
+            bar = bars[index]
+            if bar is None or start > bar[0]:
+                if bar is not None:
+                    closed.append(self._bar_record(symbol, index, bar))
+                bars[index] = [start, price, price, price, price, 1, timezone]
+            elif start < bar[0]:
+                self.late += 1
+            else:
+                if price > bar[2]:
+                    bar[2] = price
+                if price < bar[3]:
+                    bar[3] = price
+                bar[4] = price
+                bar[5] += 1
+        return closed
+    
+    def update_record(self, record, price_field='current_price'):
+        """
+        Add a stock data record, parsing its price if it is still a string
+        
+        Args:
+            record (dict): Record as returned by scrape_stock_data or clean_data
+            price_field (str, optional): Field holding the price
+        
+        Returns:
+            list: Bars the record closed; none when it has no usable price or time
+        """
+        price = record.get(price_field)
+        if isinstance(price, str):
+            price = _processor._clean_price(price)
+        timestamp = record.get('timestamp')
+        if price is None or (isinstance(price, float) and math.isnan(price)) or not timestamp:
+            return []
+        return self.update(record['symbol'], price, timestamp)
+    
+    def current(self, symbol):
+        """
+        Get the open bars of a symbol as they stand
+        
+        Args:
+            symbol (str): Stock symbol
+        
+        Returns:
+            dict: Bars keyed by interval, each a dictionary with symbol,
+                interval, timestamp (start of the bar), open, high, low,
+                close and ticks
+        """
+        bars = self._bars.get(symbol) or []
+        return {
+            self.intervals[index]: self._bar_record(symbol, index, bar)
+            for index, bar in enumerate(bars) if bar is not None
+        }
+    
+    def flush(self):
+        """
+        Close every open bar, as at the end of a stream
+        
+        Returns:
+            list: The bars that were open, by symbol and interval
+        """
+        closed = [
+            self._bar_record(symbol, index, bar)
+            for symbol in self.symbols()
+            for index, bar in enumerate(self._bars[symbol]) if bar is not None
+        ]
+        self._bars = {}
+        return closed
+    
+    def warm_up(self, bars):
+        """
+        Continue from bars built by DataProcessor.resample_bars
+        
+        The last bar of every symbol becomes its open bar, so quotes arriving
+        after the stored history keep updating it.
+        
+        Args:
+            bars (dict): DataFrames of bars keyed by interval; intervals the
+                aggregator does not build are ignored
+        
+        Returns:
+            int: Number of open bars seeded
+        """
+        seeded = 0
+        for index, interval in enumerate(self.intervals):
+            frame = bars.get(interval)
+            if frame is None or frame.empty:
+                continue
+            last = frame.groupby('symbol', sort=False).tail(1)
+            for symbol, timestamp, open_, high, low, close, ticks in zip(
+                    last['symbol'], last['timestamp'], last['open'], last['high'], last['low'], last['close'], last['ticks']):
+                start, timezone = _microseconds(timestamp)
+                symbol_bars = self._bars.setdefault(symbol, [None] * len(self._steps))
+                symbol_bars[index] = [start, open_, high, low, close, int(ticks), timezone]
+                seeded += 1
+        logger.info(f"Seeded {seeded} open bars for {len(self._bars)} symbols")
+        return seeded
+    
+    def _bar_record(self, symbol, index, bar):
+        """
+        Turn a bar's state into a dictionary
+        """
+        start, open_, high, low, close, ticks, timezone = bar
+        return {
+            'symbol': symbol,
+            'interval': self.intervals[index],
+            'timestamp': (_EPOCH + timedelta(microseconds=start)).replace(tzinfo=timezone),
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'ticks': ticks,
+        }
@@ -0,0 +1,89 @@
+"""
+Benchmark resampling quotes into bars for several intervals
+
+Quotes are synthetic snapshots of a symbol universe, arriving every few
+seconds. The baseline resamples each symbol and interval separately with
+pandas, the way consumers bucket stored quotes today. resample_bars sorts
+once and builds every interval in one vectorized pass each, and
+BarAggregator updates the open bars quote by quote.
+"""
+import argparse
+import logging
+import random
+import time
+
+import pandas as pd
+
+from bars import BarAggregator
+from data_processor import DEFAULT_BAR_INTERVALS, DataProcessor, parse_interval
+
+
+def synthetic_quotes(count, symbols=500, seed=0):
+    """
+    Generate processed quotes in time order, interleaving the symbols
+    
+    Args:
+        count (int): Number of quotes
+        symbols (int): Number of symbols
+        seed (int): Random seed
+    
+    Returns:
+        pandas.DataFrame: Quotes with symbol, current_price and timestamp columns
+    """
+    rng = random.Random(seed)
+    ticks = [index // symbols for index in range(count)]
+    return pd.DataFrame({
+        'symbol': [f'stock-{index % symbols}' for index in range(count)],
+        'current_price': [rng.uniform(1, 5000) for _ in range(count)],
+        'timestamp': pd.Timestamp('2025-05-08 13:30') + pd.to_timedelta([tick * 5 for tick in ticks], unit='s'),
+    })
+
+
+def per_symbol(df, intervals):
+    """
+    Resample every symbol and interval separately with pandas
+    """
+    bars = {}
+    for interval in intervals:
+        frames = []
+        for symbol, group in df.groupby('symbol', sort=True):
+            resampled = group.set_index('timestamp')['current_price'].resample(f'{parse_interval(interval)}s')
+            frames.append(resampled.ohlc().dropna().assign(symbol=symbol))
+        bars[interval] = pd.concat(frames)
+    return bars
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quotes', type=int, default=500000)
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--intervals', nargs='+', default=list(DEFAULT_BAR_INTERVALS))
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    df = synthetic_quotes(args.quotes, args.symbols)
+    processor = DataProcessor()
+    print(f"{args.quotes} quotes of {args.symbols} symbols, intervals {' '.join(args.intervals)}")
+    print(f"{'engine':>14} {'seconds':>9} {'quotes/s':>11}")
+    
+    start = time.perf_counter()
+    per_symbol(df, args.intervals)
+    elapsed = time.perf_counter() - start
+    print(f"{'per symbol':>14} {elapsed:>9.3f} {args.quotes / elapsed:>11.0f}")
+    
+    start = time.perf_counter()
+    bars = processor.resample_bars(df, args.intervals)
+    elapsed = time.perf_counter() - start
+    print(f"{'resample_bars':>14} {elapsed:>9.3f} {args.quotes / elapsed:>11.0f}")
+    
+    aggregator = BarAggregator(args.intervals)
+    rows = list(zip(df['symbol'], df['current_price'], df['timestamp'].dt.to_pydatetime()))
+    start = time.perf_counter()
+    for symbol, price, timestamp in rows:
+        aggregator.update(symbol, price, timestamp)
+    elapsed = time.perf_counter() - start
+    print(f"{'streaming':>14} {elapsed:>9.3f} {args.quotes / elapsed:>11.0f}"
+          f"  ({elapsed / args.quotes * 1e6:.2f} us per quote)")
+    
+    print(' '.join(f"{interval}: {len(frame)} bars" for interval, frame in bars.items()))
@@ -0,0 +1,105 @@
+"""
+Benchmark wall-clock time of scrape_multiple_stocks at different concurrency
+levels against a local stand-in for investing.com
+
+The stand-in server returns the fixture instrument page after a fixed delay,
+so the numbers reflect how well each mode overlaps network latency rather
+than the speed of the real site.
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scraper import StockScraper
+
+FIXTURE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'nike.html')
+
+
+def start_stand_in_server(latency=0.05, page_path=FIXTURE_PAGE):
+    """
+    Start a threaded HTTP server that serves a fixture page for any path
+    
+    Args:
+        latency (float): Seconds to sleep before answering each request
+        page_path (str): Path to the HTML page to serve
+    
+    Returns:
+        ThreadingHTTPServer: Running server, stop it with shutdown()
+    """
+    with open(page_path, 'rb') as f:
+        body = f.read()
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256
+    
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_benchmark(symbol_count=100, latency=0.05, levels=(1, 2, 5, 10, 20, 50)):
+    """
+    Time one batch scrape per concurrency level
+    
+    Args:
+        symbol_count (int): Number of symbols per batch
+        latency (float): Simulated per-request server latency in seconds
+        levels (tuple): Concurrency levels to measure
+    
+    Returns:
+        list: (concurrency, seconds, records) tuples
+    """
+    server = start_stand_in_server(latency=latency)
+    host, port = server.server_address
+    symbols = [f'stock-{i}' for i in range(symbol_count)]
+    results = []
+    
+    try:
+        for concurrency in levels:
+            scraper = StockScraper()
+            scraper.base_url = f'http://{host}:{port}/equities/'
+            
+            start = time.perf_counter()
+            data = scraper.scrape_multiple_stocks(symbols, concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            
+            results.append((concurrency, elapsed, len(data)))
+    finally:
+        server.shutdown()
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+    
+    logging.getLogger('scraper').setLevel(logging.WARNING)
+    
+    print(f"{args.symbols} symbols, {args.latency * 1000:.0f} ms simulated latency")
+    print(f"{'concurrency':>12} {'seconds':>10} {'symbols/s':>10} {'speedup':>8}")
+    
+    baseline = None
+    for concurrency, elapsed, records in run_benchmark(args.symbols, args.latency):
+        baseline = baseline or elapsed
+        print(f"{concurrency:>12} {elapsed:>10.2f} {records / elapsed:>10.1f} {baseline / elapsed:>7.1f}x")
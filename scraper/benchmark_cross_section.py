@@ -0,0 +1,90 @@
+"""
+Benchmark cross-sectional analytics over a large symbol universe
+
+Returns are synthetic: every symbol loads on one market factor plus noise,
+with some symbols listed partway through the history so pairwise counts
+differ. Baselines are the pandas calls consumers use today. The peak
+traced memory of the rolling correlations is reported next to the size a
+stacked rolling().corr() frame of every window would take.
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from cross_section import correlation_matrix, rank_screen, rolling_beta, rolling_correlation
+
+
+def synthetic_returns(rows, symbols, listed=0.1, seed=0):
+    """
+    Generate factor-model returns, a share of the symbols listed late
+    
+    Args:
+        rows (int): Number of bars
+        symbols (int): Number of symbols
+        listed (float): Share of symbols without returns for the first half
+        seed (int): Random seed
+    
+    Returns:
+        tuple: (returns DataFrame, market returns Series)
+    """
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, rows)
+    values = market[:, None] * rng.uniform(0.2, 1.8, symbols) + rng.normal(0, 0.01, (rows, symbols))
+    values[:rows // 2, :int(symbols * listed)] = np.nan
+    index = pd.date_range('2024-01-01', periods=rows, freq='D')
+    return pd.DataFrame(values, index=index, columns=[f'stock-{i}' for i in range(symbols)]), pd.Series(market, index=index)
+
+
+def timed(run):
+    """
+    Get the seconds and result of a call
+    """
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--window', type=int, default=60)
+    parser.add_argument('--step', type=int, default=20)
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    returns, market = synthetic_returns(args.rows, args.symbols)
+    ends = range(args.window, args.rows + 1, args.step)
+    print(f"{args.symbols} symbols, {args.rows} rows, window {args.window}, step {args.step} ({len(ends)} windows)")
+    print(f"{'computation':>22} {'pandas s':>9} {'engine s':>9} {'speedup':>8}")
+    
+    baseline, expected = timed(lambda: returns.corr())
+    elapsed, result = timed(lambda: correlation_matrix(returns))
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    print(f"{'correlation matrix':>22} {baseline:>9.2f} {elapsed:>9.2f} {baseline / elapsed:>8.1f}")
+    
+    # Every pandas window is a fresh corr(); a few of them give the rate
+    sampled = list(ends)[:3]
+    baseline, _ = timed(lambda: [returns.iloc[end - args.window:end].corr() for end in sampled])
+    baseline *= len(ends) / len(sampled)
+    tracemalloc.start()
+    elapsed, count = timed(lambda: sum(1 for _ in rolling_correlation(returns, args.window, step=args.step)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'rolling correlation':>22} {baseline:>9.2f} {elapsed:>9.2f} {baseline / elapsed:>8.1f}")
+    
+    baseline, _ = timed(lambda: returns.rolling(args.window).cov(market) / market.rolling(args.window).var().to_numpy()[:, None])
+    elapsed, _ = timed(lambda: rolling_beta(returns, market, args.window))
+    print(f"{'rolling beta':>22} {baseline:>9.2f} {elapsed:>9.2f} {baseline / elapsed:>8.1f}")
+    
+    prices = (1 + returns.fillna(0)).cumprod()
+    elapsed, _ = timed(lambda: rank_screen(prices, lookback=20, top=50))
+    print(f"{'rank screen':>22} {'':>9} {elapsed:>9.2f}")
+    
+    stacked = args.rows * args.symbols * args.symbols * 8
+    print(f"rolling correlation peak {peak / 1e6:.0f} MB traced; a stacked rolling().corr() "
+          f"of every row would hold {stacked / 1e9:.1f} GB")
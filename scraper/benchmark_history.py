@@ -0,0 +1,95 @@
+"""
+Benchmark repeated date range queries over a large stock history
+
+Each query asks for one symbol over a random range of days. The scan
+baseline is what filter_by_date used to do on every call: re-parse the
+timestamp strings and build a boolean mask over every row. The sorted
+index parses once when the PriceHistory is built and then answers each
+query with two binary searches.
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+from history import PriceHistory
+
+
+def synthetic_history(symbols, days, seed=0):
+    """
+    Generate a history of one close per symbol per day, shuffled
+    
+    Args:
+        symbols (int): Number of symbols
+        days (int): Days of history per symbol
+        seed (int): Random seed
+    
+    Returns:
+        pandas.DataFrame: History with ISO timestamp strings, as stored
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2000-01-03 20:00', periods=days, freq='D').strftime('%Y-%m-%dT%H:%M:%S')
+    df = pd.DataFrame({
+        'symbol': np.repeat([f'stock-{i}' for i in range(symbols)], days),
+        'timestamp': np.tile(np.asarray(timestamps), symbols),
+        'current_price': rng.uniform(1, 500, size=symbols * days),
+    })
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def scan(df, symbol, start_date, end_date):
+    """
+    Filter the way filter_by_date used to, parsing and masking every row
+    """
+    df = df.copy()
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df = df[df['symbol'] == symbol]
+    df = df[df['timestamp'] >= pd.to_datetime(start_date)]
+    return df[df['timestamp'] <= pd.to_datetime(end_date)]
+
+
+def time_queries(label, query, queries):
+    start = time.perf_counter()
+    rows = sum(len(query(*args)) for args in queries)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>26} {elapsed / len(queries) * 1e3:>12.3f} {rows:>10}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--days', type=int, default=5000, help="Days of history per symbol")
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--scan-queries', type=int, default=5, help="Queries to time the scan baselines on")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    df = synthetic_history(args.symbols, args.days)
+    total = len(df)
+    rng = np.random.default_rng(1)
+    days = pd.date_range('2000-01-03', periods=args.days, freq='D')
+    starts = rng.integers(0, args.days - 30, size=args.queries)
+    lengths = rng.integers(1, 30, size=args.queries)
+    queries = [
+        (f'stock-{symbol}', days[start].strftime('%Y-%m-%d'), days[start + length].strftime('%Y-%m-%d'))
+        for symbol, start, length in zip(rng.integers(0, args.symbols, size=args.queries), starts, lengths)
+    ]
+    print(f"{args.symbols} symbols x {args.days} days = {total} rows, {args.queries} queries")
+    print(f"{'engine':>26} {'ms/query':>12} {'rows':>10}")
+    
+    time_queries('parse and scan', lambda *query: scan(df, *query), queries[:args.scan_queries])
+    
+    processor = DataProcessor()
+    parsed = processor.filter_by_date(df)
+    time_queries('filter_by_date, parsed', lambda symbol, start, end: processor.filter_by_date(
+        parsed[parsed['symbol'] == symbol], start, end), queries[:args.scan_queries])
+    
+    start = time.perf_counter()
+    index = PriceHistory(df)
+    print(f"{'PriceHistory build':>26} {(time.perf_counter() - start) * 1e3:>12.3f} {total:>10}")
+    time_queries('PriceHistory.between', index.between, queries)
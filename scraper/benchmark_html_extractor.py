@@ -0,0 +1,94 @@
+"""
+Benchmark parse throughput of the streaming quote extractor against the full
+BeautifulSoup parse on the fixture pages
+
+Fixture pages are padded with filler markup before and after the quote so
+they approach the size of a real instrument page.
+"""
+import argparse
+import os
+import time
+
+from html_extractor import extract_quote_fast
+from scraper import extract_quote_with_soup
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_padded_fixtures(target_kb=300):
+    """
+    Load the fixture pages and pad them to roughly target_kb kilobytes
+    
+    Args:
+        target_kb (int): Approximate size of each padded page
+    
+    Returns:
+        dict: Padded HTML keyed by fixture name
+    """
+    article = (
+        '<article class="news-item"><a href="/news/stock-market-news/item">Markets extend gains</a>'
+        '<p>Stocks rose in afternoon trading as investors weighed the latest economic data.</p>'
+        '<ul><li>Volume</li><li>Open</li><li>Close</li></ul></article>\n'
+    )
+    style = '<style>.c{color:#333;margin:0 auto;padding:4px 8px}</style>\n'
+    
+    pages = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+            html = f.read()
+        
+        repeats = max(1, target_kb * 1024 // len(article))
+        head_padding = style * (repeats // 10)
+        body_padding = article * repeats
+        html = html.replace('</head>', head_padding + '</head>', 1)
+        html = html.replace('</main>', body_padding + '</main>', 1)
+        pages[name] = html
+    
+    return pages
+
+
+def time_extractor(extractor, pages, rounds):
+    """
+    Run an extractor over every page a number of times
+    
+    Args:
+        extractor (callable): Function taking an HTML string
+        pages (list): HTML pages
+        rounds (int): Number of passes over the pages
+    
+    Returns:
+        float: Seconds taken
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            extractor(html)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-kb', type=int, default=300)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    
+    pages = load_padded_fixtures(args.size_kb)
+    html_pages = list(pages.values())
+    total_mb = sum(len(html) for html in html_pages) * args.rounds / (1024 * 1024)
+    page_count = len(html_pages) * args.rounds
+    
+    for name, html in pages.items():
+        assert extract_quote_fast(html) == extract_quote_with_soup(html), name
+    
+    print(f"{len(html_pages)} fixture pages of ~{args.size_kb} KB, {args.rounds} rounds")
+    print(f"{'extractor':>15} {'seconds':>9} {'pages/s':>9} {'MB/s':>8}")
+    
+    results = {}
+    for label, extractor in (('beautifulsoup', extract_quote_with_soup), ('streaming', extract_quote_fast)):
+        elapsed = time_extractor(extractor, html_pages, args.rounds)
+        results[label] = elapsed
+        print(f"{label:>15} {elapsed:>9.3f} {page_count / elapsed:>9.1f} {total_mb / elapsed:>8.1f}")
+    
+    print(f"speedup: {results['beautifulsoup'] / results['streaming']:.0f}x")
@@ -0,0 +1,119 @@
+"""
+Benchmark indicator throughput: vectorized over a stored history, incremental
+per quote, and the per-symbol rolling recompute consumers did before
+
+The history is synthetic hourly bars for many symbols. The recompute
+baseline runs pandas rolling and ewm once per symbol, which is what a
+consumer refreshing its moving averages from scratch pays on every update.
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import DEFAULT_WINDOWS, IndicatorEngine, compute_indicators
+
+
+def synthetic_history(symbols, rows_per_symbol, seed=0):
+    """
+    Generate synthetic bars for a symbol universe
+    
+    Args:
+        symbols (int): Number of symbols
+        rows_per_symbol (int): Bars per symbol
+        seed (int): Random seed
+    
+    Returns:
+        pandas.DataFrame: History with symbol, timestamp, close, high, low and volume
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.01, size=(symbols, rows_per_symbol))
+    closes = rng.uniform(10, 500, size=(symbols, 1)) * np.exp(np.cumsum(steps, axis=1))
+    timestamps = pd.date_range('2024-01-02 14:00', periods=rows_per_symbol, freq='h')
+    return pd.DataFrame({
+        'symbol': np.repeat([f'stock-{i}' for i in range(symbols)], rows_per_symbol),
+        'timestamp': np.tile(timestamps, symbols),
+        'close': closes.ravel(),
+        'high': (closes * 1.005).ravel(),
+        'low': (closes * 0.995).ravel(),
+        'volume': rng.integers(1000, 100000, size=symbols * rows_per_symbol).astype(float),
+    })
+
+
+def recompute_per_symbol(df, windows=DEFAULT_WINDOWS):
+    """
+    Compute the moving averages, volatility and channels symbol by symbol
+    """
+    frames = []
+    for _, rows in df.groupby('symbol', sort=False):
+        rows = rows.sort_values('timestamp')
+        prices = rows['close']
+        columns = {}
+        for length in windows['sma']:
+            columns[f'sma_{length}'] = prices.rolling(length).mean()
+        for length in windows['ema']:
+            columns[f'ema_{length}'] = prices.ewm(span=length, adjust=False).mean()
+        for length in windows['volatility']:
+            columns[f'volatility_{length}'] = prices.pct_change().rolling(length).std()
+        for length in windows['channel']:
+            columns[f'channel_high_{length}'] = rows['high'].rolling(length).max()
+            columns[f'channel_low_{length}'] = rows['low'].rolling(length).min()
+        frames.append(rows.assign(**columns))
+    return pd.concat(frames)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=500, help="Bars per symbol")
+    parser.add_argument('--updates', type=int, default=200000, help="Incremental updates to time")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    df = synthetic_history(args.symbols, args.rows)
+    total = len(df)
+    print(f"{args.symbols} symbols x {args.rows} bars = {total} rows, windows {DEFAULT_WINDOWS}")
+    print(f"{'engine':>26} {'seconds':>9} {'rows/s':>11}")
+    
+    start = time.perf_counter()
+    recompute_per_symbol(df)
+    elapsed = time.perf_counter() - start
+    print(f"{'per-symbol recompute':>26} {elapsed:>9.3f} {total / elapsed:>11.0f}")
+    
+    start = time.perf_counter()
+    compute_indicators(df)
+    elapsed = time.perf_counter() - start
+    print(f"{'compute_indicators':>26} {elapsed:>9.3f} {total / elapsed:>11.0f}")
+    
+    engine = IndicatorEngine()
+    start = time.perf_counter()
+    engine.warm_up(df)
+    elapsed = time.perf_counter() - start
+    print(f"{'IndicatorEngine.warm_up':>26} {elapsed:>9.3f} {total / elapsed:>11.0f}")
+    
+    # New quotes for random symbols, each continuing its stored history
+    rng = np.random.default_rng(1)
+    picks = rng.integers(0, args.symbols, size=args.updates)
+    prices = rng.uniform(10, 500, size=args.updates)
+    volumes = rng.integers(1000, 100000, size=args.updates).astype(float)
+    timestamp = df['timestamp'].max() + pd.Timedelta(hours=1)
+    symbols = [f'stock-{i}' for i in range(args.symbols)]
+    
+    start = time.perf_counter()
+    for pick, price, volume in zip(picks.tolist(), prices.tolist(), volumes.tolist()):
+        engine.update(symbols[pick], price, timestamp=timestamp, volume=volume)
+    update_elapsed = time.perf_counter() - start
+    print(f"{'IndicatorEngine.update':>26} {update_elapsed:>9.3f} {args.updates / update_elapsed:>11.0f}")
+    
+    # Refreshing one symbol from scratch rescans its whole history
+    one_symbol = df[df['symbol'] == symbols[0]]
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compute_indicators(one_symbol)
+    elapsed = time.perf_counter() - start
+    print(f"{'rescan one symbol':>26} {elapsed / rounds * 1e6:>9.0f} us per refresh")
+    print(f"{'incremental update':>26} {update_elapsed / args.updates * 1e6:>9.1f} us per refresh")
@@ -0,0 +1,79 @@
+"""
+Benchmark processing sharded by symbol across worker counts
+
+Quotes are synthetic scraped records for a symbol universe. The serial
+baseline is DataProcessor.process_data (plus compute_indicators with
+--indicators); process_sharded runs the same stages per symbol shard on a
+process pool. Speedups are bounded by the cores of the machine, reported
+alongside the results.
+"""
+import argparse
+import logging
+import os
+import pickle
+import random
+import time
+
+from data_processor import DataProcessor
+from indicators import DEFAULT_WINDOWS, compute_indicators
+from parallel import pack_column, process_sharded, to_columns
+
+
+def synthetic_quotes(count, symbols=2000, seed=0):
+    """
+    Generate scraped quotes, interleaving the symbols like a poll loop
+    
+    Args:
+        count (int): Number of quotes
+        symbols (int): Number of symbols
+        seed (int): Random seed
+    
+    Returns:
+        list: Stock data dictionaries as scrape_stock_data returns them
+    """
+    rng = random.Random(seed)
+    quotes = []
+    for index in range(count):
+        tick, symbol = divmod(index, symbols)
+        quotes.append({
+            'symbol': f'stock-{symbol}',
+            'company_name': f'Company {symbol} Inc (C{symbol})',
+            'current_price': f'{rng.uniform(1, 5000):,.2f}',
+            'price_change': f'{rng.uniform(-50, 50):+.2f}',
+            'timestamp': f'2025-05-08T{13 + tick // 3600:02d}:{tick // 60 % 60:02d}:{tick % 60:02d}',
+        })
+    return quotes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quotes', type=int, default=400000)
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--indicators', action='store_true', help="Add per-symbol indicators as well")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    windows = DEFAULT_WINDOWS if args.indicators else None
+    
+    quotes = synthetic_quotes(args.quotes, args.symbols)
+    dict_bytes = len(pickle.dumps(quotes, protocol=pickle.HIGHEST_PROTOCOL))
+    packed = {name: pack_column(column) for name, column in to_columns(quotes).items()}
+    packed_bytes = len(pickle.dumps(packed, protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"{args.quotes} quotes of {args.symbols} symbols on {os.cpu_count()} cores")
+    print(f"shard payload: {dict_bytes / 1e6:.1f} MB as pickled dicts, {packed_bytes / 1e6:.1f} MB packed")
+    print(f"{'engine':>18} {'seconds':>9} {'rows/s':>11} {'speedup':>8}")
+    
+    start = time.perf_counter()
+    df = DataProcessor().process_data(quotes)
+    if windows is not None:
+        compute_indicators(df, price_column='current_price', windows=windows)
+    baseline = time.perf_counter() - start
+    print(f"{'serial':>18} {baseline:>9.3f} {args.quotes / baseline:>11.0f} {1:>8.2f}")
+    
+    for workers in args.workers:
+        start = time.perf_counter()
+        process_sharded(quotes, workers=workers, windows=windows)
+        elapsed = time.perf_counter() - start
+        label = f'{workers} workers'
+        print(f"{label:>18} {elapsed:>9.3f} {args.quotes / elapsed:>11.0f} {baseline / elapsed:>8.2f}")
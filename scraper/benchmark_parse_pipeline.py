@@ -0,0 +1,88 @@
+"""
+Benchmark throughput of scrape_multiple_stocks_pipelined with different
+numbers of parser processes on canned quote pages
+
+Pages are served from memory, so the numbers reflect how parsing scales with
+cores rather than network latency. Run it on a machine with several cores;
+on a single core extra processes only add overhead.
+"""
+import argparse
+import logging
+import os
+import time
+
+from benchmark_html_extractor import load_padded_fixtures
+from scraper import StockScraper
+
+
+class CannedScraper(StockScraper):
+    """
+    A StockScraper that serves fixture pages instead of making requests
+    """
+    
+    def __init__(self, pages, **kwargs):
+        super().__init__(**kwargs)
+        self.pages = pages
+    
+    def _get_page_content(self, url):
+        symbol = url.rsplit('/', 1)[-1]
+        return self.pages[symbol.split('-', 1)[0]]
+
+
+def run_benchmark(pages, symbol_count, parse_workers, batch_size):
+    """
+    Scrape a batch of canned pages through the pipeline
+    
+    Args:
+        pages (dict): HTML pages keyed by symbol prefix
+        symbol_count (int): Number of distinct symbols to scrape
+        parse_workers (int): Number of parser processes, 0 for in-process
+        batch_size (int): Pages sent to a parser process at once
+    
+    Returns:
+        float: Seconds taken
+    """
+    prefixes = sorted(pages)
+    symbols = [f"{prefixes[i % len(prefixes)]}-{i}" for i in range(symbol_count)]
+    scraper = CannedScraper(pages)
+    
+    start = time.perf_counter()
+    result = scraper.scrape_multiple_stocks_pipelined(symbols, parse_workers=parse_workers, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    
+    assert len(result) == symbol_count, f"expected {symbol_count} records, got {len(result)}"
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=400)
+    parser.add_argument('--size-kb', type=int, default=300)
+    parser.add_argument('--batch-size', type=int, default=25)
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help='Parser process counts to compare, defaults to 0, 1, 2, 4, ... up to the CPU count')
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    # Only pages that parse to a full quote, keyed by the prefix used for symbols
+    pages = {
+        name.split('.')[0].split('-')[0]: html
+        for name, html in load_padded_fixtures(args.size_kb).items()
+        if 'historical' not in name and 'delisted' not in name
+    }
+    
+    workers = args.workers
+    if workers is None:
+        workers = [0, 1]
+        while workers[-1] * 2 <= (os.cpu_count() or 1):
+            workers.append(workers[-1] * 2)
+    
+    print(f"{args.symbols} pages of ~{args.size_kb} KB, batch size {args.batch_size}, {os.cpu_count()} CPUs")
+    print(f"{'parse_workers':>13} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+    
+    baseline = None
+    for count in workers:
+        elapsed = run_benchmark(pages, args.symbols, count, args.batch_size)
+        baseline = baseline or elapsed
+        print(f"{count:>13} {elapsed:>9.3f} {args.symbols / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
@@ -0,0 +1,111 @@
+"""
+Measure the memory a full day of ticks takes as dicts and as a QuoteBatch
+
+Ticks are synthetic quotes for a symbol universe polled at a fixed
+interval through a trading session. Dict memory is measured on a sample and
+scaled up, as a full day of dicts does not fit in a Lambda; the QuoteBatch
+is built at full size.
+"""
+import argparse
+import gc
+import logging
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+from itertools import islice
+
+from data_processor import DataProcessor
+from quotes import QuoteBatch
+from writers import WRITE_BATCH_SIZE
+
+LAMBDA_MEMORY_MB = 256
+
+
+def synthetic_ticks(symbols, ticks_per_symbol, interval, seed=0):
+    """
+    Generate synthetic ticks in time order
+    
+    Args:
+        symbols (int): Number of symbols in the universe
+        ticks_per_symbol (int): Ticks per symbol over the session
+        interval (float): Seconds between ticks of one symbol
+        seed (int): Random seed
+    
+    Returns:
+        generator: Stock data dictionaries as scrape_stock_data returns them
+    """
+    rng = random.Random(seed)
+    opened_at = datetime(2025, 5, 8, 13, 30)
+    for tick in range(ticks_per_symbol):
+        timestamp = (opened_at + timedelta(seconds=tick * interval)).isoformat()
+        for i in range(symbols):
+            yield {
+                'symbol': f'stock-{i}',
+                'company_name': f'Company {i} Inc (C{i})',
+                'current_price': f'{rng.uniform(1, 5000):,.2f}',
+                'price_change': f'{rng.uniform(-50, 50):+.2f}',
+                'timestamp': timestamp,
+            }
+
+
+def measure(build):
+    """
+    Get the memory held by what build() returns
+    
+    Args:
+        build (callable): Function building the object to measure
+    
+    Returns:
+        tuple: (bytes still allocated afterwards, peak bytes while building)
+    """
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current, peak
+
+
+def build_batch(ticks):
+    batch = QuoteBatch()
+    while True:
+        chunk = list(islice(ticks, WRITE_BATCH_SIZE))
+        if not chunk:
+            return batch
+        batch.extend(chunk)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--interval', type=float, default=5.0, help="Seconds between polls of a symbol")
+    parser.add_argument('--hours', type=float, default=6.5, help="Length of the trading session")
+    parser.add_argument('--sample', type=int, default=100000, help="Ticks held as dicts to measure")
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    
+    ticks_per_symbol = int(args.hours * 3600 / args.interval)
+    total = ticks_per_symbol * args.symbols
+    sample_ticks = max(1, args.sample // args.symbols)
+    sample = sample_ticks * args.symbols
+    processor = DataProcessor()
+    
+    print(f"{args.symbols} symbols every {args.interval:g}s for {args.hours:g}h: {total} ticks")
+    print(f"{'representation':>16} {'bytes/tick':>11} {'full day MB':>12} {'peak MB':>9}")
+    
+    cases = [
+        ('scraped dicts', lambda: list(synthetic_ticks(args.symbols, sample_ticks, args.interval)), sample),
+        ('cleaned dicts', lambda: processor.clean_data(synthetic_ticks(args.symbols, sample_ticks, args.interval)), sample),
+        ('QuoteBatch', lambda: build_batch(synthetic_ticks(args.symbols, ticks_per_symbol, args.interval)), total),
+    ]
+    for label, build, count in cases:
+        held, peak = measure(build)
+        per_tick = held / count
+        full_day_mb = per_tick * total / (1024 * 1024)
+        # Sampled peaks are scaled up like the held memory
+        peak_mb = peak / count * total / (1024 * 1024)
+        print(f"{label:>16} {per_tick:>11.1f} {full_day_mb:>12.1f} {peak_mb:>9.1f}")
+    
+    print(f"Lambda memory setting: {LAMBDA_MEMORY_MB} MB")
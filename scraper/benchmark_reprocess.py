@@ -0,0 +1,108 @@
+"""
+Measure peak memory of reprocessing stored quotes all at once and in chunks
+
+The stored data is a JSON array of scraped quotes, as the Lambda uploads
+them. Loading it whole and calling process_data holds every record and the
+full DataFrame at once, so peak memory grows with the data. reprocess reads,
+processes and writes one chunk at a time, so its peak should stay flat as
+the data grows.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from data_processor import DataProcessor
+from indicators import ChunkedIndicators
+from reprocess import frame_records, reprocess
+from writers import write_ndjson
+
+LAMBDA_MEMORY_MB = 256
+
+
+def write_quotes(path, count, symbols=500, seed=0):
+    """
+    Write synthetic scraped quotes as a JSON array, in time order
+    
+    Args:
+        path (str): Output path
+        count (int): Number of quotes
+        symbols (int): Number of symbols
+        seed (int): Random seed
+    """
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        f.write('[')
+        for index in range(count):
+            tick, symbol = divmod(index, symbols)
+            record = {
+                'symbol': f'stock-{symbol}',
+                'company_name': f'Company {symbol} Inc (C{symbol})',
+                'current_price': f'{rng.uniform(1, 5000):,.2f}',
+                'price_change': f'{rng.uniform(-50, 50):+.2f}',
+                'timestamp': f'2025-05-{8 + tick // 4680:02d}T{13 + tick % 4680 // 720:02d}:{tick % 720 // 12:02d}:{tick % 12 * 5:02d}',
+            }
+            f.write((',' if index else '') + json.dumps(record))
+        f.write(']')
+
+
+def whole(source, output, indicators):
+    """
+    Load the whole file, process it in one call and write the result
+    """
+    with open(source) as f:
+        records = json.load(f)
+    df = DataProcessor().process_data(records)
+    if indicators is not None:
+        df = indicators.compute(df)
+    with open(output, 'w') as f:
+        return write_ndjson(frame_records(df), f, compact=True)
+
+
+def measure(run):
+    """
+    Get the seconds and peak traced bytes of a call
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50000, 200000], help="Quotes to reprocess")
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--indicators', action='store_true', help="Add rolling indicators as well")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    print(f"{'quotes':>8} {'engine':>8} {'seconds':>8} {'rows/s':>9} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = os.path.join(temp_dir, 'quotes.json')
+        output = os.path.join(temp_dir, 'out.ndjson')
+        for size in args.sizes:
+            write_quotes(source, size)
+            
+            def make_indicators():
+                return ChunkedIndicators(price_column='current_price') if args.indicators else None
+            
+            cases = [
+                ('whole', lambda: whole(source, output, make_indicators())),
+                ('chunked', lambda: reprocess([source], output, chunk_size=args.chunk_size, indicators=make_indicators())),
+            ]
+            for label, run in cases:
+                elapsed, peak = measure(run)
+                print(f"{size:>8} {label:>8} {elapsed:>8.2f} {size / elapsed:>9.0f} {peak / (1024 * 1024):>8.1f}")
+    
+    print(f"Lambda memory setting: {LAMBDA_MEMORY_MB} MB")
@@ -0,0 +1,106 @@
+"""
+Benchmark rows/sec and bytes written by the streaming writers against the
+list-based save_to_csv/save_to_json they replaced
+
+Records are synthetic quotes shaped like scrape_stock_data output. The
+legacy functions are reproduced here as they were, so both sides write the
+same data to a temporary directory.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+from writers import COMPRESSION_EXTENSIONS, open_output, write_csv, write_json_array, write_ndjson
+
+
+def synthetic_records(count, seed=0):
+    """
+    Generate synthetic quote records
+    
+    Args:
+        count (int): Number of records
+        seed (int): Random seed
+    
+    Returns:
+        generator: Stock data dictionaries
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        price = rng.uniform(1, 5000)
+        yield {
+            'symbol': f'stock-{i % 5000}',
+            'company_name': f'Company {i % 5000} Inc (C{i % 5000})',
+            'current_price': f'{price:,.2f}',
+            'price_change': f'{rng.uniform(-50, 50):+.2f}',
+            'timestamp': f'2025-05-08T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}',
+        }
+
+
+def legacy_csv(records, filename):
+    with open(filename, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=records[0].keys())
+        writer.writeheader()
+        for data in records:
+            writer.writerow(data)
+
+
+def legacy_json(records, filename):
+    with open(filename, 'w') as jsonfile:
+        json.dump(records, jsonfile, indent=4)
+
+
+def streaming(writer, compression=None, **kwargs):
+    def write(records, filename):
+        with open_output(filename, compression) as f:
+            writer(records, f, **kwargs)
+    return write
+
+
+CASES = [
+    ('save_to_csv (legacy)', 'csv', legacy_csv, True),
+    ('csv', 'csv', streaming(write_csv), False),
+    ('csv gzip', 'csv', streaming(write_csv, 'gzip'), False),
+    ('save_to_json (legacy)', 'json', legacy_json, True),
+    ('json array', 'json', streaming(write_json_array), False),
+    ('json array compact', 'json', streaming(write_json_array, compact=True), False),
+    ('ndjson compact', 'ndjson', streaming(write_ndjson, compact=True), False),
+    ('ndjson compact gzip', 'ndjson', streaming(write_ndjson, 'gzip', compact=True), False),
+    ('ndjson compact zstd', 'ndjson', streaming(write_ndjson, 'zstd', compact=True), False),
+]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    print(f"{args.rows} synthetic quote records")
+    print(f"{'writer':>22} {'seconds':>9} {'rows/s':>10} {'MB written':>11}")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for label, extension, write, needs_list in CASES:
+            compression = next((name for name in ('gzip', 'zstd') if name in label), None)
+            filename = os.path.join(temp_dir, f"out.{extension}{COMPRESSION_EXTENSIONS[compression]}")
+            
+            # The legacy writers need the whole list, so building it is part of their cost
+            start = time.perf_counter()
+            records = synthetic_records(args.rows)
+            if needs_list:
+                records = list(records)
+            try:
+                write(records, filename)
+            except ImportError as e:
+                print(f"{label:>22} skipped: {e}")
+                continue
+            elapsed = time.perf_counter() - start
+            
+            size_mb = os.path.getsize(filename) / (1024 * 1024)
+            print(f"{label:>22} {elapsed:>9.3f} {args.rows / elapsed:>10.0f} {size_mb:>11.2f}")
+            os.remove(filename)
@@ -0,0 +1,355 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Rows of returns multiplied at once when summing over a long history, bounding temporaries
+CROSS_SECTION_BLOCK_ROWS = int(os.environ.get('CROSS_SECTION_BLOCK_ROWS', '256'))
+
+# Symbols whose pairs with every other symbol are computed at once, so working
+# memory beyond an N x N result is a few CROSS_SECTION_TILE_COLUMNS x N matrices
+CROSS_SECTION_TILE_COLUMNS = int(os.environ.get('CROSS_SECTION_TILE_COLUMNS', '256'))
+
+# Windows a rolling computation slides before its running sums are rebuilt,
+# so rounding errors of adding and removing rows cannot build up
+RESUM_WINDOWS = 8
+
+_processor = DataProcessor()
+
+
+def align_prices(df, interval='1d', price_column='current_price', time_column='timestamp', fill_limit=None):
+    """
+    Align the prices of every symbol on a common time grid
+    
+    Quotes are resampled into bars of the interval by
+    DataProcessor.resample_bars, and each symbol's closing price fills one
+    column. The grid holds every bar start at which any symbol traded. A
+    symbol without a quote in a bar carries its last price forward, so
+    returns across the gap are zero rather than missing.
+    
+    Args:
+        df (pandas.DataFrame): Processed quotes with a symbol column
+        interval (str, optional): Grid interval such as '5m' or '1d'
+        price_column (str, optional): Column holding the price
+        time_column (str, optional): Column holding the quote time
+        fill_limit (int, optional): Most bars a price is carried forward,
+            unlimited by default
+    
+    Returns:
+        pandas.DataFrame: Closing prices indexed by bar start, one column per
+            symbol in sorted order, NaN before a symbol's first quote
+    """
+    bars = _processor.resample_bars(df, [interval], price_column=price_column, time_column=time_column)[interval]
+    prices = bars.pivot(index='timestamp', columns='symbol', values='close')
+    prices = prices.ffill(limit=fill_limit)
+    prices.columns.name = None
+    logger.info(f"Aligned {prices.shape[1]} symbols on {prices.shape[0]} {interval} bars")
+    return prices
+
+
+def to_returns(prices):
+    """
+    Get simple returns from aligned prices
+    
+    Args:
+        prices (pandas.DataFrame): Prices as returned by align_prices
+    
+    Returns:
+        pandas.DataFrame: Returns of every bar over the one before, NaN where
+            either price is missing
+    """
+    return prices.pct_change(fill_method=None)
+
+
+class _PairSums:
+    """
+    Running sums from which the covariance of pairs of symbols follows
+    
+    Rows are added and removed as blocks, each a handful of matrix products,
+    so the state does not grow with the number of rows. The sums cover the
+    pairs of a tile of symbols with every symbol, or of every symbol with
+    every other when no tile is given. With no missing returns they are the
+    cross products plus column sums and sums of squares. Otherwise every
+    pair keeps its own count and sums over the rows where both are present,
+    matching pandas pairwise-complete statistics; without a tile, the sums
+    of the second symbol of a pair are read from the transposed state.
+    """
+    
+    def __init__(self, columns, complete, tile=None):
+        self.complete = complete
+        self.tile = slice(0, columns) if tile is None else tile
+        rows = self.tile.stop - self.tile.start
+        self.products = np.zeros((rows, columns))
+        self.other_sums = self.other_squares = None
+        if complete:
+            self.count = 0
+            self.sums = np.zeros(columns)
+            self.squares = np.zeros(columns)
+        else:
+            self.count = np.zeros((rows, columns))
+            self.sums = np.zeros((rows, columns))
+            self.squares = np.zeros((rows, columns))
+            if tile is not None:
+                self.other_sums = np.zeros((rows, columns))
+                self.other_squares = np.zeros((rows, columns))
+    
+    def update(self, entering, leaving=None):
+        """
+        Add the rows of a block of returns and remove those of another
+        
+        Both blocks go through the same matrix products, the leaving rows
+        weighted by -1, so each sum is updated in one pass.
+        """
+        block = entering if leaving is None or not len(leaving) else np.concatenate([entering, leaving])
+        signs = np.ones((len(block), 1))
+        signs[len(entering):] = -1.0
+        tile = self.tile
+        if self.complete:
+            signed = signs * block
+            self.count += int(signs.sum())
+            self.sums += signed.sum(axis=0)
+            self.squares += (signed * block).sum(axis=0)
+            self.products += signed[:, tile].T @ block
+            return
+        present = ~np.isnan(block)
+        values = np.where(present, block, 0.0)
+        present = present.astype(np.float64)
+        signed = signs * values[:, tile]
+        signed_present = signs * present[:, tile]
+        self.count += signed_present.T @ present
+        # sums[i, j] sums symbol i over the rows where j is present as well
+        self.sums += signed.T @ present
+        self.squares += (signed * values[:, tile]).T @ present
+        self.products += signed.T @ values
+        if self.other_sums is not None:
+            self.other_sums += signed_present.T @ values
+            self.other_squares += signed_present.T @ (values * values)
+    
+    def matrix(self, correlation, min_periods, out=None):
+        """
+        Get the covariance or correlation matrix of the rows added so far
+        
+        The result is finished CROSS_SECTION_TILE_COLUMNS rows at a time, in
+        place in out when given, so temporaries stay at a few tile by N
+        matrices.
+        """
+        rows = self.products.shape[0]
+        if out is None:
+            out = np.empty(self.products.shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for start in range(0, rows, CROSS_SECTION_TILE_COLUMNS):
+                stop = min(start + CROSS_SECTION_TILE_COLUMNS, rows)
+                self._finish(slice(start, stop), correlation, min_periods, out[start:stop])
+        return out
+    
+    def _finish(self, rows, correlation, min_periods, out):
+        """
+        Write the statistics of some rows of the state into out
+        """
+        symbols = slice(self.tile.start + rows.start, self.tile.start + rows.stop)
+        if self.complete:
+            count = self.count
+            sums, other_sums = self.sums[symbols, None], self.sums
+            squares, other_squares = self.squares[symbols, None], self.squares
+            undefined = np.full(out.shape, count < max(min_periods, 2))
+        else:
+            count = self.count[rows]
+            sums, squares = self.sums[rows], self.squares[rows]
+            if self.other_sums is None:
+                other_sums, other_squares = self.sums[:, symbols].T, self.squares[:, symbols].T
+            else:
+                other_sums, other_squares = self.other_sums[rows], self.other_squares[rows]
+            undefined = count < max(min_periods, 2)
+        
+        np.multiply(sums, other_sums, out=out)
+        out /= count
+        np.subtract(self.products[rows], out, out=out)
+        if not correlation:
+            out /= count - 1
+            out[undefined] = np.nan
+            return
+        
+        spreads = sums * sums
+        spreads /= count
+        np.subtract(squares, spreads, out=spreads)
+        other_spreads = other_sums * other_sums
+        other_spreads /= count
+        np.subtract(other_squares, other_spreads, out=other_spreads)
+        undefined |= ~(spreads > 0)
+        undefined |= ~(other_spreads > 0)
+        scale = spreads * other_spreads
+        del spreads, other_spreads
+        np.sqrt(scale, out=scale)
+        out /= scale
+        np.clip(out, -1.0, 1.0, out=out)
+        out[undefined] = np.nan
+
+
+def _returns_array(returns):
+    """
+    Get returns as a float array, how many leading rows to skip, and whether
+    the rest are all present
+    
+    The first row of to_returns output has no returns at all; skipping it
+    keeps the common case of aligned, forward-filled prices on the complete
+    path.
+    """
+    values = returns.to_numpy(dtype=np.float64, na_value=np.nan)
+    skip = 1 if len(values) and np.isnan(values[0]).all() else 0
+    return values, skip, not np.isnan(values[skip:]).any()
+
+
+def correlation_matrix(returns, min_periods=1, covariance=False):
+    """
+    Correlate the returns of every pair of symbols over the whole history
+    
+    The same values as DataFrame.corr() or cov(), pairwise over the rows
+    where both symbols have a return. The result is filled in tiles of
+    CROSS_SECTION_TILE_COLUMNS symbols, each a few matrix products over
+    blocks of CROSS_SECTION_BLOCK_ROWS rows, so working memory beyond the
+    N x N result grows with neither the history nor the square of N.
+    
+    Args:
+        returns (pandas.DataFrame): Returns as returned by to_returns
+        min_periods (int, optional): Fewest common returns for a pair to get a value
+        covariance (bool, optional): Return covariances instead of correlations
+    
+    Returns:
+        pandas.DataFrame: Symbol by symbol matrix, NaN for pairs with too few
+            common returns or no variation
+    """
+    values, skip, complete = _returns_array(returns)
+    columns = values.shape[1]
+    matrix = np.empty((columns, columns))
+    for first in range(0, columns, CROSS_SECTION_TILE_COLUMNS):
+        tile = slice(first, min(first + CROSS_SECTION_TILE_COLUMNS, columns))
+        sums = _PairSums(columns, complete, tile)
+        for offset in range(skip, len(values), CROSS_SECTION_BLOCK_ROWS):
+            sums.update(values[offset:offset + CROSS_SECTION_BLOCK_ROWS])
+        sums.matrix(not covariance, min_periods, out=matrix[tile])
+    return pd.DataFrame(matrix, index=returns.columns, columns=returns.columns, copy=False)
+
+
+def rolling_correlation(returns, window, step=1, min_periods=None, covariance=False):
+    """
+    Correlate every pair of symbols over a window sliding along the history
+    
+    Windows are generated one at a time rather than as a stacked T x N x N
+    frame. Each step adds the rows entering the window and removes those
+    leaving it, a few matrix products of those rows only, so memory stays at
+    the running sums, one N x N matrix with no missing returns and four
+    otherwise, plus each result, however long the history. The values match
+    DataFrame.corr() or cov() over each window's rows.
+    
+    Args:
+        returns (pandas.DataFrame): Returns as returned by to_returns
+        window (int): Rows in each window
+        step (int, optional): Rows the window moves between results
+        min_periods (int, optional): Fewest common returns in a window for a
+            pair to get a value, defaults to window
+        covariance (bool, optional): Yield covariances instead of correlations
+    
+    Yields:
+        tuple: (index label of the window's last row, symbol by symbol
+            DataFrame), from the first full window on
+    """
+    if window < 2 or step < 1:
+        raise ValueError(f"window must be at least 2 and step at least 1, got {window} and {step}")
+    min_periods = window if min_periods is None else min_periods
+    values, skip, complete = _returns_array(returns)
+    
+    sums = None
+    # Rows low to high are in the sums, which were last rebuilt at row base
+    low = high = base = 0
+    for stop in range(window, len(values) + 1, step):
+        first = stop - window
+        if sums is None or first >= high or first - base >= RESUM_WINDOWS * window:
+            sums = _PairSums(values.shape[1], complete)
+            low = high = base = first
+        sums.update(values[max(high, skip):stop], values[max(low, skip):max(first, skip)])
+        low, high = first, stop
+        matrix = sums.matrix(not covariance, min_periods)
+        yield returns.index[stop - 1], pd.DataFrame(matrix, index=returns.columns, columns=returns.columns, copy=False)
+
+
+def rolling_beta(returns, market, window, min_periods=None):
+    """
+    Get every symbol's beta against an index over a sliding window
+    
+    Beta is the covariance of the symbol's returns with the index's over
+    the variance of the index's, both over the rows where the two have
+    returns. The windowed sums behind them are computed for every symbol at
+    once, so the cost is a few rolling sums over the returns frame.
+    
+    Args:
+        returns (pandas.DataFrame): Returns as returned by to_returns
+        market (pandas.Series or hashable): Index returns on the same grid,
+            or the label of the column of returns holding them
+        window (int): Rows in each window
+        min_periods (int, optional): Fewest common returns for a beta,
+            defaults to window
+    
+    Returns:
+        pandas.DataFrame: Betas shaped like returns, NaN until a symbol has
+            min_periods common returns in the window or when the index does
+            not move
+    """
+    if not isinstance(market, pd.Series) and market in returns.columns:
+        market = returns[market]
+    min_periods = window if min_periods is None else min_periods
+    
+    values = returns.to_numpy(dtype=np.float64, na_value=np.nan)
+    index = market.reindex(returns.index).to_numpy(dtype=np.float64, na_value=np.nan)[:, None]
+    present = ~np.isnan(values) & ~np.isnan(index)
+    x = np.where(present, values, 0.0)
+    y = np.where(present, index, 0.0)
+    
+    def windowed(array):
+        return pd.DataFrame(array).rolling(window, min_periods=1).sum().to_numpy()
+    
+    count = windowed(present.astype(np.float64))
+    sum_x, sum_y = windowed(x), windowed(y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = windowed(x * y) - sum_x * sum_y / count
+        variance = windowed(y * y) - sum_y * sum_y / count
+        betas = covariance / variance
+    betas[(count < max(min_periods, 2)) | ~(variance > 0)] = np.nan
+    return pd.DataFrame(betas, index=returns.index, columns=returns.columns)
+
+
+def rank_screen(prices, lookback=1, top=10, ascending=False):
+    """
+    Rank symbols by their trailing returns at every point of the grid
+    
+    Args:
+        prices (pandas.DataFrame): Prices as returned by align_prices
+        lookback (int, optional): Bars the trailing return spans
+        top (int, optional): Symbols kept at each point
+        ascending (bool, optional): Rank the weakest returns first instead
+            of the strongest
+    
+    Returns:
+        pandas.DataFrame: timestamp, symbol, trailing_return and rank (1 for
+            the first) of the top symbols at each point, sorted by time and
+            rank; ties go to the symbol that sorts first
+    """
+    trailing = prices / prices.shift(lookback) - 1
+    ranks = trailing.rank(axis=1, ascending=ascending, method='first')
+    kept = ranks.to_numpy() <= top
+    rows, columns = np.nonzero(kept)
+    screen = pd.DataFrame({
+        'timestamp': prices.index[rows],
+        'symbol': prices.columns[columns],
+        'trailing_return': trailing.to_numpy()[rows, columns],
+        'rank': ranks.to_numpy()[rows, columns].astype(np.int64),
+    })
+    return screen.sort_values(['timestamp', 'rank'], kind='stable').reset_index(drop=True)
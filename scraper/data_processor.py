@@ -1,6 +1,10 @@
+import numpy as np
 import pandas as pd
 import logging
+import math
 from datetime import datetime
+from itertools import repeat
+from operator import itemgetter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -8,6 +12,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PRICE_FIELDS = ('current_price', 'price_change', 'open', 'high', 'low', 'close', 'change_percent')
+VOLUME_SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+# Minus signs that show up in scraped quotes besides the ASCII hyphen
+MINUS_SIGNS = '\u2212\u2012\u2013\ufe63\uff0d'
+# Characters dropped from price strings before parsing
+PRICE_NOISE = ('$', ',', ' ', '%')
+MINUS_TRANSLATION = str.maketrans(dict.fromkeys(MINUS_SIGNS, '-'))
+
+# Bar intervals resample_bars builds by default, and the units they are written in
+DEFAULT_BAR_INTERVALS = ('1m', '5m', '1h', '1d')
+INTERVAL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_interval(interval):
+    """
+    Get the length of a bar interval in seconds
+    
+    Args:
+        interval (str or int): Interval such as '30s', '5m', '1h' or '1d', or
+            a number of seconds
+        
+    Returns:
+        int: Length of the interval in seconds
+    """
+    if isinstance(interval, int) and interval > 0:
+        return interval
+    if isinstance(interval, str):
+        count, unit = interval[:-1], interval[-1:].lower()
+        if count.isdigit() and int(count) > 0 and unit in INTERVAL_UNITS:
+            return int(count) * INTERVAL_UNITS[unit]
+    raise ValueError(f"Invalid bar interval: {interval!r}")
+
 class DataProcessor:
     """
     A class to process and transform scraped stock data
@@ -23,33 +59,139 @@ class DataProcessor:
         """
         Clean and normalize the scraped stock data
         
+        Price columns are cleaned a whole column at a time, giving the same
+        values as iter_clean_data. A batch holding records that cannot be
+        cleaned that way falls back to iter_clean_data, which logs and skips them.
+        
         Args:
             stock_data (list): List of dictionaries containing stock data
             
         Returns:
             list: Cleaned list of dictionaries
         """
-        cleaned_data = []
+        stock_data = list(stock_data)
+        try:
+            return self._clean_columns(stock_data)
+        except Exception as e:
+            logger.warning(f"Falling back to per-record cleaning: {e}")
+            return list(self.iter_clean_data(stock_data))
+    
+    def _clean_columns(self, stock_data):
+        """
+        Clean records column by column, raising on any malformed record
         
+        Args:
+            stock_data (list): List of dictionaries containing stock data
+            
+        Returns:
+            list: Cleaned list of dictionaries
+        """
+        if not all(map(isinstance, stock_data, repeat(dict))):
+            raise TypeError("Stock data records must be dictionaries")
+        
+        processed_at = datetime.now().isoformat()
+        cleaned_data = [dict(item, processed_at=processed_at) for item in stock_data]
+        fields = set().union(*stock_data)
+        
+        for field in PRICE_FIELDS:
+            if field not in fields:
+                continue
+            
+            try:
+                targets = cleaned_data
+                values = list(map(itemgetter(field), stock_data))
+            except KeyError:
+                # Only some records have the field
+                targets = [cleaned_item for cleaned_item in cleaned_data if field in cleaned_item]
+                values = list(map(itemgetter(field), targets))
+            
+            for cleaned_item, price in zip(targets, self.clean_price_column(values)):
+                cleaned_item[field] = price
+        
+        if 'volume' in fields:
+            for cleaned_item in cleaned_data:
+                if 'volume' in cleaned_item:
+                    cleaned_item['volume'] = self._clean_volume(cleaned_item['volume'])
+        
+        return cleaned_data
+    
+    def clean_price_column(self, values):
+        """
+        Clean a whole column of price strings at once
+        
+        The column is joined into one string so each symbol is stripped with
+        a single str.replace, then split and converted in one NumPy call.
+        Each value comes out exactly as _clean_price would return it; columns
+        holding anything but strings, or values that do not parse, go
+        through _clean_price value by value.
+        
+        Args:
+            values (list): Price strings to clean
+            
+        Returns:
+            list: Cleaned prices as floats, None where invalid
+        """
+        values = list(values)
+        try:
+            joined = '\n'.join(values)
+        except TypeError:
+            return [self._clean_price(value) for value in values]
+        if joined.count('\n') != len(values) - 1:
+            return [self._clean_price(value) for value in values]
+        
+        for noise in PRICE_NOISE:
+            joined = joined.replace(noise, '')
+        if not joined.isascii():
+            for minus in MINUS_SIGNS:
+                joined = joined.replace(minus, '-')
+        
+        cleaned = joined.split('\n')
+        if '(' in joined:
+            cleaned = [
+                text.replace('(', '-').replace(')', '') if '(' in text and ')' in text else text
+                for text in cleaned
+            ]
+        
+        # Cleaning leaves '' and 'N/A' for every value _clean_price rejects up front
+        cleaned = np.array(cleaned, dtype=object)
+        missing = (cleaned == '') | (cleaned == 'N/A')
+        
+        prices = np.full(len(values), None, dtype=object)
+        try:
+            prices[~missing] = cleaned[~missing].astype(np.float64)
+        except ValueError:
+            return [self._clean_price(value) for value in values]
+        
+        return prices.tolist()
+    
+    def iter_clean_data(self, stock_data):
+        """
+        Clean and normalize stock data one record at a time
+        
+        Args:
+            stock_data (iterable): Dictionaries containing stock data
+            
+        Yields:
+            dict: Cleaned records; records that fail to clean are logged and skipped
+        """
         for item in stock_data:
             try:
                 cleaned_item = item.copy()
                 
-                if 'current_price' in cleaned_item:
-                    cleaned_item['current_price'] = self._clean_price(cleaned_item['current_price'])
+                for field in PRICE_FIELDS:
+                    if field in cleaned_item:
+                        cleaned_item[field] = self._clean_price(cleaned_item[field])
                 
-                if 'price_change' in cleaned_item:
-                    cleaned_item['price_change'] = self._clean_price(cleaned_item['price_change'])
+                if 'volume' in cleaned_item:
+                    cleaned_item['volume'] = self._clean_volume(cleaned_item['volume'])
                 
                 cleaned_item['processed_at'] = datetime.now().isoformat()
-                
-                cleaned_data.append(cleaned_item)
             except Exception as e:
                 logger.error(f"Error cleaning data item: {e}")
                 logger.error(f"Problematic item: {item}")
                 continue
-        
-        return cleaned_data
+            
+            yield cleaned_item
     
     def _clean_price(self, price_str):
         """
@@ -61,6 +203,10 @@ class DataProcessor:
         Returns:
             float: Cleaned price as float, or None if invalid
         """
+        if isinstance(price_str, (int, float)):
+            # Already parsed, as in stored data being reprocessed
+            return None if math.isnan(price_str) else float(price_str)
+        
         if not price_str or price_str == "N/A":
             return None
         
@@ -70,6 +216,9 @@ class DataProcessor:
             if '%' in cleaned:
                 cleaned = cleaned.replace('%', '')
             
+            if not cleaned.isascii():
+                cleaned = cleaned.translate(MINUS_TRANSLATION)
+            
             if '(' in cleaned and ')' in cleaned:
                 cleaned = cleaned.replace('(', '-').replace(')', '')
             
@@ -78,6 +227,33 @@ class DataProcessor:
             logger.warning(f"Could not convert price string to float: {price_str}")
             return None
     
+    def _clean_volume(self, volume_str):
+        """
+        Clean volume string, expanding K/M/B suffixes
+        
+        Args:
+            volume_str (str): Volume string to clean, e.g. '7.81M'
+            
+        Returns:
+            float: Volume as float, or None if invalid
+        """
+        if isinstance(volume_str, (int, float)):
+            return None if math.isnan(volume_str) else float(volume_str)
+        
+        if not volume_str or volume_str in ("N/A", "-"):
+            return None
+        
+        cleaned = volume_str.replace(',', '').strip()
+        multiplier = VOLUME_SUFFIXES.get(cleaned[-1:].upper(), 1)
+        if multiplier != 1:
+            cleaned = cleaned[:-1]
+        
+        try:
+            return float(cleaned) * multiplier
+        except ValueError:
+            logger.warning(f"Could not convert volume string to float: {volume_str}")
+            return None
+    
     def convert_to_dataframe(self, stock_data):
         """
         Convert list of dictionaries to pandas DataFrame
@@ -99,6 +275,11 @@ class DataProcessor:
         """
         Filter DataFrame by date range
         
+        The caller's DataFrame is left untouched. Timestamps are parsed only
+        if they are not datetimes already, and a frame sorted by time is
+        sliced with a binary search instead of being scanned. Repeated queries
+        over one history are better served by a history.PriceHistory.
+        
         Args:
             df (pandas.DataFrame): DataFrame containing stock data
             start_date (str, optional): Start date in YYYY-MM-DD format
@@ -112,25 +293,59 @@ class DataProcessor:
             return df
         
         try:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            timestamps = df['timestamp']
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = pd.to_datetime(timestamps)
+                df = df.assign(timestamp=timestamps)
             
-            if start_date:
-                start_date = pd.to_datetime(start_date)
-                df = df[df['timestamp'] >= start_date]
+            if not start_date and not end_date:
+                return df
+            start_date = pd.to_datetime(start_date) if start_date else None
+            end_date = pd.to_datetime(end_date) if end_date else None
             
-            if end_date:
-                end_date = pd.to_datetime(end_date)
-                df = df[df['timestamp'] <= end_date]
+            if timestamps.is_monotonic_increasing:
+                start = timestamps.searchsorted(start_date, side='left') if start_date is not None else 0
+                stop = timestamps.searchsorted(end_date, side='right') if end_date is not None else len(df)
+                return df.iloc[start:stop]
             
-            return df
+            mask = np.ones(len(df), dtype=bool)
+            if start_date is not None:
+                mask &= (timestamps >= start_date).to_numpy()
+            if end_date is not None:
+                mask &= (timestamps <= end_date).to_numpy()
+            return df[mask]
         except Exception as e:
             logger.error(f"Error filtering by date: {e}")
             raise
     
+    def _percent_change(self, current_price, price_change):
+        """
+        Get the price change as a percentage of the previous close
+        
+        The previous close is the current price minus the change. This takes
+        single values and whole columns alike, so batch and streaming
+        processing share one guard.
+        
+        Args:
+            current_price (float or array-like): Current prices, None or NaN where missing
+            price_change (float or array-like): Price changes, None or NaN where missing
+            
+        Returns:
+            numpy.ndarray: Percent changes, NaN where a value is missing or the
+                previous close is zero
+        """
+        current = np.asarray(current_price, dtype=np.float64)
+        change = np.asarray(price_change, dtype=np.float64)
+        previous = current - change
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(previous != 0, change / previous * 100, np.nan)
+    
     def calculate_metrics(self, df):
         """
         Calculate additional metrics from stock data
         
+        percent_change is NaN where the previous close is missing or zero.
+        
         Args:
             df (pandas.DataFrame): DataFrame containing stock data
             
@@ -139,7 +354,7 @@ class DataProcessor:
         """
         try:
             if 'current_price' in df.columns and 'price_change' in df.columns:
-                df['percent_change'] = (df['price_change'] / (df['current_price'] - df['price_change'])) * 100
+                df['percent_change'] = self._percent_change(df['current_price'], df['price_change'])
             
             return df
         except Exception as e:
@@ -151,7 +366,8 @@ class DataProcessor:
         Process stock data: clean, convert to DataFrame, filter, and calculate metrics
         
         Args:
-            stock_data (list): List of dictionaries containing stock data
+            stock_data (list or QuoteBatch): Dictionaries containing stock data,
+                or a QuoteBatch whose prices are already parsed
             start_date (str, optional): Start date in YYYY-MM-DD format
             end_date (str, optional): End date in YYYY-MM-DD format
             
@@ -159,9 +375,13 @@ class DataProcessor:
             pandas.DataFrame: Processed DataFrame
         """
         try:
-            cleaned_data = self.clean_data(stock_data)
-            
-            df = self.convert_to_dataframe(cleaned_data)
+            if hasattr(stock_data, 'to_dataframe'):
+                # A QuoteBatch already holds parsed prices
+                df = stock_data.to_dataframe()
+                df['processed_at'] = datetime.now().isoformat()
+            else:
+                cleaned_data = self.clean_data(stock_data)
+                df = self.convert_to_dataframe(cleaned_data)
             
             df = self.filter_by_date(df, start_date, end_date)
             
@@ -171,7 +391,198 @@ class DataProcessor:
         except Exception as e:
             logger.error(f"Error processing data: {e}")
             raise
-
+    
+    def process_columns(self, columns, start_date=None, end_date=None):
+        """
+        Process stock data held column by column: clean, filter and calculate metrics
+        
+        This gives the same DataFrame as process_data over the equivalent
+        records, without building a dictionary per record. Price columns go
+        through clean_price_column and volumes through _clean_volume.
+        
+        Args:
+            columns (dict): Equal-length lists of values keyed by field name,
+                None where a record has no value
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            
+        Returns:
+            pandas.DataFrame: Processed DataFrame
+        """
+        try:
+            columns = dict(columns)
+            for field in PRICE_FIELDS:
+                if field in columns:
+                    columns[field] = self.clean_price_column(columns[field])
+            if 'volume' in columns:
+                columns['volume'] = [self._clean_volume(volume) for volume in columns['volume']]
+            columns['processed_at'] = datetime.now().isoformat()
+            
+            df = pd.DataFrame(columns)
+            df = self.filter_by_date(df, start_date, end_date)
+            return self.calculate_metrics(df)
+        except Exception as e:
+            logger.error(f"Error processing columns: {e}")
+            raise
+    
+    def process_stream(self, stock_data, start_date=None, end_date=None):
+        """
+        Process stock data record by record: clean, filter and calculate metrics
+        
+        This is the streaming counterpart of process_data. Records are handled
+        as they arrive, so it can consume StockScraper.iter_stock_data while
+        fetches are still in flight and feed a streaming writer.
+        
+        Args:
+            stock_data (iterable): Dictionaries containing stock data
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            
+        Yields:
+            dict: Processed records
+        """
+        start = datetime.fromisoformat(start_date) if start_date else None
+        end = datetime.fromisoformat(end_date) if end_date else None
+        
+        for item in self.iter_clean_data(stock_data):
+            if (start or end) and item.get('timestamp'):
+                timestamp = datetime.fromisoformat(item['timestamp'])
+                if (start and timestamp < start) or (end and timestamp > end):
+                    continue
+            
+            if 'current_price' in item and 'price_change' in item:
+                # None where calculate_metrics leaves NaN
+                percent_change = float(self._percent_change(item['current_price'], item['price_change']))
+                item['percent_change'] = None if math.isnan(percent_change) else percent_change
+            
+            yield item
+    
+    def process_chunks(self, chunks, start_date=None, end_date=None, indicators=None):
+        """
+        Process stock data that arrives in chunks, one DataFrame per chunk
+        
+        Each chunk goes through clean, filter and metrics on its own, so
+        memory is bounded by the chunk size rather than the dataset. Rolling
+        indicators are computed by indicators, which carries each symbol's
+        state from one chunk to the next so they come out as they would over
+        the whole dataset.
+        
+        Args:
+            chunks (iterable): Lists of stock data dictionaries, as yielded by
+                readers.read_chunks
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            indicators (ChunkedIndicators, optional): Adds indicator columns
+                to every chunk
+            
+        Yields:
+            pandas.DataFrame: Processed chunks, skipping those left empty
+        """
+        for chunk in chunks:
+            df = self.process_data(chunk, start_date, end_date)
+            if indicators is not None and not df.empty:
+                df = indicators.compute(df)
+            if not df.empty:
+                yield df
+    
+    def resample_bars(self, df, intervals=DEFAULT_BAR_INTERVALS, price_column='current_price', time_column='timestamp'):
+        """
+        Resample quote snapshots into OHLC bars for several intervals at once
+        
+        Quotes are sorted by symbol and time once. Each interval is then a
+        single vectorized pass finding where a symbol or bar starts, with
+        high and low reduced over every bar together. An interval that is a
+        multiple of a shorter one is built from that one's bars rather than
+        from the quotes again. Bars start at multiples of the interval since
+        the epoch, so daily bars run from midnight to midnight of the
+        timestamps as given, and only intervals with quotes get a bar.
+        bars.BarAggregator builds the same bars quote by quote.
+        
+        Args:
+            df (pandas.DataFrame): Processed quotes with a symbol column
+            intervals (iterable, optional): Bar intervals such as '5m', see parse_interval
+            price_column (str, optional): Column holding the price
+            time_column (str, optional): Column holding the quote time
+            
+        Returns:
+            dict: DataFrame of bars keyed by interval, with symbol, timestamp
+                (start of the bar), open, high, low, close and ticks columns,
+                sorted by symbol and time; quotes without a symbol, price or
+                time are left out
+        """
+        try:
+            steps = sorted((parse_interval(interval), interval) for interval in intervals)
+            
+            timestamps = df[time_column]
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = pd.to_datetime(timestamps)
+            timezone = timestamps.dt.tz
+            if timezone is not None:
+                # Bars follow the wall clock of the quotes
+                timestamps = timestamps.dt.tz_localize(None)
+            
+            prices = df[price_column].to_numpy(dtype=np.float64, na_value=np.nan)
+            keep = ~np.isnan(prices) & timestamps.notna().to_numpy() & df['symbol'].notna().to_numpy()
+            codes, symbols = pd.factorize(df['symbol'].to_numpy()[keep], sort=True)
+            times = timestamps.to_numpy(dtype='datetime64[ns]')[keep].view(np.int64)
+            order = np.lexsort((times, codes))
+            
+            prices = prices[keep][order]
+            # Quotes are bars of their own to start from: (symbol codes, times, open, high, low, close, ticks)
+            quotes = (codes[order], times[order], prices, prices, prices, prices, np.ones(len(prices), dtype=np.int64))
+            
+            bars = {}
+            built = []
+            for step, interval in steps:
+                source = next((level for shorter, level in reversed(built) if step % shorter == 0), quotes)
+                level = self._aggregate_bars(source, step * 10 ** 9)
+                built.append((step, level))
+                
+                codes, starts, opens, highs, lows, closes, ticks = level
+                frame = pd.DataFrame({
+                    'symbol': symbols.take(codes),
+                    'timestamp': pd.to_datetime(starts.view('datetime64[ns]')),
+                    'open': opens,
+                    'high': highs,
+                    'low': lows,
+                    'close': closes,
+                    'ticks': ticks,
+                })
+                if timezone is not None:
+                    frame['timestamp'] = frame['timestamp'].dt.tz_localize(timezone)
+                bars[interval] = frame
+            
+            logger.info(f"Resampled {len(prices)} quotes of {len(symbols)} symbols into bars for {len(steps)} intervals")
+            return bars
+        except Exception as e:
+            logger.error(f"Error resampling bars: {e}")
+            raise
+    
+    @staticmethod
+    def _aggregate_bars(level, step):
+        """
+        Merge bars sorted by symbol and time into bars of step nanoseconds
+        
+        Args:
+            level (tuple): Arrays of symbol codes, start times, open, high,
+                low, close and ticks
+            step (int): Interval of the merged bars in nanoseconds
+            
+        Returns:
+            tuple: Arrays of the merged bars, in the same layout
+        """
+        codes, times, opens, highs, lows, closes, ticks = level
+        starts = times - times % step
+        if not len(starts):
+            return codes, starts, opens, highs, lows, closes, ticks
+        
+        first = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (starts[1:] != starts[:-1])])
+        last = np.r_[first[1:], len(starts)] - 1
+        return (
+            codes[first], starts[first], opens[first],
+            np.maximum.reduceat(highs, first), np.minimum.reduceat(lows, first),
+            closes[last], np.add.reduceat(ticks, first),
+        )
 
 if __name__ == "__main__":
     sample_data = [
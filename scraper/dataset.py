@@ -0,0 +1,220 @@
+import io
+import json
+import logging
+import os
+import uuid
+from datetime import date, datetime
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET_PREFIX = os.environ.get('DATASET_PREFIX', 'dataset/')
+
+# Columns encoded in the object key rather than stored in the files
+PARTITION_COLUMNS = ('symbol', 'date')
+
+DATASET_EXTENSIONS = {
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+    'json': 'json',
+    'csv': 'csv',
+}
+
+
+def partition_key(prefix, symbol, day, run_id, file_format='parquet'):
+    """
+    Get the object key of one partition file
+    
+    Args:
+        prefix (str): Dataset prefix ending in '/'
+        symbol (str): Stock symbol
+        day (date or str): Trading day
+        run_id (str): Identifier of the write, so repeated writes to the same
+            partition add files instead of replacing them
+        file_format (str, optional): 'parquet', 'arrow', 'json' or 'csv'
+    
+    Returns:
+        str: Key such as 'dataset/symbol=nike/date=2025-05-08/part-1a2b.parquet'
+    """
+    day = day.isoformat() if isinstance(day, date) else str(day)
+    return f"{prefix}symbol={quote(str(symbol), safe='')}/date={day}/part-{run_id}.{DATASET_EXTENSIONS[file_format]}"
+
+
+def _partition_value(partition_prefix, column):
+    """
+    Get the value of a 'column=value/' partition prefix, or None if it is not one
+    """
+    name = partition_prefix.rstrip('/').rsplit('/', 1)[-1]
+    key, sep, value = name.partition('=')
+    if not sep or key != column:
+        return None
+    return unquote(value)
+
+
+def _partition_dates(df):
+    if 'date' in df.columns:
+        return pd.to_datetime(df['date']).dt.date
+    if 'timestamp' in df.columns:
+        return pd.to_datetime(df['timestamp']).dt.date
+    raise ValueError("Data needs a date or timestamp column to be partitioned")
+
+
+def write_partitioned(s3_manager, data, prefix=DEFAULT_DATASET_PREFIX, file_format='parquet', run_id=None):
+    """
+    Write stock data as a Hive-partitioned dataset, one file per symbol and day
+    
+    Objects are laid out as {prefix}symbol=<symbol>/date=<YYYY-MM-DD>/part-<run_id>.<ext>.
+    The partition columns are taken out of the files, as Hive-aware readers
+    such as pyarrow.dataset, Spark and Athena add them back from the path.
+    
+    Args:
+        s3_manager (S3Manager): Where the dataset is stored
+        data (list or pandas.DataFrame): Stock data with a symbol column and a
+            date or timestamp column
+        prefix (str, optional): Dataset prefix ending in '/'
+        file_format (str, optional): 'parquet', 'arrow', 'json' or 'csv'
+        run_id (str, optional): Identifier of this write, defaults to a random one
+    
+    Returns:
+        list: S3 URIs of the written files
+    """
+    if file_format not in DATASET_EXTENSIONS:
+        raise ValueError(f"Unsupported file format: {file_format}")
+    
+    df = data if hasattr(data, 'columns') else pd.DataFrame(list(data))
+    if df.empty:
+        return []
+    if 'symbol' not in df.columns:
+        raise ValueError("Data needs a symbol column to be partitioned")
+    
+    run_id = run_id or uuid.uuid4().hex[:12]
+    days = _partition_dates(df)
+    file_columns = [column for column in df.columns if column not in PARTITION_COLUMNS]
+    
+    uris = []
+    for (symbol, day), group in df.groupby([df['symbol'], days], sort=True):
+        key = partition_key(prefix, symbol, day, run_id, file_format)
+        uris.append(s3_manager.upload_data(group[file_columns].reset_index(drop=True), key, file_format))
+    
+    logger.info(f"Wrote {len(df)} records to {len(uris)} partitions under {prefix}")
+    return uris
+
+
+def _decode(content, key):
+    extension = key.rsplit('.', 1)[-1]
+    if extension in ('parquet', 'arrow'):
+        if pa is None:
+            raise ImportError("Reading Parquet and Arrow partitions requires the pyarrow package")
+        if extension == 'parquet':
+            table = pq.read_table(pa.BufferReader(content))
+        else:
+            table = pa.ipc.open_file(pa.BufferReader(content)).read_all()
+        return table.to_pandas()
+    if extension == 'json':
+        return pd.DataFrame(json.loads(content))
+    if extension == 'csv':
+        return pd.read_csv(io.BytesIO(content))
+    raise ValueError(f"Unsupported partition file: {key}")
+
+
+class PartitionedReader:
+    """
+    Reads a Hive-partitioned dataset written by write_partitioned
+    
+    Partitions are pruned from the symbol= and date= prefixes alone, so only
+    the files of the requested symbols and days are ever downloaded.
+    """
+    
+    def __init__(self, s3_manager, prefix=DEFAULT_DATASET_PREFIX):
+        """
+        Initialize the reader
+        
+        Args:
+            s3_manager (S3Manager): Where the dataset is stored
+            prefix (str, optional): Dataset prefix ending in '/'
+        """
+        self.s3_manager = s3_manager
+        self.prefix = prefix
+    
+    def symbols(self):
+        """
+        List the symbols stored in the dataset
+        
+        Returns:
+            list: Stock symbols
+        """
+        prefixes, _ = self.s3_manager.list_partition(self.prefix)
+        symbols = (_partition_value(partition, 'symbol') for partition in prefixes)
+        return [symbol for symbol in symbols if symbol is not None]
+    
+    def partitions(self, symbols=None, start_date=None, end_date=None):
+        """
+        List the object keys of the partitions matching the filters
+        
+        Args:
+            symbols (list, optional): Stock symbols, defaults to all
+            start_date (str, optional): First day in YYYY-MM-DD format
+            end_date (str, optional): Last day in YYYY-MM-DD format
+        
+        Returns:
+            list: (symbol, day, object key) tuples
+        """
+        # Requested symbols map straight to their prefixes without listing the root
+        symbols = sorted(set(symbols)) if symbols is not None else self.symbols()
+        
+        matches = []
+        for symbol in symbols:
+            symbol_prefix = f"{self.prefix}symbol={quote(symbol, safe='')}/"
+            date_prefixes, _ = self.s3_manager.list_partition(symbol_prefix)
+            for date_prefix in date_prefixes:
+                day = _partition_value(date_prefix, 'date')
+                # ISO dates compare correctly as strings
+                if day is None or (start_date and day < start_date) or (end_date and day > end_date):
+                    continue
+                _, keys = self.s3_manager.list_partition(date_prefix)
+                matches.extend((symbol, day, key) for key in sorted(keys))
+        
+        return matches
+    
+    def read(self, symbols=None, start_date=None, end_date=None):
+        """
+        Read the records of the partitions matching the filters
+        
+        Args:
+            symbols (list, optional): Stock symbols, defaults to all
+            start_date (str, optional): First day in YYYY-MM-DD format
+            end_date (str, optional): Last day in YYYY-MM-DD format
+        
+        Returns:
+            pandas.DataFrame: Records with symbol and date columns restored
+                from the partition path
+        """
+        frames = []
+        for symbol, day, key in self.partitions(symbols, start_date, end_date):
+            content = self.s3_manager.download_data(key)
+            if content is None:
+                continue
+            frame = _decode(content, key)
+            frame.insert(0, 'symbol', symbol)
+            frame.insert(1, 'date', datetime.strptime(day, '%Y-%m-%d').date())
+            frames.append(frame)
+        
+        if not frames:
+            return pd.DataFrame(columns=list(PARTITION_COLUMNS))
+        
+        logger.info(f"Read {len(frames)} partitions from {self.prefix}")
+        return pd.concat(frames, ignore_index=True)
+
@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+import time
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_INTERVAL = float(os.environ.get('DELTA_SNAPSHOT_INTERVAL', '3600'))
+
+# Fields whose movement makes a quote worth emitting again
+QUOTE_FIELDS = ('current_price', 'price_change')
+
+
+def quote_fingerprint(record):
+    """
+    Get the part of a quote record that decides whether it changed
+    
+    Args:
+        record (dict): Stock data record
+    
+    Returns:
+        list: Values of QUOTE_FIELDS, a list so it compares equal after a
+            JSON round trip
+    """
+    return [record.get(field) for field in QUOTE_FIELDS]
+
+
+def state_key(stock_symbols, prefix='state/'):
+    """
+    Get the state document key for a watchlist
+    
+    Each distinct watchlist keeps its own state, so one client's scrapes do
+    not hide changes from another client watching the same symbols.
+    
+    Args:
+        stock_symbols (list): Stock symbols in the watchlist
+        prefix (str, optional): Key prefix
+    
+    Returns:
+        str: Key such as 'state/3f2a9c1b0d4e5f67.json'
+    """
+    digest = hashlib.sha256(','.join(sorted(set(stock_symbols))).encode('utf-8')).hexdigest()
+    return f"{prefix}{digest[:16]}.json"
+
+
+class DeltaTracker:
+    """
+    Filters repeated scrapes down to the quotes that moved
+    
+    The last seen fingerprint of every symbol is kept in a small JSON
+    document in a LocalStore or S3Store. A full snapshot is emitted when none
+    has been written for snapshot_interval seconds, so consumers can resync
+    from any snapshot plus the deltas after it.
+    """
+    
+    def __init__(self, store, key, snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL, clock=time.time):
+        """
+        Initialize the tracker
+        
+        Args:
+            store (LocalStore or S3Store): Where the state document is kept
+            key (str): Key of the state document
+            snapshot_interval (float, optional): Seconds between full snapshots,
+                0 to never write one on a schedule
+            clock (callable, optional): Wall-clock time source
+        """
+        self.store = store
+        self.key = key
+        self.snapshot_interval = snapshot_interval
+        self._clock = clock
+        self._state = None
+        self._pending = None
+    
+    def _load(self):
+        if self._state is None:
+            self._state = self.store.read_json(self.key) or {'quotes': {}, 'snapshot_at': None}
+        return self._state
+    
+    def filter(self, stock_data, full_snapshot=False):
+        """
+        Keep only the records whose quote moved since the last one seen
+        
+        The new state is only held until save() is called, so call it once
+        the records have been written; a failed write then re-emits them.
+        
+        Args:
+            stock_data (list): Stock data records
+            full_snapshot (bool, optional): Emit every record regardless of changes
+        
+        Returns:
+            tuple: (records to emit, True if they are a full snapshot)
+        """
+        state = self._load()
+        now = self._clock()
+        snapshot_at = state.get('snapshot_at')
+        
+        snapshot = (
+            full_snapshot
+            or snapshot_at is None
+            or (self.snapshot_interval and now - snapshot_at >= self.snapshot_interval)
+        )
+        
+        quotes = dict(state['quotes'])
+        changed = []
+        for record in stock_data:
+            fingerprint = quote_fingerprint(record)
+            if snapshot or quotes.get(record['symbol']) != fingerprint:
+                changed.append(record)
+            quotes[record['symbol']] = fingerprint
+        
+        self._pending = {'quotes': quotes, 'snapshot_at': now if snapshot else snapshot_at}
+        
+        logger.info(f"Delta: {len(changed)} of {len(stock_data)} quotes emitted{' as a full snapshot' if snapshot else ''}")
+        return changed, bool(snapshot)
+    
+    def save(self):
+        """
+        Persist the state from the last filter() call
+        """
+        if self._pending is None:
+            return
+        self.store.write_json(self.key, self._pending)
+        self._state, self._pending = self._pending, None
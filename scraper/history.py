@@ -0,0 +1,139 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _to_datetime64(timestamps):
+    """
+    Get timestamps as a naive datetime64 array, aware ones converted to UTC
+    """
+    timestamps = pd.to_datetime(timestamps)
+    if getattr(timestamps.dt, 'tz', None) is not None:
+        timestamps = timestamps.dt.tz_convert(None)
+    return timestamps.to_numpy()
+
+
+class PriceHistory:
+    """
+    Stock history sorted by symbol and time, indexed for date range queries
+    
+    Timestamps are parsed once when the history is built. Each symbol's rows
+    are contiguous and in time order, so a range query is two binary searches
+    and a slice of the sorted frame rather than a scan of every row.
+    """
+    
+    def __init__(self, df, time_column='timestamp', symbol_column='symbol'):
+        """
+        Build the index
+        
+        Args:
+            df (pandas.DataFrame): Stock history, in any order
+            time_column (str, optional): Column holding the timestamps
+            symbol_column (str, optional): Column holding the stock symbols
+        """
+        self.time_column = time_column
+        self.symbol_column = symbol_column
+        
+        times = _to_datetime64(df[time_column])
+        # Sorting integer codes is far cheaper than comparing symbol strings
+        codes, symbols = pd.factorize(df[symbol_column], sort=True)
+        # Stable sort by symbol and then time, keeping ingest order for ties
+        order = np.lexsort((times, codes))
+        self.frame = df.take(order).reset_index(drop=True)
+        self.frame[time_column] = times[order]
+        self._times = times[order]
+        
+        counts = np.bincount(codes[codes >= 0], minlength=len(symbols))
+        stops = np.cumsum(counts)
+        starts = stops - counts
+        # Rows without a symbol sort first and are left out of the index
+        offset = int((codes < 0).sum())
+        self._bounds = {
+            symbol: (offset + int(start), offset + int(stop))
+            for symbol, start, stop in zip(symbols, starts, stops)
+        }
+        
+        logger.info(f"Indexed {len(self.frame)} rows of {len(self._bounds)} symbols")
+    
+    def __len__(self):
+        return len(self.frame)
+    
+    def symbols(self):
+        """
+        List the symbols in the history
+        
+        Returns:
+            list: Stock symbols in sorted order
+        """
+        return list(self._bounds)
+    
+    def _bound(self, value):
+        """
+        Convert a date bound to the dtype of the index
+        """
+        bound = pd.Timestamp(value)
+        if bound.tzinfo is not None:
+            bound = bound.tz_convert(None)
+        return bound.to_datetime64().astype(self._times.dtype)
+    
+    def _positions(self, symbol, start_date=None, end_date=None):
+        """
+        Get the rows of one symbol within a date range
+        
+        Returns:
+            tuple: (first row, row after the last) in the sorted frame
+        """
+        if symbol not in self._bounds:
+            return 0, 0
+        start, stop = self._bounds[symbol]
+        times = self._times[start:stop]
+        if start_date is not None:
+            start += int(np.searchsorted(times, self._bound(start_date), side='left'))
+        if end_date is not None:
+            stop = self._bounds[symbol][0] + int(np.searchsorted(times, self._bound(end_date), side='right'))
+        return start, max(start, stop)
+    
+    def between(self, symbol, start_date=None, end_date=None):
+        """
+        Get one symbol's rows within a date range
+        
+        Args:
+            symbol (str): Stock symbol
+            start_date (str, optional): Start date in YYYY-MM-DD format, inclusive
+            end_date (str, optional): End date in YYYY-MM-DD format, inclusive
+        
+        Returns:
+            pandas.DataFrame: A slice of the sorted frame sharing its memory
+        """
+        start, stop = self._positions(symbol, start_date, end_date)
+        return self.frame.iloc[start:stop]
+    
+    def range(self, start_date=None, end_date=None, symbols=None):
+        """
+        Get the rows of several symbols within a date range
+        
+        Args:
+            start_date (str, optional): Start date in YYYY-MM-DD format, inclusive
+            end_date (str, optional): End date in YYYY-MM-DD format, inclusive
+            symbols (list, optional): Stock symbols, defaults to all
+        
+        Returns:
+            pandas.DataFrame: Matching rows ordered by symbol and time. A single
+                symbol comes back as a slice; several are gathered into a copy.
+        """
+        symbols = sorted(set(symbols)) if symbols is not None else self.symbols()
+        spans = [self._positions(symbol, start_date, end_date) for symbol in symbols]
+        spans = [(start, stop) for start, stop in spans if stop > start]
+        if len(spans) == 1:
+            return self.frame.iloc[spans[0][0]:spans[0][1]]
+        if not spans:
+            return self.frame.iloc[0:0]
+        positions = np.concatenate([np.arange(start, stop) for start, stop in spans])
+        return self.frame.take(positions)
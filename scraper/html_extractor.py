@@ -0,0 +1,216 @@
+import logging
+import re
+from html.parser import HTMLParser
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TITLE_CLASS = 'text-2xl font-semibold instrument-header_title__GTWDv mobile:mb-2'
+PRICE_CLASS = 'instrument-price_instrument-price__3uw25 flex items-end flex-wrap font-bold'
+
+_TITLE_START = re.compile(r'<h1\b[^>]*instrument-header_title__GTWDv', re.IGNORECASE)
+_PRICE_START = re.compile(r'<div\b[^>]*instrument-price_instrument-price__3uw25', re.IGNORECASE)
+
+CHUNK_SIZE = 4096
+
+
+class _ExtractionDone(Exception):
+    """
+    Raised from inside the parser to stop feeding once everything is found
+    """
+
+
+class _QuoteParser(HTMLParser):
+    """
+    An HTML parser that only keeps the instrument title and price spans
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.spans = None
+        
+        self._title_parts = None
+        self._title_depth = 0
+        self._price_depth = 0
+        self._open_spans = []
+        self._price_done = False
+    
+    def handle_starttag(self, tag, attrs):
+        if self._title_parts is not None:
+            if tag == 'h1':
+                self._title_depth += 1
+        elif self.title is None and tag == 'h1' and dict(attrs).get('class') == TITLE_CLASS:
+            self._title_parts = []
+            self._title_depth = 1
+        
+        if self._price_depth:
+            if tag == 'div':
+                self._price_depth += 1
+            elif tag == 'span':
+                self.spans.append([])
+                self._open_spans.append(len(self.spans) - 1)
+        elif not self._price_done and tag == 'div' and dict(attrs).get('class') == PRICE_CLASS:
+            self.spans = []
+            self._price_depth = 1
+    
+    def handle_endtag(self, tag):
+        if self._title_parts is not None and tag == 'h1':
+            self._title_depth -= 1
+            if self._title_depth == 0:
+                self.title = ''.join(self._title_parts).strip()
+                self._title_parts = None
+        
+        if self._price_depth:
+            if tag == 'span' and self._open_spans:
+                self._open_spans.pop()
+            elif tag == 'div':
+                self._price_depth -= 1
+                if self._price_depth == 0:
+                    self._price_done = True
+                    self._open_spans = []
+        
+        if self.title is not None and self._price_done:
+            raise _ExtractionDone()
+    
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        for index in self._open_spans:
+            self.spans[index].append(data)
+
+
+def extract_quote_fast(html_content):
+    """
+    Extract the company name, price and change without building a full tree
+    
+    Parsing starts at the first instrument title or price element and stops
+    as soon as both have been closed, so the rest of the page is never read.
+    
+    Args:
+        html_content (str): HTML content of an instrument page
+    
+    Returns:
+        tuple: (company_name, current_price, price_change), or None if the
+            instrument title could not be found
+    """
+    title_match = _TITLE_START.search(html_content)
+    if not title_match:
+        return None
+    
+    price_match = _PRICE_START.search(html_content)
+    start = title_match.start()
+    if price_match:
+        start = min(start, price_match.start())
+    
+    parser = _QuoteParser()
+    try:
+        for offset in range(start, len(html_content), CHUNK_SIZE):
+            parser.feed(html_content[offset:offset + CHUNK_SIZE])
+        parser.close()
+    except _ExtractionDone:
+        pass
+    
+    if parser.title is None:
+        return None
+    
+    if parser.spans is not None:
+        spans = [''.join(parts).strip() for parts in parser.spans]
+        current_price = spans[0] if len(spans) > 0 else "N/A"
+        price_change = spans[2] if len(spans) > 2 else "N/A"
+    else:
+        current_price = "N/A"
+        price_change = "N/A"
+    
+    return parser.title, current_price, price_change
+
+
+class _TableParser(HTMLParser):
+    """
+    An HTML parser that collects the cells of every table on a page
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        
+        self._rows = None
+        self._row = None
+        self._cell = None
+        self._table_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self._table_depth += 1
+            if self._table_depth == 1:
+                self._rows = []
+            return
+        
+        if self._table_depth != 1:
+            return
+        
+        if tag == 'tr':
+            self._row = []
+        elif tag in ('td', 'th') and self._row is not None:
+            self._cell = {'text': [], 'href': None, 'datetime': None}
+        elif self._cell is not None:
+            attrs = dict(attrs)
+            if tag == 'a' and self._cell['href'] is None:
+                self._cell['href'] = attrs.get('href')
+            elif tag == 'time' and self._cell['datetime'] is None:
+                self._cell['datetime'] = attrs.get('datetime')
+    
+    def handle_endtag(self, tag):
+        if tag == 'table':
+            if self._table_depth == 1 and self._rows is not None:
+                self.tables.append(self._rows)
+                self._rows = None
+            self._table_depth = max(0, self._table_depth - 1)
+            return
+        
+        if self._table_depth != 1:
+            return
+        
+        if tag in ('td', 'th') and self._cell is not None:
+            self._cell['text'] = ' '.join(''.join(self._cell['text']).split())
+            self._row.append(self._cell)
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            if self._row:
+                self._rows.append(self._row)
+            self._row = None
+    
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell['text'].append(data)
+
+
+def extract_table(html_content, required_headers):
+    """
+    Extract the first table whose header row contains the required headers
+    
+    Args:
+        html_content (str): HTML content of the page
+        required_headers (iterable): Header texts that must all be present
+    
+    Returns:
+        tuple: (headers, rows) where headers is a list of header texts and
+            each row is a list of cell dicts with 'text', 'href' and
+            'datetime' keys, or (None, []) if no table matches
+    """
+    parser = _TableParser()
+    parser.feed(html_content)
+    parser.close()
+    
+    required = set(required_headers)
+    for rows in parser.tables:
+        if not rows:
+            continue
+        headers = [cell['text'] for cell in rows[0]]
+        if required.issubset(headers):
+            return headers, rows[1:]
+    
+    return None, []
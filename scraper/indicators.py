@@ -0,0 +1,543 @@
+import logging
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Window lengths of each indicator, in observations
+DEFAULT_WINDOWS = {
+    'sma': (20, 50),
+    'ema': (12, 26),
+    'volatility': (20,),
+    'rsi': (14,),
+    'channel': (20,),
+}
+
+_processor = DataProcessor()
+
+
+def indicator_columns(windows=None, vwap=True):
+    """
+    Get the names of the columns an indicator run adds
+    
+    Args:
+        windows (dict, optional): Window lengths keyed by indicator
+        vwap (bool, optional): Include the vwap column
+    
+    Returns:
+        list: Column names such as 'sma_20' or 'channel_high_20'
+    """
+    columns = []
+    for name, lengths in (windows or DEFAULT_WINDOWS).items():
+        for length in lengths:
+            if name == 'channel':
+                columns += [f'channel_high_{length}', f'channel_low_{length}']
+            else:
+                columns.append(f'{name}_{length}')
+    if vwap:
+        columns.append('vwap')
+    return columns
+
+
+def _rolling(values, positions, length, method):
+    """
+    Apply a fixed-length rolling window over every symbol at once
+    
+    The frame is sorted by symbol, so a window lies inside one symbol exactly
+    when its last row is at least length - 1 rows into that symbol. Rolling
+    over the whole column and masking the rest matches a per-symbol rolling
+    window without a Python call per symbol.
+    """
+    rolled = getattr(pd.Series(values).rolling(length, min_periods=length), method)().to_numpy(copy=True)
+    rolled[positions < length - 1] = np.nan
+    return rolled
+
+
+def compute_indicators(df, price_column='close', windows=None, time_column=None):
+    """
+    Compute technical indicators for every symbol of a stored history at once
+    
+    Rows without a price are dropped, and the rest are sorted by symbol and
+    time. Windows count observations, and an indicator is NaN until its
+    symbol has a full window. EMAs seed with the first price and RSI uses
+    Wilder's smoothing from the first change, the same recurrences as
+    IndicatorEngine, so incremental updates continue these columns exactly.
+    
+    Added columns:
+        sma_N, ema_N: Simple and exponential moving averages of the price
+        volatility_N: Sample standard deviation of the last N simple returns
+        rsi_N: Relative strength index
+        channel_high_N, channel_low_N: Highest high and lowest low of the last
+            N rows, from the high and low columns when present
+        vwap: Volume-weighted average price since the start of the day, when
+            there is a volume column
+    
+    Args:
+        df (pandas.DataFrame): History with a symbol column, a numeric price
+            column and a timestamp or date column
+        price_column (str, optional): Column holding the price
+        windows (dict, optional): Window lengths keyed by indicator, defaults
+            to DEFAULT_WINDOWS
+        time_column (str, optional): Column ordering the rows, defaults to
+            timestamp or date, whichever exists
+    
+    Returns:
+        pandas.DataFrame: Sorted copy of the history with indicator columns added
+    """
+    windows = windows or DEFAULT_WINDOWS
+    time_column = time_column or ('timestamp' if 'timestamp' in df.columns else 'date')
+    
+    df = df[df[price_column].notna()].sort_values(['symbol', time_column], kind='stable').reset_index(drop=True)
+    if df.empty:
+        return df.reindex(columns=list(df.columns) + indicator_columns(windows, 'volume' in df.columns))
+    
+    columns, _ = _indicator_arrays(df, price_column, windows, time_column)
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def _indicator_arrays(df, price_column, windows, time_column, carried=None, seeds=None):
+    """
+    Compute the indicator columns of a frame sorted by symbol and time
+    
+    Continuing from an earlier chunk, each symbol's first rows are carried
+    over from it: enough of them to fill every fixed window, flagged in
+    carried. seeds holds each symbol's recurrences as they stood after its
+    last carried row. EMA and RSI inputs of the carried rows are replaced
+    with those seeds, which an adjust=False ewm then carries through
+    unchanged, so the chunk's rows continue the recurrences exactly.
+    
+    Args:
+        df (pandas.DataFrame): Rows sorted by symbol and time
+        price_column (str): Column holding the price
+        windows (dict): Window lengths keyed by indicator
+        time_column (str): Column ordering the rows
+        carried (numpy.ndarray, optional): True for rows carried over
+        seeds (pandas.DataFrame, optional): Per-symbol state from the last
+            chunk, indexed by symbol, as returned by this function
+    
+    Returns:
+        tuple: (indicator arrays keyed by column name, per-symbol state after
+            the last row as a DataFrame indexed by symbol)
+    """
+    symbols = df['symbol']
+    starts = (symbols != symbols.shift()).to_numpy()
+    group_ids = np.cumsum(starts) - 1
+    group_starts = np.flatnonzero(starts)
+    group_ends = np.r_[group_starts[1:], len(df)] - 1
+    positions = np.arange(len(df)) - group_starts[group_ids]
+    
+    if carried is None:
+        carried = np.zeros(len(df), dtype=bool)
+    if seeds is not None:
+        seeds = seeds.reindex(symbols.to_numpy())
+        # Rows already seen before the carried ones
+        positions = positions + np.nan_to_num(seeds['count'].to_numpy(dtype=np.float64) - seeds['carried'].to_numpy(dtype=np.float64)).astype(np.int64)
+    
+    prices = df[price_column].to_numpy(dtype=np.float64)
+    previous = np.roll(prices, 1)
+    changes = prices - previous
+    changes[starts] = np.nan
+    returns = prices / previous - 1
+    returns[starts] = np.nan
+    
+    highs = df['high'].to_numpy(dtype=np.float64) if 'high' in df.columns else prices
+    lows = df['low'].to_numpy(dtype=np.float64) if 'low' in df.columns else prices
+    
+    columns = {}
+    state = {'count': positions[group_ends] + 1}
+    for length in windows.get('sma', ()):
+        columns[f'sma_{length}'] = _rolling(prices, positions, length, 'mean')
+    
+    for length in windows.get('ema', ()):
+        values = prices
+        if seeds is not None:
+            values = np.where(carried, seeds[f'ema_{length}'].to_numpy(dtype=np.float64), prices)
+        ema = pd.Series(values).groupby(group_ids, sort=False).ewm(span=length, adjust=False).mean().to_numpy(copy=True)
+        state[f'ema_{length}'] = ema[group_ends]
+        ema[positions < length - 1] = np.nan
+        columns[f'ema_{length}'] = ema
+    
+    for length in windows.get('volatility', ()):
+        # The first row of a symbol has no return, so a full window needs length + 1 prices
+        volatility = _rolling(returns, positions, length, 'std')
+        volatility[positions < length] = np.nan
+        columns[f'volatility_{length}'] = volatility
+    
+    for length in windows.get('rsi', ()):
+        gains = np.where(changes > 0, changes, 0.0)
+        losses = np.where(changes < 0, -changes, 0.0)
+        gains[starts] = np.nan
+        losses[starts] = np.nan
+        if seeds is not None:
+            gains = np.where(carried, seeds[f'gain_{length}'].to_numpy(dtype=np.float64), gains)
+            losses = np.where(carried, seeds[f'loss_{length}'].to_numpy(dtype=np.float64), losses)
+        average_gain = pd.Series(gains).groupby(group_ids, sort=False).ewm(alpha=1 / length, adjust=False).mean().to_numpy()
+        average_loss = pd.Series(losses).groupby(group_ids, sort=False).ewm(alpha=1 / length, adjust=False).mean().to_numpy()
+        state[f'gain_{length}'] = average_gain[group_ends]
+        state[f'loss_{length}'] = average_loss[group_ends]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(average_loss == 0, np.where(average_gain == 0, 50.0, 100.0),
+                           100 - 100 / (1 + average_gain / average_loss))
+        rsi[positions < length] = np.nan
+        columns[f'rsi_{length}'] = rsi
+    
+    for length in windows.get('channel', ()):
+        columns[f'channel_high_{length}'] = _rolling(highs, positions, length, 'max')
+        columns[f'channel_low_{length}'] = _rolling(lows, positions, length, 'min')
+    
+    if 'volume' in df.columns:
+        volumes = df['volume'].to_numpy(dtype=np.float64)
+        days = pd.to_datetime(df[time_column]).dt.normalize()
+        sessions = df.groupby([symbols, days], sort=False).ngroup().to_numpy()
+        value = np.nan_to_num(prices * volumes)
+        volume = np.nan_to_num(volumes)
+        if seeds is not None and 'session' in seeds.columns:
+            # Carried rows are already in the session totals of the seeds;
+            # those totals go on the first row of the session they belong to
+            value[carried] = 0.0
+            volume[carried] = 0.0
+            first = np.r_[True, sessions[1:] != sessions[:-1]] & (days.to_numpy() == seeds['session'].to_numpy(dtype='datetime64[ns]'))
+            value[first] += seeds['session_value'].to_numpy(dtype=np.float64)[first]
+            volume[first] += seeds['session_volume'].to_numpy(dtype=np.float64)[first]
+        traded = pd.DataFrame({'value': value, 'volume': volume})
+        cumulative = traded.groupby(sessions, sort=False).cumsum()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns['vwap'] = np.where(cumulative['volume'] > 0, cumulative['value'] / cumulative['volume'], np.nan)
+        state['session'] = days.to_numpy()[group_ends]
+        state['session_value'] = cumulative['value'].to_numpy()[group_ends]
+        state['session_volume'] = cumulative['volume'].to_numpy()[group_ends]
+    
+    logger.info(f"Computed {len(columns)} indicators over {len(df)} rows of {len(group_starts)} symbols")
+    return columns, pd.DataFrame(state, index=symbols.to_numpy()[group_ends])
+
+
+class ChunkedIndicators:
+    """
+    Computes indicators over a history that arrives in chunks
+    
+    Each symbol's last rows and smoothed averages are carried from one chunk
+    to the next, so the indicators of every chunk equal those of
+    compute_indicators over the whole history, while memory is bounded by
+    the chunk size and the number of symbols. Within a symbol, chunks must
+    arrive in time order.
+    """
+    
+    def __init__(self, windows=None, price_column='close', time_column=None):
+        """
+        Initialize the computation
+        
+        Args:
+            windows (dict, optional): Window lengths keyed by indicator,
+                defaults to DEFAULT_WINDOWS
+            price_column (str, optional): Column holding the price
+            time_column (str, optional): Column ordering the rows, defaults to
+                timestamp or date, whichever exists
+        """
+        self.windows = windows or DEFAULT_WINDOWS
+        self.price_column = price_column
+        self.time_column = time_column
+        # Enough rows to fill every fixed window; volatility needs one more price than returns
+        self.tail_length = max(
+            [*self.windows.get('sma', ()), *self.windows.get('channel', ()),
+             *(length + 1 for length in self.windows.get('volatility', ())), 1]
+        )
+        self._tail = None
+        self._seeds = None
+    
+    def compute(self, df):
+        """
+        Compute the indicators of the next chunk
+        
+        Args:
+            df (pandas.DataFrame): Chunk as passed to compute_indicators
+        
+        Returns:
+            pandas.DataFrame: The chunk's rows with a price, sorted by symbol
+                and time, with indicator columns added
+        """
+        time_column = self.time_column or ('timestamp' if 'timestamp' in df.columns else 'date')
+        df = df[df[self.price_column].notna()].sort_values(['symbol', time_column], kind='stable')
+        if df.empty:
+            return df.reset_index(drop=True).reindex(
+                columns=list(df.columns) + indicator_columns(self.windows, 'volume' in df.columns))
+        
+        chunk_symbols = df['symbol'].unique()
+        if self._tail is not None:
+            tail = self._tail[self._tail['symbol'].isin(chunk_symbols)]
+            stacked = pd.concat([tail, df], ignore_index=True)
+            # Carried rows sort ahead of the chunk's rows of the same symbol
+            codes, _ = pd.factorize(stacked['symbol'], sort=True)
+            order = np.argsort(codes, kind='stable')
+            combined = stacked.take(order).reset_index(drop=True)
+            carried = (np.arange(len(stacked)) < len(tail))[order]
+        else:
+            combined = df.reset_index(drop=True)
+            carried = np.zeros(len(combined), dtype=bool)
+        
+        columns, state = _indicator_arrays(combined, self.price_column, self.windows, time_column, carried, self._seeds)
+        result = pd.concat([combined, pd.DataFrame(columns, index=combined.index)], axis=1)
+        
+        tail = combined.groupby('symbol', sort=False).tail(self.tail_length)
+        state['carried'] = tail.groupby('symbol', sort=False).size()
+        self._remember(chunk_symbols, tail, state)
+        return result[~carried].reset_index(drop=True)
+    
+    def _remember(self, chunk_symbols, tail, state):
+        """
+        Replace the carried rows and seeds of the symbols in a chunk
+        """
+        if self._tail is None:
+            self._tail, self._seeds = tail.reset_index(drop=True), state
+            return
+        kept = ~self._tail['symbol'].isin(chunk_symbols)
+        self._tail = pd.concat([self._tail[kept], tail], ignore_index=True)
+        self._seeds = pd.concat([self._seeds[~self._seeds.index.isin(chunk_symbols)], state])
+
+
+def _session_day(timestamp):
+    """
+    Get the day a timestamp falls on, which VWAP resets at
+    """
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, str):
+        # ISO timestamps and dates start with YYYY-MM-DD
+        return timestamp[:10]
+    if isinstance(timestamp, np.datetime64):
+        return str(timestamp.astype('datetime64[D]'))
+    return timestamp.date().isoformat()
+
+
+class _SymbolState:
+    """
+    Running indicator state of one symbol
+    """
+    
+    def __init__(self, windows):
+        self.count = 0
+        self.last_price = None
+        self.prices = deque(maxlen=max(windows.get('sma', ()), default=1))
+        self.sums = {length: 0.0 for length in windows.get('sma', ())}
+        self.returns = {length: deque(maxlen=length) for length in windows.get('volatility', ())}
+        self.moments = {length: [0.0, 0.0] for length in windows.get('volatility', ())}
+        self.emas = {length: None for length in windows.get('ema', ())}
+        self.averages = {length: [0.0, 0.0, 0] for length in windows.get('rsi', ())}
+        self.highs = {length: deque() for length in windows.get('channel', ())}
+        self.lows = {length: deque() for length in windows.get('channel', ())}
+        self.session = None
+        self.traded = [0.0, 0.0]
+
+
+class IndicatorEngine:
+    """
+    Keeps indicators current as quotes arrive, without rescanning history
+    
+    Each symbol holds only its running sums, smoothed averages and the last
+    window of prices, so every update costs O(1) (amortized for channels).
+    The values follow the same definitions as compute_indicators, and
+    warm_up() seeds the state from a stored history once.
+    """
+    
+    def __init__(self, windows=None):
+        """
+        Initialize the engine
+        
+        Args:
+            windows (dict, optional): Window lengths keyed by indicator,
+                defaults to DEFAULT_WINDOWS
+        """
+        self.windows = windows or DEFAULT_WINDOWS
+        self._states = {}
+    
+    def symbols(self):
+        """
+        List the symbols the engine holds state for
+        
+        Returns:
+            list: Sorted stock symbols
+        """
+        return sorted(self._states)
+    
+    def update(self, symbol, price, timestamp=None, volume=None, high=None, low=None):
+        """
+        Add one observation and get the symbol's current indicators
+        
+        Args:
+            symbol (str): Stock symbol
+            price (float): Price of the observation
+            timestamp (datetime or str, optional): Time of the observation,
+                needed for VWAP to reset each day
+            volume (float, optional): Traded volume, for VWAP
+            high (float, optional): High of the observation, defaults to price
+            low (float, optional): Low of the observation, defaults to price
+        
+        Returns:
+            dict: Indicator values keyed by column name, None until a window is full
+        """
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = _SymbolState(self.windows)
+        
+        values = {}
+        previous = state.last_price
+        count = state.count + 1
+        
+        for length in self.windows.get('sma', ()):
+            state.sums[length] += price
+            if count > length:
+                # The price leaving the window, length observations back
+                state.sums[length] -= state.prices[-length]
+            values[f'sma_{length}'] = state.sums[length] / length if count >= length else None
+        
+        for length in self.windows.get('ema', ()):
+            alpha = 2 / (length + 1)
+            ema = state.emas[length]
+            ema = price if ema is None else alpha * price + (1 - alpha) * ema
+            state.emas[length] = ema
+            values[f'ema_{length}'] = ema if count >= length else None
+        
+        for length in self.windows.get('volatility', ()):
+            values[f'volatility_{length}'] = self._update_volatility(state, length, previous, price)
+        
+        for length in self.windows.get('rsi', ()):
+            average = state.averages[length]
+            if previous is not None:
+                change = price - previous
+                gain, loss = max(change, 0.0), max(-change, 0.0)
+                alpha = 1 / length
+                if average[2] == 0:
+                    average[0], average[1] = gain, loss
+                else:
+                    average[0] = alpha * gain + (1 - alpha) * average[0]
+                    average[1] = alpha * loss + (1 - alpha) * average[1]
+                average[2] += 1
+            if average[2] < length:
+                values[f'rsi_{length}'] = None
+            elif average[1] == 0:
+                values[f'rsi_{length}'] = 50.0 if average[0] == 0 else 100.0
+            else:
+                values[f'rsi_{length}'] = 100 - 100 / (1 + average[0] / average[1])
+        
+        for length in self.windows.get('channel', ()):
+            high_value = price if high is None else high
+            low_value = price if low is None else low
+            values[f'channel_high_{length}'] = self._push_extreme(state.highs[length], count, length, high_value, max)
+            values[f'channel_low_{length}'] = self._push_extreme(state.lows[length], count, length, low_value, min)
+        
+        if volume is not None:
+            session = _session_day(timestamp)
+            if session != state.session:
+                state.session = session
+                state.traded = [0.0, 0.0]
+            if not math.isnan(volume):
+                state.traded[0] += price * volume
+                state.traded[1] += volume
+            values['vwap'] = state.traded[0] / state.traded[1] if state.traded[1] > 0 else None
+        
+        state.prices.append(price)
+        state.last_price = price
+        state.count = count
+        return values
+    
+    @staticmethod
+    def _update_volatility(state, length, previous, price):
+        """
+        Slide the return window with a Welford update of mean and squared deviations
+        """
+        if previous is None:
+            return None
+        
+        value = price / previous - 1
+        returns = state.returns[length]
+        moments = state.moments[length]
+        mean, deviations = moments
+        if len(returns) == length:
+            oldest = returns[0]
+            new_mean = mean + (value - oldest) / length
+            deviations += (value - oldest) * (value - new_mean + oldest - mean)
+            mean = new_mean
+        else:
+            delta = value - mean
+            mean += delta / (len(returns) + 1)
+            deviations += delta * (value - mean)
+        returns.append(value)
+        moments[0], moments[1] = mean, max(deviations, 0.0)
+        
+        if len(returns) < length:
+            return None
+        return math.sqrt(moments[1] / (length - 1))
+    
+    @staticmethod
+    def _push_extreme(window, count, length, value, pick):
+        """
+        Keep a monotonic deque of (index, value) whose head is the window's extreme
+        """
+        while window and pick(window[-1][1], value) == value:
+            window.pop()
+        window.append((count, value))
+        if window[0][0] <= count - length:
+            window.popleft()
+        return window[0][1] if count >= length else None
+    
+    def update_record(self, record, price_field='current_price'):
+        """
+        Add a stock data record, parsing its price if it is still a string
+        
+        Args:
+            record (dict): Record as returned by scrape_stock_data or clean_data
+            price_field (str, optional): Field holding the price
+        
+        Returns:
+            dict: Indicator values keyed by column name, or an empty dict when
+                the record has no usable price
+        """
+        price = record.get(price_field)
+        if isinstance(price, str):
+            price = _processor._clean_price(price)
+        if price is None or (isinstance(price, float) and math.isnan(price)):
+            return {}
+        
+        volume = record.get('volume')
+        if isinstance(volume, str):
+            volume = _processor._clean_volume(volume)
+        high, low = (
+            _processor._clean_price(value) if isinstance(value, str) else value
+            for value in (record.get('high'), record.get('low'))
+        )
+        return self.update(
+            record['symbol'], price, timestamp=record.get('timestamp') or record.get('date'),
+            volume=volume, high=high, low=low
+        )
+    
+    def warm_up(self, df, price_column='close', time_column=None):
+        """
+        Seed the state from a stored history, replacing any state for its symbols
+        
+        Args:
+            df (pandas.DataFrame): History as passed to compute_indicators
+            price_column (str, optional): Column holding the price
+            time_column (str, optional): Column ordering the rows
+        
+        Returns:
+            int: Number of rows consumed
+        """
+        time_column = time_column or ('timestamp' if 'timestamp' in df.columns else 'date')
+        df = df[df[price_column].notna()].sort_values(['symbol', time_column], kind='stable')
+        for symbol in df['symbol'].unique():
+            self._states.pop(symbol, None)
+        
+        columns = {name: df[name].to_numpy() if name in df.columns else [None] * len(df)
+                   for name in ('high', 'low', 'volume')}
+        for symbol, price, timestamp, high, low, volume in zip(
+                df['symbol'], df[price_column], df[time_column], columns['high'], columns['low'], columns['volume']):
+            self.update(symbol, price, timestamp=timestamp, volume=volume, high=high, low=low)
+        return len(df)
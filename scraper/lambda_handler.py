@@ -5,9 +5,16 @@ import tempfile
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
-from scraper import StockScraper
+from scraper import DEFAULT_LISTING_URLS, StockScraper
 from data_processor import DataProcessor
 from s3_manager import S3Manager
+from response_cache import ResponseCache
+from backfill import BackfillManager, LocalStore, S3Store
+from dataset import write_partitioned
+from delta import DeltaTracker, state_key
+from rate_limiter import rate_limiter_stats
+from resilience import CircuitBreaker, RetryPolicy
+from single_flight import SingleFlight
 
 try:
     from mock_data import MOCK_STOCK_DATA
@@ -25,6 +32,37 @@ S3_BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'stock-data-bucket')
 AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
 LOCAL_TESTING = os.environ.get('LOCAL_TESTING', 'false').lower() == 'true'
 TEMP_OUTPUT_DIR = os.environ.get('TEMP_OUTPUT_DIR', '/tmp')
+SCRAPER_CONCURRENCY = int(os.environ.get('SCRAPER_CONCURRENCY', '10'))
+HISTORY_BACKFILL = os.environ.get('HISTORY_BACKFILL', 'false').lower() == 'true'
+HISTORY_PREFIX = os.environ.get('HISTORY_PREFIX', 'history/')
+SCRAPER_RATE_LIMIT = os.environ.get('SCRAPER_RATE_LIMIT', 'true').lower() == 'true'
+SCRAPER_MAX_ATTEMPTS = int(os.environ.get('SCRAPER_MAX_ATTEMPTS', '3'))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '3'))
+BREAKER_COOLDOWN = float(os.environ.get('BREAKER_COOLDOWN', '900'))
+SCRAPER_CACHE_TTL = float(os.environ.get('SCRAPER_CACHE_TTL', '60'))
+SCRAPER_CACHE_MAX_BYTES = int(os.environ.get('SCRAPER_CACHE_MAX_BYTES', str(100 * 1024 * 1024)))
+SCRAPER_DEDUP_TTL = float(os.environ.get('SCRAPER_DEDUP_TTL', '5'))
+DELTA_MODE = os.environ.get('DELTA_MODE', 'false').lower() == 'true'
+DELTA_PREFIX = os.environ.get('DELTA_PREFIX', 'delta/')
+DELTA_SNAPSHOT_INTERVAL = float(os.environ.get('DELTA_SNAPSHOT_INTERVAL', '3600'))
+PARTITIONED_DATASET = os.environ.get('PARTITIONED_DATASET', 'false').lower() == 'true'
+DATASET_PREFIX = os.environ.get('DATASET_PREFIX', 'dataset/')
+
+# Created once per container so warm invocations share cached pages and counters
+response_cache = ResponseCache(
+    cache_dir=os.path.join(TEMP_OUTPUT_DIR, 'stock-scraper-cache'),
+    ttl=SCRAPER_CACHE_TTL,
+    max_bytes=SCRAPER_CACHE_MAX_BYTES
+) if SCRAPER_CACHE_TTL > 0 else None
+
+# Kept at module scope so open circuits survive between warm invocations
+circuit_breaker = CircuitBreaker(
+    failure_threshold=BREAKER_FAILURE_THRESHOLD,
+    cooldown=BREAKER_COOLDOWN
+)
+
+# Shared by warm invocations so overlapping watchlists reuse recent fetches
+single_flight = SingleFlight(ttl=SCRAPER_DEDUP_TTL)
 
 def lambda_handler(event, context):
     """
@@ -49,6 +87,7 @@ def lambda_handler(event, context):
         start_date = body.get('start_date')
         end_date = body.get('end_date')
         output_format = body.get('output_format', 'json').lower()
+        delta_mode = body.get('delta', DELTA_MODE) and not (start_date or end_date)
         
         if not stock_symbols:
             return {
@@ -58,7 +97,14 @@ def lambda_handler(event, context):
                 })
             }
         
-        scraper = StockScraper(api_key=SCRAPER_API_KEY)
+        scraper = StockScraper(
+            api_key=SCRAPER_API_KEY,
+            cache=response_cache,
+            rate_limit=SCRAPER_RATE_LIMIT,
+            retry_policy=RetryPolicy(max_attempts=SCRAPER_MAX_ATTEMPTS),
+            circuit_breaker=circuit_breaker,
+            single_flight=single_flight
+        )
         processor = DataProcessor()
         s3_manager = S3Manager(bucket_name=S3_BUCKET_NAME, region_name=AWS_REGION)
         
@@ -76,15 +122,75 @@ def lambda_handler(event, context):
                         'price_change': '+1.00',
                         'timestamp': datetime.now().isoformat()
                     })
+        elif HISTORY_BACKFILL and (start_date or end_date):
+            backfill = BackfillManager(scraper, S3Store(s3_manager, prefix=HISTORY_PREFIX))
+            stock_data = backfill.backfill_many(stock_symbols, start_date, end_date)
+        elif DEFAULT_LISTING_URLS and not (start_date or end_date):
+            stock_data = scraper.scrape_from_listings(
+                stock_symbols,
+                listing_urls=DEFAULT_LISTING_URLS,
+                concurrency=SCRAPER_CONCURRENCY
+            )
         else:
-            stock_data = scraper.scrape_multiple_stocks(stock_symbols)
+            stock_data = scraper.scrape_multiple_stocks(
+                stock_symbols,
+                concurrency=SCRAPER_CONCURRENCY,
+                start_date=start_date,
+                end_date=end_date
+            )
+        
+        if response_cache:
+            logger.info(f"Response cache stats: {response_cache.stats()}")
+        if SCRAPER_RATE_LIMIT:
+            logger.info(f"Rate limiter stats: {rate_limiter_stats()}")
+        logger.info(f"Single-flight stats: {single_flight.stats()}")
+        
+        scrape_summary = scraper.batch_summary.to_dict()
+        logger.info(f"Scrape summary: {scrape_summary}")
+        
+        delta_tracker = None
+        delta_summary = None
+        if delta_mode:
+            if LOCAL_TESTING:
+                delta_store = LocalStore(os.path.join(TEMP_OUTPUT_DIR, 'stock-scraper-delta'))
+            else:
+                delta_store = S3Store(s3_manager, prefix=DELTA_PREFIX)
+            delta_tracker = DeltaTracker(delta_store, state_key(stock_symbols), snapshot_interval=DELTA_SNAPSHOT_INTERVAL)
+            
+            scraped_count = len(stock_data)
+            stock_data, snapshot = delta_tracker.filter(stock_data, full_snapshot=bool(body.get('full_snapshot')))
+            delta_summary = {
+                'snapshot': snapshot,
+                'changed': len(stock_data),
+                'unchanged': scraped_count - len(stock_data),
+            }
+            
+            if not stock_data:
+                delta_tracker.save()
+                return {
+                    'statusCode': 200,
+                    'body': json.dumps({
+                        'message': 'No quote changes since the last scrape',
+                        'data': {
+                            's3_uri': None,
+                            'download_url': None,
+                            'stock_symbols': stock_symbols,
+                            'output_format': output_format,
+                            'summary': scrape_summary,
+                            'delta': delta_summary
+                        }
+                    })
+                }
         
         processed_data = processor.process_data(stock_data, start_date, end_date)
         
         timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
         symbols_str = '-'.join(stock_symbols)
         filename = f"stock_data_{symbols_str}_{timestamp}"
+        if delta_summary and not delta_summary['snapshot']:
+            filename = f"{filename}_delta"
         
+        dataset_uris = None
         if LOCAL_TESTING:
             logger.info(f"Saving data locally to {TEMP_OUTPUT_DIR}/{filename}.{output_format}")
             local_path = os.path.join(TEMP_OUTPUT_DIR, f"{filename}.{output_format}")
@@ -95,6 +201,10 @@ def lambda_handler(event, context):
             else:
                 if output_format == 'csv':
                     scraper.save_to_csv(processed_data, local_path)
+                elif output_format == 'parquet':
+                    scraper.save_to_parquet(processed_data, local_path)
+                elif output_format == 'arrow':
+                    scraper.save_to_arrow(processed_data, local_path)
                 
             s3_uri = f"file://{local_path}"
             presigned_url = f"file://{local_path}"
@@ -102,6 +212,12 @@ def lambda_handler(event, context):
             s3_key = f"data/{filename}.{output_format}"
             s3_uri = s3_manager.upload_data(processed_data, s3_key, file_format=output_format)
             presigned_url = s3_manager.generate_presigned_url(s3_key, expiration=3600)
+            
+            if PARTITIONED_DATASET:
+                dataset_uris = write_partitioned(s3_manager, processed_data, prefix=DATASET_PREFIX)
+        
+        if delta_tracker:
+            delta_tracker.save()
         
         return {
             'statusCode': 200,
@@ -114,7 +230,10 @@ def lambda_handler(event, context):
                     'stock_symbols': stock_symbols,
                     'start_date': start_date,
                     'end_date': end_date,
-                    'output_format': output_format
+                    'output_format': output_format,
+                    'summary': scrape_summary,
+                    'delta': delta_summary,
+                    'dataset_uris': dataset_uris
                 }
             })
         }
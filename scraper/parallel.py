@@ -0,0 +1,328 @@
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+from indicators import compute_indicators
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.environ.get('PROCESS_WORKERS', '0')) or os.cpu_count() or 1
+
+# Column recording each row's position in the input, to reassemble shards in order
+ROW_COLUMN = '_row'
+
+# Text columns with at most this share of distinct values are dictionary-encoded
+DICTIONARY_RATIO = 0.5
+
+
+def pack_strings(values):
+    """
+    Pack a column of strings into one UTF-8 buffer and character offsets
+    
+    The buffer pickles as a single bytes object however many strings it
+    holds, instead of one pickled object per value.
+    
+    Args:
+        values (numpy.ndarray): Object array of strings, None or NaN where missing
+    
+    Returns:
+        tuple: (UTF-8 bytes, offsets of len(values) + 1, bool validity)
+    """
+    valid = ~pd.isna(values)
+    strings = np.where(valid, values, '')
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    offsets = np.zeros(len(strings) + 1, dtype=np.uint32 if lengths.sum() < 2 ** 32 else np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return ''.join(strings).encode('utf-8'), offsets, valid
+
+
+def unpack_strings(data, offsets, valid):
+    """
+    Rebuild a column packed by pack_strings
+    
+    Returns:
+        numpy.ndarray: Object array of strings, None where missing
+    """
+    text = data.decode('utf-8')
+    bounds = offsets.tolist()
+    strings = np.empty(len(valid), dtype=object)
+    strings[:] = [text[start:stop] for start, stop in zip(bounds, bounds[1:])]
+    strings[~valid] = None
+    return strings
+
+
+def _encode(values):
+    """
+    Encode a column by the type of its values, leaving non-repetitive text as it is
+    
+    Returns:
+        tuple: (kind, payload), kind 'raw' for text still to be packed
+    """
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind in ('string', 'empty'):
+        codes, uniques = pd.factorize(values)
+        if len(uniques) <= len(values) * DICTIONARY_RATIO:
+            return ('dictionary', (codes.astype(np.int32), pack_strings(np.asarray(uniques, dtype=object))))
+        return ('raw', values)
+    if kind == 'integer' and not pd.isna(values).any():
+        try:
+            # Complete integer columns stay integers, as process_data keeps them
+            return ('array', values.astype(np.int64))
+        except OverflowError:
+            pass
+    if kind in ('integer', 'floating', 'mixed-integer-float'):
+        valid = ~pd.isna(values)
+        return ('numbers', (np.where(valid, values, np.nan).astype(np.float64), valid))
+    return ('raw', values)
+
+
+def pack_column(values):
+    """
+    Pack one column into NumPy buffers by the type of its values
+    
+    Repetitive text such as symbols, company names and poll timestamps is
+    dictionary-encoded into int32 codes and the distinct strings; other text
+    is packed with pack_strings. Integers without gaps go into an int64
+    array and other numbers into a float64 array.
+    
+    Args:
+        values (numpy.ndarray): Object array, None where missing
+    
+    Returns:
+        tuple: (kind, payload) as unpack_column takes it
+    """
+    kind, payload = _encode(values)
+    if kind != 'raw':
+        return kind, payload
+    if pd.api.types.infer_dtype(values, skipna=True) == 'string':
+        return ('strings', pack_strings(values))
+    # Anything else is rare enough to pickle as it is
+    return ('pickle', pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def unpack_column(packed):
+    """
+    Rebuild a column packed by pack_column or a NumPy column of pack_frame
+    
+    Returns:
+        numpy.ndarray: Column values, None where text or numbers were missing
+    """
+    kind, payload = packed
+    if kind == 'array':
+        return payload
+    if kind == 'dictionary':
+        codes, uniques = payload
+        # Code -1 marks a missing value and picks the trailing None
+        return np.append(unpack_strings(*uniques), None)[codes]
+    if kind == 'strings':
+        return unpack_strings(*payload)
+    if kind == 'numbers':
+        numbers, valid = payload
+        values = numbers.astype(object)
+        values[~valid] = None
+        return values
+    return pickle.loads(payload)
+
+
+def _take(encoded, selected):
+    """
+    Pack the selected rows of a column encoded by _encode
+    """
+    kind, payload = encoded
+    if kind == 'array':
+        return (kind, payload[selected])
+    if kind == 'dictionary':
+        codes, uniques = payload
+        return (kind, (codes[selected], uniques))
+    if kind == 'numbers':
+        numbers, valid = payload
+        return (kind, (numbers[selected], valid[selected]))
+    return pack_column(payload[selected])
+
+
+def to_columns(records):
+    """
+    Turn stock data dictionaries into object arrays, one per field
+    
+    Args:
+        records (list): Dictionaries; a field missing from a record becomes None
+    
+    Returns:
+        dict: Object arrays keyed by field
+    """
+    if not records:
+        return {}
+    # Fields of the first record keep their order; any others follow sorted
+    names = list(records[0])
+    names += sorted(set().union(*records).difference(names))
+    columns = {}
+    for name in names:
+        column = np.empty(len(records), dtype=object)
+        try:
+            column[:] = list(map(itemgetter(name), records))
+        except KeyError:
+            column[:] = [record.get(name) for record in records]
+        columns[name] = column
+    return columns
+
+
+def pack_frame(df):
+    """
+    Pack a DataFrame column by column, NumPy columns as they are
+    
+    Args:
+        df (pandas.DataFrame): Frame to pack
+    
+    Returns:
+        dict: Packed columns keyed by name
+    """
+    packed = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, np.dtype) and column.dtype != object:
+            packed[name] = ('array', column.to_numpy())
+        else:
+            values = column.to_numpy(dtype=object)
+            values[pd.isna(column).to_numpy()] = None
+            packed[name] = pack_column(values)
+    return packed
+
+
+def unpack_frame(packed):
+    """
+    Rebuild a DataFrame packed by pack_frame
+    
+    Returns:
+        pandas.DataFrame: Frame with a fresh RangeIndex
+    """
+    return pd.DataFrame({name: unpack_column(column) for name, column in packed.items()})
+
+
+def assign_shards(symbols, shards):
+    """
+    Spread symbols over shards so each shard gets about as many rows
+    
+    Symbols go largest first to the shard with the fewest rows so far, ties
+    broken by symbol and shard number, so the assignment only depends on the
+    data.
+    
+    Args:
+        symbols (pandas.Series): Symbol of every row
+        shards (int): Number of shards
+    
+    Returns:
+        numpy.ndarray: Shard number of every row
+    """
+    counts = symbols.value_counts(dropna=False)
+    order = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    loads = [0] * shards
+    shard_of = {}
+    for symbol, count in order:
+        shard = min(range(shards), key=lambda index: (loads[index], index))
+        shard_of[symbol] = shard
+        loads[shard] += count
+    return symbols.map(shard_of).to_numpy(dtype=np.int64)
+
+
+def _process_shard(packed, start_date, end_date, windows, price_column):
+    """
+    Run the processing stages over one shard in a worker process
+    
+    The row column passes through cleaning like any other field, so every
+    processed row still knows where it came from.
+    """
+    processor = DataProcessor()
+    columns = {name: unpack_column(column).tolist() for name, column in packed.items()}
+    try:
+        df = processor.process_columns(columns, start_date, end_date)
+    except Exception as e:
+        # The per-record path logs and skips records that cannot be cleaned
+        logger.warning(f"Falling back to per-record processing of a shard: {e}")
+        names = list(columns)
+        records = [dict(zip(names, row)) for row in zip(*columns.values())]
+        df = processor.process_data(records, start_date, end_date)
+    if windows is not None and not df.empty:
+        df = compute_indicators(df, price_column=price_column, windows=windows)
+    return pack_frame(df)
+
+
+def process_sharded(stock_data, start_date=None, end_date=None, workers=DEFAULT_WORKERS,
+                    windows=None, price_column='current_price', shards=None):
+    """
+    Process stock data on several cores, sharded by symbol
+    
+    Every symbol's rows go to one shard, and each shard is cleaned, filtered
+    and given its metrics in a worker process, by the same DataProcessor
+    stages process_data runs. Shards travel to and from the workers as
+    packed column buffers rather than pickled dictionaries. The result has
+    the rows in input order, or when windows is given, in symbol and time
+    order as compute_indicators returns them, whatever the number of workers.
+    
+    Args:
+        stock_data (iterable): Dictionaries containing stock data
+        start_date (str, optional): Start date in YYYY-MM-DD format
+        end_date (str, optional): End date in YYYY-MM-DD format
+        workers (int, optional): Worker processes, 1 to process in this process
+        windows (dict, optional): Indicator windows; adds per-symbol
+            indicators from compute_indicators to every shard
+        price_column (str, optional): Price column the indicators use
+        shards (int, optional): Number of shards, defaults to workers
+    
+    Returns:
+        pandas.DataFrame: Processed DataFrame
+    """
+    columns = to_columns(list(stock_data))
+    if not columns:
+        return DataProcessor().process_data([], start_date, end_date)
+    rows = len(next(iter(columns.values())))
+    
+    shards = max(1, shards or workers)
+    symbols = columns.get('symbol', np.full(rows, None, dtype=object))
+    shard_of_row = assign_shards(pd.Series(symbols), shards)
+    
+    # Encoding whole columns once lets every shard take its rows by index
+    encoded = {name: _encode(column) for name, column in columns.items()}
+    encoded[ROW_COLUMN] = ('array', np.arange(rows, dtype=np.int64))
+    del columns
+    packed_shards = []
+    for shard in range(shards):
+        selected = np.flatnonzero(shard_of_row == shard)
+        if len(selected):
+            packed_shards.append({name: _take(column, selected) for name, column in encoded.items()})
+    del encoded
+    
+    arguments = (start_date, end_date, windows, price_column)
+    if workers <= 1 or len(packed_shards) == 1:
+        results = [_process_shard(packed, *arguments) for packed in packed_shards]
+    else:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(packed_shards))) as executor:
+                futures = [executor.submit(_process_shard, packed, *arguments) for packed in packed_shards]
+                results = [future.result() for future in futures]
+        except (OSError, NotImplementedError) as e:
+            # Process pools need /dev/shm semaphores, which AWS Lambda does not have
+            logger.warning(f"Process pool unavailable, processing shards in this process: {e}")
+            results = [_process_shard(packed, *arguments) for packed in packed_shards]
+    
+    frames = [unpack_frame(packed) for packed in results]
+    df = pd.concat([frame for frame in frames if not frame.empty] or frames[:1], ignore_index=True)
+    if ROW_COLUMN in df.columns:
+        if windows is not None:
+            time_column = 'timestamp' if 'timestamp' in df.columns else 'date'
+            df = df.sort_values(['symbol', time_column, ROW_COLUMN], kind='stable')
+        else:
+            df = df.sort_values(ROW_COLUMN, kind='stable')
+        df = df.drop(columns=ROW_COLUMN).reset_index(drop=True)
+    
+    logger.info(f"Processed {len(df)} rows in {len(packed_shards)} shards on up to {workers} workers")
+    return df
@@ -0,0 +1,297 @@
+import argparse
+import heapq
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from delta import quote_fingerprint
+from rate_limiter import AdaptiveRateLimiter
+from scraper import StockScraper
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = float(os.environ.get('POLL_INTERVAL', '60'))
+DEFAULT_POLL_BUDGET = float(os.environ.get('POLL_BUDGET', '1'))
+
+# Longest single sleep while waiting for a symbol, so symbols added in the
+# meantime are picked up promptly
+POLL_TICK = 1.0
+
+
+class QuotePoller:
+    """
+    Keeps the quotes of a symbol universe fresh within a global fetch budget
+    
+    Every symbol has a target refresh interval. Symbols wait in a priority
+    queue ordered by the time they become due, so when the budget cannot keep
+    up the stalest symbol is always fetched next. A quote is only emitted when
+    its price or change differs from the last one emitted for that symbol.
+    """
+    
+    def __init__(self, scraper, intervals=None, default_interval=DEFAULT_POLL_INTERVAL,
+                 budget=DEFAULT_POLL_BUDGET, emit=None, ticks=None, indicators=None, bars=None, clock=time.monotonic, sleep=None):
+        """
+        Initialize the poller
+        
+        Args:
+            scraper (StockScraper): Scraper used to fetch quotes
+            intervals (dict, optional): Target refresh interval in seconds keyed by symbol
+            default_interval (float, optional): Interval for symbols added without one
+            budget (float, optional): Maximum fetches per second across all symbols
+            emit (callable, optional): Called with each changed quote record
+            ticks (QuoteBatch, optional): Batch every changed quote is also
+                added to, so a day of ticks stays in memory compactly
+            indicators (IndicatorEngine, optional): Engine updated with every
+                fetched quote; its values are added to the emitted records
+            bars (BarAggregator, optional): Aggregator every fetched quote is
+                added to, keeping OHLC bars of the symbols current
+            clock (callable, optional): Monotonic time source
+            sleep (callable, optional): Sleep function, defaults to a wait that
+                stop() interrupts
+        """
+        if budget <= 0:
+            raise ValueError(f"budget must be positive, got {budget}")
+        
+        self.scraper = scraper
+        self.default_interval = default_interval
+        self.budget = budget
+        self.emit = emit or (lambda record: None)
+        self.ticks = ticks
+        self.indicators = indicators
+        self.bars = bars
+        self._clock = clock
+        self._stop = threading.Event()
+        self._sleep = sleep or self._stop.wait
+        self._limiter = AdaptiveRateLimiter(
+            initial_rate=budget, min_rate=budget, max_rate=budget, clock=clock, sleep=self._sleep
+        )
+        
+        self._lock = threading.Lock()
+        self._queue = []
+        self._due = {}
+        self._intervals = {}
+        self._last_quotes = {}
+        self._stats = {}
+        
+        for symbol, interval in (intervals or {}).items():
+            self.add_symbol(symbol, interval)
+    
+    def add_symbol(self, symbol, interval=None):
+        """
+        Add a symbol to the universe, due immediately
+        
+        Args:
+            symbol (str): Stock symbol or URL suffix on investing.com
+            interval (float, optional): Target refresh interval in seconds
+        """
+        interval = interval or self.default_interval
+        with self._lock:
+            self._intervals[symbol] = interval
+            self._stats.setdefault(symbol, {
+                'fetches': 0,
+                'changes': 0,
+                'errors': 0,
+                'last_fetched_at': None,
+                'last_lag': 0.0,
+                'max_lag': 0.0,
+            })
+            if symbol not in self._due:
+                self._schedule(symbol, self._clock())
+    
+    def remove_symbol(self, symbol):
+        """
+        Remove a symbol from the universe
+        
+        Args:
+            symbol (str): Stock symbol or URL suffix on investing.com
+        """
+        with self._lock:
+            self._intervals.pop(symbol, None)
+            self._due.pop(symbol, None)
+            self._last_quotes.pop(symbol, None)
+            self._stats.pop(symbol, None)
+    
+    def _schedule(self, symbol, due_at):
+        # Superseded queue entries are skipped when popped because their due
+        # time no longer matches self._due
+        self._due[symbol] = due_at
+        heapq.heappush(self._queue, (due_at, symbol))
+    
+    def _next_due(self):
+        with self._lock:
+            while self._queue:
+                due_at, symbol = self._queue[0]
+                if self._due.get(symbol) == due_at:
+                    return due_at, symbol
+                heapq.heappop(self._queue)
+            return None
+    
+    def poll_once(self):
+        """
+        Fetch the stalest symbol once it is due and within budget
+        
+        If nothing is due yet this sleeps for at most POLL_TICK seconds and
+        returns, so callers loop on it.
+        
+        Returns:
+            dict: The quote record if one was fetched and changed, otherwise None
+        """
+        entry = self._next_due()
+        if entry is None:
+            return None
+        
+        due_at, symbol = entry
+        wait_for = due_at - self._clock()
+        if wait_for > 0:
+            self._sleep(min(wait_for, POLL_TICK))
+            return None
+        
+        self._limiter.acquire()
+        
+        with self._lock:
+            if self._due.get(symbol) != due_at:
+                return None
+            # None marks the symbol as in flight; its queue entry is now stale
+            self._due[symbol] = None
+        
+        fetched_at = self._clock()
+        try:
+            records = self.scraper.scrape_stock_data(symbol)
+        except Exception as e:
+            logger.error(f"Failed to poll {symbol}: {e}")
+            records = None
+        
+        with self._lock:
+            if symbol not in self._intervals:
+                return None
+            
+            stats = self._stats[symbol]
+            lag = max(0.0, fetched_at - due_at)
+            stats['fetches'] += 1
+            stats['last_fetched_at'] = fetched_at
+            stats['last_lag'] = lag
+            stats['max_lag'] = max(stats['max_lag'], lag)
+            self._schedule(symbol, fetched_at + self._intervals[symbol])
+            
+            if not records:
+                stats['errors'] += 1
+                return None
+            
+            record = records[0]
+            values = self.indicators.update_record(record) if self.indicators is not None else None
+            if self.bars is not None:
+                self.bars.update_record(record)
+            
+            quote = quote_fingerprint(record)
+            if self._last_quotes.get(symbol) == quote:
+                return None
+            self._last_quotes[symbol] = quote
+            stats['changes'] += 1
+            
+            if values:
+                record = dict(record, **values)
+        
+        if self.ticks is not None:
+            self.ticks.extend([record])
+        self.emit(record)
+        return record
+    
+    def run(self, duration=None, report_every=None):
+        """
+        Poll until stop() is called or the duration has passed
+        
+        Args:
+            duration (float, optional): Seconds to run for, forever if None
+            report_every (float, optional): Seconds between logged lag reports
+        """
+        started = self._clock()
+        deadline = started + duration if duration is not None else None
+        next_report = started + report_every if report_every else None
+        logger.info(f"Polling {len(self._intervals)} symbols with a budget of {self.budget} fetches/s")
+        
+        while not self._stop.is_set():
+            now = self._clock()
+            if deadline is not None and now >= deadline:
+                break
+            if next_report is not None and now >= next_report:
+                logger.info(f"Lag report: {json.dumps(self.lag_report())}")
+                next_report = now + report_every
+            if self._next_due() is None:
+                self._sleep(POLL_TICK)
+                continue
+            self.poll_once()
+    
+    def stop(self):
+        """
+        Stop a running poller
+        """
+        self._stop.set()
+    
+    def lag_report(self):
+        """
+        Report how far behind its target interval each symbol is
+        
+        Lag is how long after becoming due a symbol was fetched. The required
+        rate is the fetch rate the universe needs to meet every interval;
+        above the budget, lag keeps growing.
+        
+        Returns:
+            dict: Per-symbol stats, with the required rate and the budget
+        """
+        with self._lock:
+            now = self._clock()
+            symbols = {}
+            for symbol, interval in self._intervals.items():
+                stats = dict(self._stats[symbol])
+                last_fetched_at = stats.pop('last_fetched_at')
+                stats['interval'] = interval
+                stats['age'] = None if last_fetched_at is None else now - last_fetched_at
+                due_at = self._due.get(symbol)
+                stats['overdue'] = 0.0 if due_at is None else max(0.0, now - due_at)
+                symbols[symbol] = stats
+            
+            return {
+                'symbols': symbols,
+                'required_rate': sum(1.0 / interval for interval in self._intervals.values()),
+                'budget': self.budget,
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Continuously poll quotes and print changes as JSON lines")
+    parser.add_argument('symbols', nargs='+', help="Symbols, optionally with an interval as symbol:seconds")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument('--budget', type=float, default=DEFAULT_POLL_BUDGET)
+    parser.add_argument('--duration', type=float, default=None)
+    parser.add_argument('--report-every', type=float, default=300)
+    args = parser.parse_args()
+    
+    intervals = {}
+    for item in args.symbols:
+        symbol, _, interval = item.partition(':')
+        intervals[symbol] = float(interval) if interval else args.interval
+    
+    def emit(record):
+        sys.stdout.write(json.dumps(record) + '\n')
+        sys.stdout.flush()
+    
+    poller = QuotePoller(
+        StockScraper(api_key=os.environ.get('SCRAPER_API_KEY'), rate_limit=True),
+        intervals,
+        default_interval=args.interval,
+        budget=args.budget,
+        emit=emit
+    )
+    
+    try:
+        poller.run(args.duration, report_every=args.report_every)
+    except KeyboardInterrupt:
+        poller.stop()
+    logger.info(f"Lag report: {json.dumps(poller.lag_report())}")
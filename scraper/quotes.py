@@ -0,0 +1,333 @@
+import logging
+import sys
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from data_processor import DataProcessor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Numeric columns of a quote, parsed from the scraped strings once
+PRICE_COLUMNS = ('current_price', 'price_change')
+
+DEFAULT_BATCH_CAPACITY = 1024
+
+_processor = DataProcessor()
+
+
+def _utc(timestamp):
+    """
+    Convert a datetime with an offset to naive UTC, leaving naive ones as they are
+    """
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_timestamps(values):
+    """
+    Parse ISO timestamp strings in one NumPy call, NaT where missing
+    
+    Timestamps with an offset are converted to naive UTC, whichever path
+    parses them.
+    """
+    timestamps = [value if value not in ('', 'N/A') else None for value in values]
+    try:
+        with warnings.catch_warnings():
+            # NumPy converts offsets to UTC, warning that it cannot keep them
+            warnings.simplefilter('ignore', UserWarning)
+            return np.array(timestamps, dtype='datetime64[us]')
+    except ValueError:
+        # Formats NumPy does not parse
+        return np.array([
+            np.datetime64(_utc(datetime.fromisoformat(value)), 'us') if value else None
+            for value in timestamps
+        ], dtype='datetime64[us]')
+
+
+class Quote:
+    """
+    A single quote with numeric prices
+    
+    Slotted, so a quote takes a fraction of the memory of the equivalent
+    dict. Prices are floats, None where the page had none.
+    """
+    
+    __slots__ = ('symbol', 'company_name', 'current_price', 'price_change', 'timestamp')
+    
+    def __init__(self, symbol, company_name=None, current_price=None, price_change=None, timestamp=None):
+        """
+        Initialize the quote
+        
+        Args:
+            symbol (str): Stock symbol
+            company_name (str, optional): Company name
+            current_price (float, optional): Last price
+            price_change (float, optional): Change since the previous close
+            timestamp (datetime, optional): When the quote was scraped
+        """
+        self.symbol = sys.intern(symbol)
+        self.company_name = company_name
+        self.current_price = current_price
+        self.price_change = price_change
+        self.timestamp = timestamp
+    
+    def __eq__(self, other):
+        if not isinstance(other, Quote):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self):
+        return f"Quote({self.symbol!r}, current_price={self.current_price!r}, timestamp={self.timestamp!r})"
+    
+    def to_dict(self):
+        """
+        Convert the quote to a stock data record
+        
+        Returns:
+            dict: Record with numeric prices and an ISO timestamp
+        """
+        return {
+            'symbol': self.symbol,
+            'company_name': self.company_name,
+            'current_price': self.current_price,
+            'price_change': self.price_change,
+            'timestamp': self.timestamp.isoformat() if self.timestamp is not None else None,
+        }
+
+
+class QuoteBatch:
+    """
+    A column-oriented batch of quotes backed by typed NumPy arrays
+    
+    Each quote costs 28 bytes: an int32 symbol code, two float64 prices and
+    a datetime64[us] timestamp. Symbols are interned in a table shared by the
+    batch and company names are kept once per symbol. Buffers grow by half
+    their size at a time, and to_dataframe and to_arrow hand out views of
+    them rather than copies.
+    """
+    
+    def __init__(self, capacity=DEFAULT_BATCH_CAPACITY):
+        """
+        Initialize an empty batch
+        
+        Args:
+            capacity (int, optional): Number of quotes to allocate room for
+        """
+        self._size = 0
+        self._symbols = []
+        self._symbol_codes = {}
+        self._company_names = []
+        self._codes = np.empty(capacity, dtype=np.int32)
+        self._prices = {column: np.empty(capacity, dtype=np.float64) for column in PRICE_COLUMNS}
+        self._timestamps = np.empty(capacity, dtype='datetime64[us]')
+    
+    @classmethod
+    def from_records(cls, stock_data):
+        """
+        Build a batch from stock data records
+        
+        Args:
+            stock_data (iterable): Records as returned by scrape_stock_data,
+                with prices as scraped strings or already numbers
+        
+        Returns:
+            QuoteBatch: Batch holding the records
+        """
+        batch = cls()
+        batch.extend(stock_data)
+        return batch
+    
+    def __len__(self):
+        return self._size
+    
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("QuoteBatch index out of range")
+        
+        code = self._codes[index]
+        prices = (self._prices[column][index] for column in PRICE_COLUMNS)
+        timestamp = self._timestamps[index]
+        return Quote(
+            self._symbols[code],
+            self._company_names[code],
+            *(None if np.isnan(price) else float(price) for price in prices),
+            timestamp=None if np.isnat(timestamp) else timestamp.astype(datetime)
+        )
+    
+    @property
+    def symbols(self):
+        """
+        list: Distinct symbols in the order they were first seen
+        """
+        return list(self._symbols)
+    
+    @property
+    def nbytes(self):
+        """
+        int: Bytes held by the column buffers, including unused capacity
+        """
+        return self._codes.nbytes + self._timestamps.nbytes + sum(prices.nbytes for prices in self._prices.values())
+    
+    def _reserve(self, count):
+        needed = self._size + count
+        capacity = len(self._codes)
+        if needed <= capacity:
+            return
+        
+        capacity = max(needed, capacity + capacity // 2)
+        self._codes = np.resize(self._codes, capacity)
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._prices = {column: np.resize(prices, capacity) for column, prices in self._prices.items()}
+    
+    def _symbol_code(self, symbol, company_name=None):
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            symbol = sys.intern(symbol)
+            self._symbols.append(symbol)
+            self._symbol_codes[symbol] = code
+            self._company_names.append(company_name)
+        elif company_name and company_name != 'N/A':
+            self._company_names[code] = company_name
+        return code
+    
+    def append(self, quote):
+        """
+        Add one quote
+        
+        Args:
+            quote (Quote): Quote to add
+        """
+        self._reserve(1)
+        index = self._size
+        self._codes[index] = self._symbol_code(quote.symbol, quote.company_name)
+        for column in PRICE_COLUMNS:
+            price = getattr(quote, column)
+            self._prices[column][index] = np.nan if price is None else price
+        self._timestamps[index] = np.datetime64(quote.timestamp, 'us') if quote.timestamp is not None else np.datetime64('NaT')
+        self._size += 1
+    
+    def extend(self, stock_data):
+        """
+        Add stock data records, parsing each price column in bulk
+        
+        Args:
+            stock_data (iterable): Records as returned by scrape_stock_data,
+                with prices as scraped strings or already numbers
+        """
+        stock_data = list(stock_data)
+        if not stock_data:
+            return
+        
+        self._reserve(len(stock_data))
+        start, end = self._size, self._size + len(stock_data)
+        
+        self._codes[start:end] = [self._symbol_code(item['symbol'], item.get('company_name')) for item in stock_data]
+        for column in PRICE_COLUMNS:
+            values = [item.get(column) for item in stock_data]
+            if all(isinstance(value, str) or value is None for value in values):
+                values = _processor.clean_price_column(values)
+            self._prices[column][start:end] = np.array(values, dtype=np.float64)
+        self._timestamps[start:end] = _parse_timestamps([item.get('timestamp') for item in stock_data])
+        
+        self._size = end
+    
+    def column(self, name):
+        """
+        Get a view of one column
+        
+        Args:
+            name (str): 'symbol', 'current_price', 'price_change' or 'timestamp'
+        
+        Returns:
+            numpy.ndarray: Symbol codes for 'symbol', values otherwise
+        """
+        if name == 'symbol':
+            return self._codes[:self._size]
+        if name == 'timestamp':
+            return self._timestamps[:self._size]
+        return self._prices[name][:self._size]
+    
+    def _company_name_codes(self):
+        """
+        Get the distinct company names and the name code of every symbol, -1 where unknown
+        """
+        names = sorted({name for name in self._company_names if name is not None})
+        lookup = {name: code for code, name in enumerate(names)}
+        name_codes = np.array([lookup.get(name, -1) for name in self._company_names], dtype=np.int32)
+        return names, name_codes
+    
+    def to_records(self):
+        """
+        Convert the batch to stock data records
+        
+        Returns:
+            list: Records with numeric prices and ISO timestamps
+        """
+        return [quote.to_dict() for quote in self]
+    
+    def to_dataframe(self):
+        """
+        Convert the batch to a DataFrame sharing the price and timestamp buffers
+        
+        symbol and company_name become categoricals. The frame is a view, so
+        copy it before modifying it if the batch is still in use.
+        
+        Returns:
+            pandas.DataFrame: One row per quote
+        """
+        codes = self._codes[:self._size]
+        names, name_codes = self._company_name_codes()
+        columns = {
+            'symbol': pd.Categorical.from_codes(codes, categories=self._symbols),
+            'company_name': pd.Categorical.from_codes(name_codes[codes], categories=names),
+        }
+        for column in PRICE_COLUMNS:
+            columns[column] = self._prices[column][:self._size]
+        columns['timestamp'] = self._timestamps[:self._size]
+        return pd.DataFrame(columns, copy=False)
+    
+    def to_arrow(self):
+        """
+        Convert the batch to an Arrow table sharing the column buffers
+        
+        Returns:
+            pyarrow.Table: One row per quote, with symbol and company_name
+                dictionary encoded
+        """
+        if pa is None:
+            raise ImportError("Arrow output requires the pyarrow package")
+        
+        codes = self._codes[:self._size]
+        names, name_codes = self._company_name_codes()
+        columns = {
+            'symbol': pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(self._symbols, type=pa.string())),
+            'company_name': pa.DictionaryArray.from_arrays(
+                pa.array(name_codes[codes], mask=name_codes[codes] < 0), pa.array(names, type=pa.string())
+            ),
+        }
+        for column in PRICE_COLUMNS:
+            prices = self._prices[column][:self._size]
+            missing = np.isnan(prices)
+            columns[column] = pa.array(prices, mask=missing if missing.any() else None)
+        columns['timestamp'] = pa.array(self._timestamps[:self._size])
+        return pa.table(columns)
@@ -0,0 +1,234 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_INITIAL_RATE = float(os.environ.get('SCRAPER_INITIAL_RATE', '2'))
+DEFAULT_MIN_RATE = float(os.environ.get('SCRAPER_MIN_RATE', '0.2'))
+DEFAULT_MAX_RATE = float(os.environ.get('SCRAPER_MAX_RATE', '20'))
+
+# Status codes that mean the upstream wants us to slow down
+THROTTLE_STATUS_CODES = {403, 429}
+
+
+def is_throttle_status(status_code):
+    """
+    Check whether an HTTP status code should cut the request rate
+    
+    Args:
+        status_code (int): HTTP status code
+    
+    Returns:
+        bool: True for 403, 429 and any 5xx
+    """
+    return status_code in THROTTLE_STATUS_CODES or 500 <= status_code < 600
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parse a Retry-After header into a number of seconds
+    
+    Args:
+        value (str): Header value, either delay-seconds or an HTTP date
+        now (datetime, optional): Current time, used for HTTP dates
+    
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket whose refill rate adapts with additive increase and
+    multiplicative decrease (AIMD)
+    
+    Every success raises the rate by about `increase` requests per second
+    each second, and every throttling response cuts it by `decrease_factor`.
+    Several concurrent throttling responses within one cooldown only cut the
+    rate once. A Retry-After value pauses all callers until it has passed.
+    """
+    
+    def __init__(self, initial_rate=DEFAULT_INITIAL_RATE, min_rate=DEFAULT_MIN_RATE,
+                 max_rate=DEFAULT_MAX_RATE, increase=0.5, decrease_factor=0.5,
+                 decrease_cooldown=1.0, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            initial_rate (float, optional): Starting rate in requests per second
+            min_rate (float, optional): Lowest rate the limiter backs off to
+            max_rate (float, optional): Highest rate the limiter grows to
+            increase (float, optional): Additive increase per second of successes
+            decrease_factor (float, optional): Multiplier applied on throttling
+            decrease_cooldown (float, optional): Seconds after a decrease during
+                which further throttling responses are ignored
+            clock (callable, optional): Monotonic time source
+            sleep (callable, optional): Sleep function
+        """
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._last_decrease = None
+        self._waiting = 0
+        
+        self.successes = 0
+        self.throttles = 0
+    
+    def _refill(self, now):
+        capacity = max(1.0, self.rate)
+        self._tokens = min(capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+    
+    def acquire(self):
+        """
+        Block until a request may be sent
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        started = self._clock()
+        
+        with self._lock:
+            self._waiting += 1
+        
+        try:
+            while True:
+                with self._lock:
+                    now = self._clock()
+                    self._refill(now)
+                    
+                    if now < self._blocked_until:
+                        delay = self._blocked_until - now
+                    elif self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return self._clock() - started
+                    else:
+                        delay = (1.0 - self._tokens) / self.rate
+                
+                self._sleep(delay)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+    
+    def record_success(self):
+        """
+        Grow the rate after a successful request
+        """
+        with self._lock:
+            self.successes += 1
+            self._refill(self._clock())
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+    
+    def record_throttle(self, retry_after=None):
+        """
+        Cut the rate after a throttling response or a failed connection
+        
+        Args:
+            retry_after (float, optional): Seconds the upstream asked us to wait
+        """
+        with self._lock:
+            now = self._clock()
+            self.throttles += 1
+            self._refill(now)
+            
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            
+            if self._last_decrease is not None and now - self._last_decrease < self.decrease_cooldown:
+                return
+            
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 1.0)
+            logger.warning(f"Upstream throttled, cutting rate to {self.rate:.2f} req/s")
+    
+    def stats(self):
+        """
+        Get the current state of the limiter
+        
+        Returns:
+            dict: Current rate, queue depth, blocked time and counters
+        """
+        with self._lock:
+            now = self._clock()
+            return {
+                'rate': self.rate,
+                'queue_depth': self._waiting,
+                'blocked_for': max(0.0, self._blocked_until - now),
+                'successes': self.successes,
+                'throttles': self.throttles,
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host):
+    """
+    Get the shared rate limiter for an upstream host
+    
+    Args:
+        host (str): Host name, e.g. 'www.investing.com'
+    
+    Returns:
+        AdaptiveRateLimiter: Limiter shared by every fetch path talking to that host
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter()
+            _limiters[host] = limiter
+        return limiter
+
+
+def rate_limiter_stats():
+    """
+    Get the state of every shared rate limiter
+    
+    Returns:
+        dict: Limiter stats keyed by host
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.stats() for host, limiter in limiters.items()}
+
+
+def reset_rate_limiters():
+    """
+    Drop all shared rate limiters
+    """
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,279 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+from itertools import islice
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Records held in memory at once while reading stored data
+DEFAULT_CHUNK_SIZE = int(os.environ.get('PROCESS_CHUNK_SIZE', '50000'))
+
+# Characters read from a JSON array per decode step
+JSON_READ_SIZE = 64 * 1024
+
+EXTENSION_COMPRESSION = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
+
+EXTENSION_FORMATS = {
+    '.json': 'json',
+    '.ndjson': 'json',
+    '.jsonl': 'json',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+}
+
+
+def infer_format(name):
+    """
+    Get the file format and compression of a file from its name
+    
+    Args:
+        name (str): File name or object key, e.g. 'quotes.ndjson.gz'
+    
+    Returns:
+        tuple: (file format, compression or None)
+    """
+    root, extension = os.path.splitext(name)
+    compression = EXTENSION_COMPRESSION.get(extension.lower())
+    if compression:
+        root, extension = os.path.splitext(root)
+    
+    file_format = EXTENSION_FORMATS.get(extension.lower())
+    if file_format is None:
+        raise ValueError(f"Cannot tell the file format of {name}")
+    return file_format, compression
+
+
+def open_input(fileobj, compression=None):
+    """
+    Wrap a binary file object to read text, decompressing as it goes
+    
+    Args:
+        fileobj (file): Binary file object, such as an open file or an S3
+            object body
+        compression (str, optional): None, 'gzip' or 'zstd'
+    
+    Returns:
+        file: Text file object to read from
+    """
+    if compression == 'gzip':
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode='rb')
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+        fileobj = zstandard.ZstdDecompressor().stream_reader(fileobj)
+    elif compression is not None:
+        raise ValueError(f"Unsupported compression: {compression}")
+    
+    return io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+
+
+def iter_csv(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read CSV rows in chunks
+    
+    Args:
+        fileobj (file): Text file object
+        chunk_size (int, optional): Maximum records per chunk
+    
+    Yields:
+        list: Dictionaries of strings; empty fields come back as None
+    """
+    rows = csv.DictReader(fileobj)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield [{key: value if value != '' else None for key, value in row.items()} for row in chunk]
+
+
+def _iter_json_values(fileobj):
+    """
+    Decode the records of a JSON array or of newline-delimited JSON one at a time
+    
+    Only the text of the records not yet decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    while True:
+        # Skip whitespace and the array punctuation between records
+        while position < len(buffer) and buffer[position] in ' \t\r\n,[]':
+            position += 1
+        
+        if position == len(buffer):
+            if eof:
+                return
+            buffer, position = fileobj.read(JSON_READ_SIZE), 0
+            eof = not buffer
+            continue
+        
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # The record runs past the buffer
+            more = fileobj.read(JSON_READ_SIZE)
+            eof = not more
+            buffer, position = buffer[position:] + more, 0
+            continue
+        
+        if end == len(buffer) and not eof:
+            # A number at the end of the buffer may continue in the next read
+            more = fileobj.read(JSON_READ_SIZE)
+            if more:
+                buffer, position = buffer[position:] + more, 0
+                continue
+            eof = True
+        
+        yield value
+        position = end
+
+
+def iter_json(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read the records of a JSON array or of newline-delimited JSON in chunks
+    
+    Args:
+        fileobj (file): Text file object
+        chunk_size (int, optional): Maximum records per chunk
+    
+    Yields:
+        list: Dictionaries
+    """
+    values = _iter_json_values(fileobj)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet and Arrow input require the pyarrow package")
+
+
+def _seekable(fileobj):
+    """
+    Get a seekable copy of a binary stream, spooled to disk rather than memory
+    
+    Parquet and Arrow files keep their metadata in a footer, so a stream such
+    as an S3 object body is copied to a temporary file before reading.
+    """
+    if getattr(fileobj, 'seekable', lambda: False)():
+        return fileobj
+    spooled = tempfile.TemporaryFile()
+    shutil.copyfileobj(fileobj, spooled, length=1024 * 1024)
+    spooled.seek(0)
+    return spooled
+
+
+def iter_parquet(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read a Parquet file in chunks of record batches
+    
+    Args:
+        fileobj (str or file): Path or binary file object
+        chunk_size (int, optional): Maximum records per chunk
+    
+    Yields:
+        list: Dictionaries
+    """
+    _require_pyarrow()
+    source = fileobj if isinstance(fileobj, str) else _seekable(fileobj)
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+def iter_arrow(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read an Arrow IPC file in chunks, one or more per record batch
+    
+    Args:
+        fileobj (str or file): Path or binary file object
+        chunk_size (int, optional): Maximum records per chunk
+    
+    Yields:
+        list: Dictionaries
+    """
+    _require_pyarrow()
+    source = fileobj if isinstance(fileobj, str) else _seekable(fileobj)
+    reader = pa.ipc.open_file(source)
+    for index in range(reader.num_record_batches):
+        batch = reader.get_batch(index)
+        for offset in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(offset, chunk_size).to_pylist()
+
+
+def read_chunks(source, file_format=None, compression=None, chunk_size=DEFAULT_CHUNK_SIZE, s3_manager=None):
+    """
+    Read stored stock data in chunks of at most chunk_size records
+    
+    Args:
+        source (str or file): Local path, S3 object key when s3_manager is
+            given, or binary file object
+        file_format (str, optional): 'json', 'csv', 'parquet' or 'arrow',
+            inferred from the name by default
+        compression (str, optional): None, 'gzip' or 'zstd', inferred from
+            the name by default
+        chunk_size (int, optional): Maximum records per chunk
+        s3_manager (S3Manager, optional): Where source is stored
+    
+    Yields:
+        list: Dictionaries of stock data
+    """
+    if file_format is None:
+        if not isinstance(source, str):
+            raise ValueError("file_format is required when reading from a file object")
+        file_format, compression = infer_format(source)
+    
+    if s3_manager is not None:
+        fileobj = s3_manager.open_object(source)
+        if fileobj is None:
+            return
+    elif isinstance(source, str):
+        fileobj = open(source, 'rb')
+    else:
+        fileobj = source
+    
+    try:
+        if file_format in ('parquet', 'arrow'):
+            if compression is not None:
+                raise ValueError(f"{file_format} files are compressed internally, not with {compression}")
+            read = iter_parquet if file_format == 'parquet' else iter_arrow
+            yield from read(fileobj, chunk_size)
+        elif file_format in ('json', 'csv'):
+            read = iter_json if file_format == 'json' else iter_csv
+            yield from read(open_input(fileobj, compression), chunk_size)
+        else:
+            raise ValueError(f"Unsupported file format: {file_format}")
+    finally:
+        if fileobj is not source:
+            fileobj.close()
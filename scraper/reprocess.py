@@ -0,0 +1,123 @@
+import logging
+import os
+import tempfile
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+from readers import DEFAULT_CHUNK_SIZE, infer_format, read_chunks
+from writers import open_output, write_arrow, write_csv, write_json_array, write_ndjson, write_parquet
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _isoformat(values):
+    """
+    Format datetime64 values as ISO strings, with microseconds only where needed
+    """
+    present = ~np.isnat(values)
+    whole_seconds = (values[present].astype('datetime64[s]') == values[present]).all()
+    formatted = np.datetime_as_string(values, unit='s' if whole_seconds else 'us').astype(object)
+    formatted[~present] = None
+    return formatted
+
+
+def frame_records(df):
+    """
+    Convert a processed DataFrame to records that serialize as JSON
+    
+    Datetime columns become ISO strings and missing values become None, as
+    in the records process_stream yields.
+    
+    Args:
+        df (pandas.DataFrame): Processed chunk
+    
+    Returns:
+        list: Dictionaries, one per row
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_datetime64_any_dtype(column) and getattr(column.dt, 'tz', None) is None:
+            columns[name] = _isoformat(column.to_numpy())
+        else:
+            values = column.to_numpy(dtype=object)
+            values[pd.isna(column).to_numpy()] = None
+            columns[name] = values
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def _write(frames, path, file_format, compression, json_lines):
+    """
+    Write processed chunks to a local file as they arrive
+    
+    Returns:
+        int: Number of records written
+    """
+    if file_format == 'parquet':
+        return write_parquet(frames, path)
+    if file_format == 'arrow':
+        return write_arrow(frames, path)
+    
+    records = chain.from_iterable(frame_records(frame) for frame in frames)
+    with open_output(path, compression) as f:
+        if file_format == 'csv':
+            return write_csv(records, f)
+        if json_lines:
+            return write_ndjson(records, f, compact=True)
+        return write_json_array(records, f, compact=True)
+
+
+def reprocess(sources, output, start_date=None, end_date=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              indicators=None, s3_manager=None, processor=None):
+    """
+    Reprocess stored stock data chunk by chunk, writing the output as it goes
+    
+    Sources are read in chunks of chunk_size records and each chunk is
+    cleaned, filtered and given its metrics before the next is read, so peak
+    memory is set by the chunk size rather than the size of the data. Formats
+    and compression follow the file names, e.g. 'quotes.ndjson.gz'.
+    
+    Args:
+        sources (list): Local paths, or S3 object keys when s3_manager is
+            given, read in order
+        output (str): Local path, or S3 object key when s3_manager is given
+        start_date (str, optional): Start date in YYYY-MM-DD format
+        end_date (str, optional): End date in YYYY-MM-DD format
+        chunk_size (int, optional): Records per chunk
+        indicators (ChunkedIndicators, optional): Adds rolling indicators,
+            carried across chunks; sources must then be in time order
+        s3_manager (S3Manager, optional): Where sources and output are stored
+        processor (DataProcessor, optional): Processor to use
+    
+    Returns:
+        int: Number of records written
+    """
+    processor = processor or DataProcessor()
+    file_format, compression = infer_format(output)
+    name = os.path.splitext(output)[0] if compression else output
+    json_lines = os.path.splitext(name)[1].lower() in ('.ndjson', '.jsonl')
+    
+    chunks = chain.from_iterable(
+        read_chunks(source, chunk_size=chunk_size, s3_manager=s3_manager) for source in sources
+    )
+    frames = processor.process_chunks(chunks, start_date, end_date, indicators=indicators)
+    
+    if s3_manager is None:
+        count = _write(frames, output, file_format, compression, json_lines)
+    else:
+        # The output is spooled to local disk and uploaded in parts from there
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, os.path.basename(output))
+            count = _write(frames, path, file_format, compression, json_lines)
+            s3_manager.upload_file(path, output)
+    
+    logger.info(f"Reprocessed {count} records from {len(sources)} sources into {output}")
+    return count
@@ -0,0 +1,229 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+
+from rate_limiter import is_throttle_status
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TRANSIENT_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def is_transient_error(error):
+    """
+    Check whether an error is worth retrying
+    
+    Args:
+        error (Exception): Error raised while scraping
+    
+    Returns:
+        bool: True for connection problems, timeouts and throttling or 5xx responses
+    """
+    if isinstance(error, TRANSIENT_EXCEPTIONS):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return is_throttle_status(error.response.status_code)
+    return False
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and full jitter
+    """
+    
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=10.0,
+                 sleep=time.sleep, random_fn=random.random):
+        """
+        Initialize the retry policy
+        
+        Args:
+            max_attempts (int, optional): Total attempts including the first one
+            base_delay (float, optional): Backoff ceiling for the first retry in seconds
+            max_delay (float, optional): Largest backoff ceiling in seconds
+            sleep (callable, optional): Sleep function
+            random_fn (callable, optional): Returns a float in [0, 1) for jitter
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._random = random_fn
+    
+    def backoff(self, retry_number):
+        """
+        Get the delay before a retry
+        
+        Args:
+            retry_number (int): 1 for the first retry, 2 for the second, ...
+        
+        Returns:
+            float: Seconds to wait, drawn uniformly below the exponential ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        return ceiling * self._random()
+    
+    def call(self, func, *args, on_retry=None, **kwargs):
+        """
+        Call a function, retrying it while it raises transient errors
+        
+        Args:
+            func (callable): Function to call
+            *args: Positional arguments for func
+            on_retry (callable, optional): Called with (retry_number, error)
+                before each retry
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            The return value of func
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.max_attempts or not is_transient_error(e):
+                    raise
+                if on_retry:
+                    on_retry(attempt, e)
+                delay = self.backoff(attempt)
+                logger.warning(f"Transient error on attempt {attempt}/{self.max_attempts}, retrying in {delay:.2f}s: {e}")
+                self._sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Skips keys that keep failing until a cool-down has passed
+    
+    After failure_threshold consecutive failures a key is opened and calls
+    for it are refused. Once the cool-down expires a single trial call is
+    let through; success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold=3, cooldown=900, clock=time.monotonic):
+        """
+        Initialize the circuit breaker
+        
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open a circuit
+            cooldown (float, optional): Seconds a circuit stays open
+            clock (callable, optional): Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+        self._trials = set()
+    
+    def allow(self, key):
+        """
+        Check whether a call for a key may proceed
+        
+        Args:
+            key (str): Key such as a stock symbol
+        
+        Returns:
+            bool: False while the circuit for the key is open
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            if opened_at is None:
+                return True
+            if self._clock() - opened_at < self.cooldown or key in self._trials:
+                return False
+            self._trials.add(key)
+            return True
+    
+    def record_success(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+            self._trials.discard(key)
+    
+    def record_failure(self, key):
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            self._trials.discard(key)
+            if failures >= self.failure_threshold:
+                if key not in self._opened_at:
+                    logger.warning(f"Opening circuit for {key} after {failures} consecutive failures")
+                self._opened_at[key] = self._clock()
+    
+    def state(self, key):
+        """
+        Get the circuit state for a key
+        
+        Args:
+            key (str): Key such as a stock symbol
+        
+        Returns:
+            str: 'closed', 'open' or 'half-open'
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            if opened_at is None:
+                return 'closed'
+            if self._clock() - opened_at < self.cooldown:
+                return 'open'
+            return 'half-open'
+    
+    def open_keys(self):
+        """
+        Get the keys whose circuits are currently open
+        
+        Returns:
+            list: Sorted keys
+        """
+        with self._lock:
+            now = self._clock()
+            return sorted(key for key, opened_at in self._opened_at.items() if now - opened_at < self.cooldown)
+
+
+class BatchSummary:
+    """
+    Records which symbols of a batch were retried, skipped or failed
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.succeeded = []
+        self.retried = []
+        self.skipped = []
+        self.failed = []
+    
+    def record(self, outcome, symbol):
+        """
+        Record an outcome for a symbol
+        
+        Args:
+            outcome (str): 'succeeded', 'retried', 'skipped' or 'failed'
+            symbol (str): Stock symbol
+        """
+        with self._lock:
+            symbols = getattr(self, outcome)
+            if symbol not in symbols:
+                symbols.append(symbol)
+    
+    def to_dict(self):
+        with self._lock:
+            return {
+                'succeeded': len(self.succeeded),
+                'retried': list(self.retried),
+                'skipped': list(self.skipped),
+                'failed': list(self.failed),
+            }
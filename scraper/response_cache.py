@@ -0,0 +1,205 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('/tmp', 'stock-scraper-cache')
+
+class ResponseCache:
+    """
+    A size-bounded on-disk cache of fetched page bodies
+    
+    Entries expire after a TTL, but are kept until evicted so that a stale
+    entry can still be revalidated with its ETag or Last-Modified validators.
+    The least recently used entries are evicted once the cache grows past
+    max_bytes.
+    """
+    
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=300, max_bytes=50 * 1024 * 1024):
+        """
+        Initialize the cache, indexing any entries already on disk
+        
+        Args:
+            cache_dir (str, optional): Directory holding the cache files
+            ttl (float, optional): Seconds an entry is served without revalidation
+            max_bytes (int, optional): Maximum total size of the cache files
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        
+        self._lock = threading.Lock()
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+    
+    def _load_index(self):
+        """
+        Rebuild the LRU index from the files in the cache directory
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+    
+    def _key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, url):
+        """
+        Look up the cached entry for a URL
+        
+        A fresh entry counts as a hit; a stale or missing entry counts as a miss.
+        
+        Args:
+            url (str): URL the page was fetched from
+        
+        Returns:
+            dict: Entry with 'body', 'etag', 'last_modified', 'stored_at' and
+                'fresh' keys, or None if nothing is cached
+        """
+        key = self._key(url)
+        
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+                self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._index.move_to_end(key)
+            os.utime(self._path(key))
+            
+            entry['fresh'] = time.time() - entry['stored_at'] < self.ttl
+            if entry['fresh']:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+    
+    def put(self, url, body, etag=None, last_modified=None):
+        """
+        Store a page body, evicting old entries if the cache is over size
+        
+        Args:
+            url (str): URL the page was fetched from
+            body (str): Page content
+            etag (str, optional): ETag response header
+            last_modified (str, optional): Last-Modified response header
+        """
+        key = self._key(url)
+        entry = {
+            'url': url,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+        }
+        
+        with self._lock:
+            self._write(key, entry)
+            self._evict()
+    
+    def mark_revalidated(self, url, entry):
+        """
+        Restart the TTL of an entry after upstream answered 304 Not Modified
+        
+        Args:
+            url (str): URL the page was fetched from
+            entry (dict): Entry previously returned by get()
+        """
+        key = self._key(url)
+        entry = {k: v for k, v in entry.items() if k != 'fresh'}
+        entry['stored_at'] = time.time()
+        
+        with self._lock:
+            self.revalidations += 1
+            self._write(key, entry)
+    
+    def _write(self, key, entry):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        
+        size = os.path.getsize(path)
+        self._total_bytes += size - self._index.pop(key, 0)
+        self._index[key] = size
+    
+    def _remove(self, key):
+        self._total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+    
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key = next(iter(self._index))
+            self._remove(key)
+            self.evictions += 1
+    
+    def clear(self):
+        """
+        Remove every entry from the cache
+        """
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+    
+    def stats(self):
+        """
+        Get cache counters for tuning TTL and size
+        
+        Returns:
+            dict: Hit, miss, revalidation and eviction counts plus current size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._index),
+                'bytes': self._total_bytes,
+            }
@@ -1,9 +1,12 @@
 import boto3
+import io
 import logging
 import json
 import os
 from botocore.exceptions import ClientError
 
+from writers import DEFAULT_ROW_GROUP_SIZE, write_arrow, write_parquet
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -82,14 +85,15 @@ class S3Manager:
             logger.error(f"Error uploading file to S3: {e}")
             raise
     
-    def upload_data(self, data, object_key, file_format='json'):
+    def upload_data(self, data, object_key, file_format='json', row_group_size=DEFAULT_ROW_GROUP_SIZE):
         """
         Upload data directly to S3
         
         Args:
             data: Data to upload (dict, list, DataFrame, etc.)
             object_key (str): S3 object key
-            file_format (str): Format of the data ('json' or 'csv')
+            file_format (str): Format of the data ('json', 'csv', 'parquet' or 'arrow')
+            row_group_size (int, optional): Rows per Parquet row group or Arrow record batch
             
         Returns:
             str: S3 URI of the uploaded data
@@ -122,6 +126,22 @@ class S3Manager:
                     ContentType='text/csv'
                 )
             
+            elif file_format.lower() in ('parquet', 'arrow'):
+                buffer = io.BytesIO()
+                if file_format.lower() == 'parquet':
+                    write_parquet(data, buffer, row_group_size=row_group_size)
+                    content_type = 'application/vnd.apache.parquet'
+                else:
+                    write_arrow(data, buffer, row_group_size=row_group_size)
+                    content_type = 'application/vnd.apache.arrow.file'
+                
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    Body=buffer.getvalue(),
+                    ContentType=content_type
+                )
+            
             else:
                 logger.error(f"Unsupported file format: {file_format}")
                 raise ValueError(f"Unsupported file format: {file_format}")
@@ -133,6 +153,55 @@ class S3Manager:
             logger.error(f"Error uploading data to S3: {e}")
             raise
     
+    def download_data(self, object_key):
+        """
+        Download the content of an S3 object directly
+        
+        Args:
+            object_key (str): S3 object key
+            
+        Returns:
+            bytes: Object content, or None if the object does not exist
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=object_key
+            )
+            content = response['Body'].read()
+            logger.info(f"Downloaded data from s3://{self.bucket_name}/{object_key}")
+            return content
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                logger.info(f"Object s3://{self.bucket_name}/{object_key} does not exist")
+                return None
+            logger.error(f"Error downloading data from S3: {e}")
+            raise
+    
+    def open_object(self, object_key):
+        """
+        Open an S3 object for streaming reads
+        
+        Args:
+            object_key (str): S3 object key
+            
+        Returns:
+            file: Binary stream of the object content, or None if the object does not exist
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=object_key
+            )
+            logger.info(f"Opened s3://{self.bucket_name}/{object_key} for streaming")
+            return response['Body']
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                logger.info(f"Object s3://{self.bucket_name}/{object_key} does not exist")
+                return None
+            logger.error(f"Error opening S3 object: {e}")
+            raise
+    
     def generate_presigned_url(self, object_key, expiration=3600):
         """
         Generate a presigned URL for an S3 object
@@ -205,6 +274,32 @@ class S3Manager:
             logger.error(f"Error listing objects in S3: {e}")
             raise
     
+    def list_partition(self, prefix):
+        """
+        List the sub-prefixes and objects directly under a prefix
+        
+        Uses '/' as delimiter and follows pagination, so a prefix like
+        'dataset/symbol=nike/' yields its 'date=...' partitions without
+        listing the objects inside them.
+        
+        Args:
+            prefix (str): Prefix ending in '/'
+            
+        Returns:
+            tuple: (list of sub-prefixes, list of object keys)
+        """
+        prefixes = []
+        keys = []
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix, Delimiter='/'):
+                prefixes.extend(item['Prefix'] for item in page.get('CommonPrefixes', []))
+                keys.extend(obj['Key'] for obj in page.get('Contents', []))
+            return prefixes, keys
+        except ClientError as e:
+            logger.error(f"Error listing partition in S3: {e}")
+            raise
+    
     def delete_object(self, object_key):
         """
         Delete an object from S3
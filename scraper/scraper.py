@@ -1,10 +1,22 @@
+import asyncio
 import requests
 from bs4 import BeautifulSoup
-import csv
-import json
 import logging
-from urllib.parse import urlencode
-from datetime import datetime
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlencode, urlsplit
+from datetime import date, datetime, timedelta
+from functools import partial
+from itertools import islice
+
+from html_extractor import PRICE_CLASS, TITLE_CLASS, extract_quote_fast, extract_table
+from rate_limiter import get_rate_limiter, is_throttle_status, parse_retry_after
+from resilience import BatchSummary
+from quotes import QuoteBatch
+from single_flight import SingleFlight
+from writers import DEFAULT_ROW_GROUP_SIZE, WRITE_BATCH_SIZE, open_output, peek, write_arrow, write_csv, write_json_array, write_ndjson, write_parquet
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,45 +24,438 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONCURRENCY = 10
+DEFAULT_POOL_SIZE = int(os.environ.get('SCRAPER_POOL_SIZE', '10'))
+SCRAPER_API_URL = 'http://api.scraperapi.com/'
+
+# Parser processes for scrape_multiple_stocks_pipelined; 0 parses in the
+# calling process, unset uses one per CPU
+DEFAULT_PARSE_WORKERS = int(os.environ['SCRAPER_PARSE_WORKERS']) if os.environ.get('SCRAPER_PARSE_WORKERS') else None
+DEFAULT_PARSE_BATCH_SIZE = int(os.environ.get('SCRAPER_PARSE_BATCH_SIZE', '25'))
+
+HISTORY_SHARD_DAYS = 90
+HISTORY_DEFAULT_DAYS = 30
+HISTORY_DATE_FORMATS = ('%b %d, %Y', '%m/%d/%Y', '%Y-%m-%d')
+HISTORY_COLUMNS = {
+    'date': 'Date',
+    'close': 'Price',
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'volume': 'Vol.',
+    'change_percent': 'Change %',
+}
+
+# Listing pages (index components, screeners, country stock lists) that carry
+# quotes for many symbols in one table
+DEFAULT_LISTING_URLS = [url.strip() for url in os.environ.get('SCRAPER_LISTING_URLS', '').split(',') if url.strip()]
+LISTING_COLUMNS = {
+    'company_name': 'Name',
+    'current_price': 'Last',
+    'price_change': 'Chg.',
+}
+LISTING_MISSING_VALUES = ('', '-', 'N/A')
+
+# Sessions live at module scope so that warm Lambda invocations keep their
+# keep-alive connections between lambda_handler calls
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(url, pool_size=DEFAULT_POOL_SIZE):
+    """
+    Get the shared pooled session for the host of a URL
+    
+    Args:
+        url (str): Any URL on the upstream host
+        pool_size (int, optional): Maximum number of pooled connections to the host
+        
+    Returns:
+        requests.Session: Session shared by every scraper talking to that host
+    """
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc, pool_size)
+    
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount(f"{parts.scheme}://", adapter)
+            _sessions[key] = session
+            logger.info(f"Opened connection pool for {parts.netloc} (size {pool_size})")
+        return session
+
+
+def close_sessions():
+    """
+    Close all shared sessions and drop their pooled connections
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def extract_quote_with_soup(html_content):
+    """
+    Extract the company name, price and change from a full BeautifulSoup parse
+    
+    Args:
+        html_content (str): HTML content of an instrument page
+        
+    Returns:
+        tuple: (company_name, current_price, price_change)
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+    
+    company_name = soup.find('h1', {'class': TITLE_CLASS}).text.strip()
+    price_div = soup.find('div', {'class': PRICE_CLASS})
+    
+    if price_div:
+        spans = price_div.find_all('span')
+        current_price = spans[0].text.strip() if len(spans) > 0 else "N/A"
+        price_change = spans[2].text.strip() if len(spans) > 2 else "N/A"
+    else:
+        current_price = "N/A"
+        price_change = "N/A"
+    
+    return company_name, current_price, price_change
+
+
+def extract_quote(html_content):
+    """
+    Extract the company name, price and change from an instrument page
+    
+    Tries the targeted streaming extractor first and falls back to a full
+    BeautifulSoup parse if it cannot find the instrument title.
+    
+    Args:
+        html_content (str): HTML content of an instrument page
+        
+    Returns:
+        tuple: (company_name, current_price, price_change)
+    """
+    try:
+        quote = extract_quote_fast(html_content)
+    except Exception as e:
+        logger.warning(f"Fast quote extraction failed, falling back to BeautifulSoup: {e}")
+        quote = None
+    
+    if quote is None:
+        quote = extract_quote_with_soup(html_content)
+    
+    return quote
+
+
+def split_date_range(start, end, shard_days=HISTORY_SHARD_DAYS):
+    """
+    Split an inclusive date range into consecutive shards
+    
+    Args:
+        start (date): First day of the range
+        end (date): Last day of the range
+        shard_days (int, optional): Maximum number of days per shard
+        
+    Returns:
+        list: (shard_start, shard_end) tuples covering the range in order
+    """
+    if shard_days < 1:
+        raise ValueError(f"shard_days must be at least 1, got {shard_days}")
+    
+    shards = []
+    shard_start = start
+    while shard_start <= end:
+        shard_end = min(shard_start + timedelta(days=shard_days - 1), end)
+        shards.append((shard_start, shard_end))
+        shard_start = shard_end + timedelta(days=1)
+    return shards
+
+
+def _parse_history_date(cell):
+    if cell['datetime']:
+        return date.fromisoformat(cell['datetime'][:10])
+    
+    for date_format in HISTORY_DATE_FORMATS:
+        try:
+            return datetime.strptime(cell['text'], date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized history date: {cell['text']}")
+
+
+def parse_history_page(html_content, stock_symbol):
+    """
+    Parse the daily rows of a historical data page
+    
+    Args:
+        html_content (str): HTML content of a historical data page
+        stock_symbol (str): Stock symbol the page belongs to
+        
+    Returns:
+        list: Dictionaries with date, open, high, low, close, volume and change_percent
+    """
+    headers, rows = extract_table(html_content, HISTORY_COLUMNS.values())
+    if headers is None:
+        raise ValueError(f"No historical data table found for {stock_symbol}")
+    
+    positions = {field: headers.index(header) for field, header in HISTORY_COLUMNS.items()}
+    
+    history = []
+    for row in rows:
+        if len(row) < len(headers):
+            continue
+        
+        day = _parse_history_date(row[positions['date']])
+        record = {'symbol': stock_symbol, 'date': day.isoformat()}
+        for field in ('open', 'high', 'low', 'close', 'volume', 'change_percent'):
+            record[field] = row[positions[field]]['text']
+        record['timestamp'] = day.isoformat()
+        history.append(record)
+    
+    return history
+
+def parse_listing_page(html_content, path_prefix='/equities/', timestamp=None):
+    """
+    Parse the quote rows of a listing page
+    
+    A row's symbol is the URL suffix of the instrument link in its Name
+    cell, the same suffix scrape_stock_data takes. Rows without a link under
+    path_prefix or without a last price are left out.
+    
+    Args:
+        html_content (str): HTML content of a listing page
+        path_prefix (str, optional): URL path instrument links start with
+        timestamp (str, optional): ISO timestamp for the records, defaults to now
+        
+    Returns:
+        dict: Stock data records in the scrape_stock_data shape, keyed by symbol
+    """
+    headers, rows = extract_table(html_content, LISTING_COLUMNS.values())
+    if headers is None:
+        raise ValueError("No quote table found on listing page")
+    
+    positions = {field: headers.index(header) for field, header in LISTING_COLUMNS.items()}
+    timestamp = timestamp or datetime.now().isoformat()
+    
+    quotes = {}
+    for row in rows:
+        if len(row) < len(headers):
+            continue
+        
+        path = urlsplit(row[positions['company_name']]['href'] or '').path
+        if not path.startswith(path_prefix):
+            continue
+        symbol = path[len(path_prefix):].strip('/')
+        
+        current_price = row[positions['current_price']]['text']
+        if not symbol or current_price in LISTING_MISSING_VALUES:
+            continue
+        
+        price_change = row[positions['price_change']]['text']
+        quotes[symbol] = {
+            'symbol': symbol,
+            'company_name': row[positions['company_name']]['text'],
+            'current_price': current_price,
+            'price_change': 'N/A' if price_change in LISTING_MISSING_VALUES else price_change,
+            'timestamp': timestamp,
+        }
+    
+    return quotes
+
+def parse_quote_page(html_content, stock_symbol, timestamp=None):
+    """
+    Parse a quote page into a stock data record
+    
+    Args:
+        html_content (str): HTML content of an instrument page
+        stock_symbol (str): Stock symbol the page belongs to
+        timestamp (str, optional): ISO timestamp for the record, defaults to now
+        
+    Returns:
+        dict: Stock data record
+    """
+    company_name, current_price, price_change = extract_quote(html_content)
+    return {
+        'symbol': stock_symbol,
+        'company_name': company_name,
+        'current_price': current_price,
+        'price_change': price_change,
+        'timestamp': timestamp or datetime.now().isoformat(),
+    }
+
+def parse_quote_batch(pages):
+    """
+    Parse a batch of fetched quote pages
+    
+    Runs inside parser worker processes, so it lives at module scope to be
+    picklable and reports parse errors as values instead of raising.
+    
+    Args:
+        pages (list): (stock_symbol, html_content, fetched_at) tuples
+        
+    Returns:
+        list: (stock_symbol, record, error) tuples where exactly one of record
+            and error is None
+    """
+    results = []
+    for stock_symbol, html_content, fetched_at in pages:
+        try:
+            results.append((stock_symbol, parse_quote_page(html_content, stock_symbol, fetched_at), None))
+        except Exception as e:
+            results.append((stock_symbol, None, str(e)))
+    return results
+
+def _start_parse_pool(parse_workers):
+    """
+    Start the parser process pool, or return None to parse in-process
+    
+    Args:
+        parse_workers (int): Number of parser processes, 0 for none
+        
+    Returns:
+        ProcessPoolExecutor: Parser pool, or None
+    """
+    if parse_workers == 0:
+        return None
+    try:
+        return ProcessPoolExecutor(max_workers=parse_workers)
+    except (OSError, NotImplementedError) as e:
+        # AWS Lambda has no /dev/shm, so multiprocessing primitives are unavailable
+        logger.warning(f"Could not start parser processes, parsing in-process: {e}")
+        return None
+
 class StockScraper:
     """
     A class to scrape historical stock data from investing.com
     """
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, pool_size=DEFAULT_POOL_SIZE, cache=None, rate_limit=False,
+                 retry_policy=None, circuit_breaker=None, single_flight=None):
         """
         Initialize the scraper with optional ScraperAPI key
         
         Args:
             api_key (str, optional): ScraperAPI key for handling anti-scraping measures
+            pool_size (int, optional): Connections kept open per upstream host
+            cache (ResponseCache, optional): Cache for fetched page bodies
+            rate_limit (bool, optional): Pace requests with the shared per-host
+                AdaptiveRateLimiter
+            retry_policy (RetryPolicy, optional): Retries transient failures per symbol
+            circuit_breaker (CircuitBreaker, optional): Skips symbols that keep failing
+            single_flight (SingleFlight, optional): Shares fetches and parsed results
+                between duplicate requests for the same URL; defaults to a
+                SingleFlight private to this scraper that only coalesces
+                concurrent requests, so repeated polls always fetch afresh
         """
         self.api_key = api_key
+        self.pool_size = pool_size
+        # Pool size requested from get_session, raised by batches with more workers
+        self._connections = pool_size
+        self.cache = cache
+        self.rate_limit = rate_limit
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = single_flight if single_flight is not None else SingleFlight(ttl=0)
+        self.batch_summary = BatchSummary()
         self.base_url = 'https://www.investing.com/equities/'
+        self.history_url_template = '{base_url}{symbol}-historical-data?st_date={start}&end_date={end}'
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
     
+    def _send(self, request_url, **kwargs):
+        """
+        Send a GET request through the pooled session for its host
+        
+        With rate limiting enabled the request first waits on the host's
+        shared limiter, and the outcome is fed back so the limiter can adapt.
+        
+        Args:
+            request_url (str): URL to request
+            **kwargs: Extra arguments for requests.Session.get
+            
+        Returns:
+            requests.Response: Response from the upstream
+        """
+        session = get_session(request_url, self._connections)
+        if not self.rate_limit:
+            return session.get(request_url, **kwargs)
+        
+        limiter = get_rate_limiter(urlsplit(request_url).netloc)
+        limiter.acquire()
+        
+        try:
+            response = session.get(request_url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            limiter.record_throttle()
+            raise
+        
+        if is_throttle_status(response.status_code):
+            limiter.record_throttle(parse_retry_after(response.headers.get('Retry-After')))
+        else:
+            limiter.record_success()
+        return response
+    
+    def _size_pool(self, workers):
+        """
+        Keep a pooled connection for every worker of a batch
+        
+        Connections beyond the pool size are closed after each request, so
+        a batch with more workers than pool_size fetches through a larger
+        pool for its host rather than losing keep-alive.
+        
+        Args:
+            workers (int): Number of requests the batch keeps in flight
+        """
+        self._connections = max(self.pool_size, workers)
+    
     def _get_page_content(self, url):
         """
         Get the page content using either direct requests or ScraperAPI
         
+        When a cache is configured, fresh entries are served without a request
+        and stale ones are revalidated with their ETag/Last-Modified validators.
+        
         Args:
             url (str): URL to scrape
             
         Returns:
             str: HTML content of the page
         """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached['fresh']:
+            return cached['body']
+        
         try:
             if self.api_key:
                 params = {
                     'api_key': self.api_key,
                     'url': url
                 }
-                response = requests.get('http://api.scraperapi.com/', params=urlencode(params))
+                response = self._send(SCRAPER_API_URL, params=urlencode(params))
             else:
-                response = requests.get(url, headers=self.headers)
+                headers = dict(self.headers)
+                if cached and cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached and cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+                
+                response = self._send(url, headers=headers)
+            
+            if cached and response.status_code == 304:
+                self.cache.mark_revalidated(url, cached)
+                return cached['body']
             
             response.raise_for_status()
+            
+            if self.cache:
+                self.cache.put(
+                    url,
+                    response.text,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
             return response.text
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching URL {url}: {e}")
@@ -66,111 +471,643 @@ class StockScraper:
             end_date (str, optional): End date in YYYY-MM-DD format
             
         Returns:
-            list: List of dictionaries containing stock data
+            list: List of dictionaries containing stock data. Without dates this
+                is a single current quote; with either date it is the daily
+                history from scrape_historical_data
         """
+        if start_date or end_date:
+            return self.scrape_historical_data(stock_symbol, start_date, end_date)
+        
         url = f"{self.base_url}{stock_symbol}"
+        records = self.single_flight.do(url, self._scrape_quote, url, stock_symbol)
+        return [dict(record) for record in records]
+    
+    def _scrape_quote(self, url, stock_symbol):
+        """
+        Fetch and parse the current quote page for a symbol
+        
+        Args:
+            url (str): Quote page URL
+            stock_symbol (str): Stock symbol or URL suffix on investing.com
+            
+        Returns:
+            list: A single current quote record
+        """
         logger.info(f"Scraping stock data from: {url}")
         
         html_content = self._get_page_content(url)
-        soup = BeautifulSoup(html_content, 'html.parser')
         
         try:
-            company_name = soup.find('h1', {'class': 'text-2xl font-semibold instrument-header_title__GTWDv mobile:mb-2'}).text.strip()
-            price_div = soup.find('div', {'class': 'instrument-price_instrument-price__3uw25 flex items-end flex-wrap font-bold'})
-            
-            if price_div:
-                spans = price_div.find_all('span')
-                current_price = spans[0].text.strip() if len(spans) > 0 else "N/A"
-                price_change = spans[2].text.strip() if len(spans) > 2 else "N/A"
-            else:
-                current_price = "N/A"
-                price_change = "N/A"
-            
+            stock_data = parse_quote_page(html_content, stock_symbol)
             
-            stock_data = {
-                'symbol': stock_symbol,
-                'company_name': company_name,
-                'current_price': current_price,
-                'price_change': price_change,
-                'timestamp': datetime.now().isoformat(),
-            }
-            
-            logger.info(f"Successfully scraped data for {company_name}")
+            logger.info(f"Successfully scraped data for {stock_data['company_name']}")
             return [stock_data]
             
         except Exception as e:
             logger.error(f"Error parsing stock data: {e}")
             raise
     
-    def scrape_multiple_stocks(self, stock_symbols):
+    def _scrape_history_shard(self, stock_symbol, shard_start, shard_end):
+        """
+        Fetch one shard of daily history, keeping only rows inside the shard
+        
+        Args:
+            stock_symbol (str): Stock symbol or URL suffix on investing.com
+            shard_start (date): First day of the shard
+            shard_end (date): Last day of the shard
+            
+        Returns:
+            list: Daily history records within the shard
+        """
+        url = self.history_url_template.format(
+            base_url=self.base_url,
+            symbol=stock_symbol,
+            start=shard_start.isoformat(),
+            end=shard_end.isoformat()
+        )
+        rows = self.single_flight.do(url, self._fetch_history_shard, url, stock_symbol, shard_start, shard_end)
+        return [dict(row) for row in rows]
+    
+    def _fetch_history_shard(self, url, stock_symbol, shard_start, shard_end):
+        logger.info(f"Scraping history shard {shard_start} to {shard_end} from: {url}")
+        
+        html_content = self._get_page_content(url)
+        first, last = shard_start.isoformat(), shard_end.isoformat()
+        return [row for row in parse_history_page(html_content, stock_symbol) if first <= row['date'] <= last]
+    
+    def scrape_historical_data(self, stock_symbol, start_date=None, end_date=None,
+                               shard_days=HISTORY_SHARD_DAYS, max_workers=None):
+        """
+        Scrape daily OHLCV history for a symbol over a date range
+        
+        The range is split into shards of at most shard_days which are fetched
+        in parallel, then merged into one series ordered by date with
+        duplicate days removed.
+        
+        Args:
+            stock_symbol (str): Stock symbol or URL suffix on investing.com
+            start_date (str, optional): Start date in YYYY-MM-DD format, defaults
+                to HISTORY_DEFAULT_DAYS before end_date
+            end_date (str, optional): End date in YYYY-MM-DD format, defaults to today
+            shard_days (int, optional): Maximum number of days fetched per request
+            max_workers (int, optional): Number of shards fetched at once
+            
+        Returns:
+            list: List of dictionaries containing daily stock data
+        """
+        end = date.fromisoformat(end_date) if end_date else date.today()
+        start = date.fromisoformat(start_date) if start_date else end - timedelta(days=HISTORY_DEFAULT_DAYS)
+        if start > end:
+            raise ValueError(f"start_date {start} is after end_date {end}")
+        
+        shards = split_date_range(start, end, shard_days)
+        workers = min(len(shards), max_workers or self.pool_size)
+        self._size_pool(workers)
+        
+        merged = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._scrape_history_shard, stock_symbol, shard_start, shard_end)
+                for shard_start, shard_end in shards
+            ]
+            for future in futures:
+                for row in future.result():
+                    merged[row['date']] = row
+        
+        history = [merged[day] for day in sorted(merged)]
+        logger.info(f"Scraped {len(history)} days of history for {stock_symbol} in {len(shards)} shards")
+        return history
+    
+    def _scrape_symbol_safe(self, symbol, start_date=None, end_date=None, fetch=None):
+        """
+        Scrape a single symbol, logging and swallowing any error
+        
+        Transient errors are retried under the retry policy, symbols with an
+        open circuit are skipped, and every outcome is recorded in
+        batch_summary.
+        
+        Args:
+            symbol (str): Stock symbol or URL suffix
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            fetch (callable, optional): Called with the symbol and any dates
+                to get its data, defaults to scrape_stock_data
+            
+        Returns:
+            list: Stock data for the symbol, or an empty list if it failed
+        """
+        if self.circuit_breaker and not self.circuit_breaker.allow(symbol):
+            logger.warning(f"Skipping {symbol}, circuit is open after repeated failures")
+            self.batch_summary.record('skipped', symbol)
+            return []
+        
+        args = (symbol, start_date, end_date) if start_date or end_date else (symbol,)
+        fetch = fetch or self.scrape_stock_data
+        
+        try:
+            if self.retry_policy:
+                def on_retry(attempt, error):
+                    self.batch_summary.record('retried', symbol)
+                
+                stock_data = self.retry_policy.call(fetch, *args, on_retry=on_retry)
+            else:
+                stock_data = fetch(*args)
+        except Exception as e:
+            logger.error(f"Failed to scrape data for {symbol}: {e}")
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure(symbol)
+            self.batch_summary.record('failed', symbol)
+            return []
+        
+        if self.circuit_breaker:
+            self.circuit_breaker.record_success(symbol)
+        self.batch_summary.record('succeeded', symbol)
+        return stock_data
+    
+    def scrape_multiple_stocks(self, stock_symbols, concurrency=1, start_date=None, end_date=None):
         """
         Scrape data for multiple stock symbols
         
         Args:
             stock_symbols (list): List of stock symbols or URL suffixes
+            concurrency (int, optional): Maximum number of symbols fetched at once.
+                Values above 1 run the batch through scrape_multiple_stocks_async,
+                or scrape_multiple_stocks_threaded when called from inside a
+                running event loop
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
             
         Returns:
             list: List of dictionaries containing stock data for all symbols
         """
+        self.batch_summary = BatchSummary()
+        
+        if concurrency and concurrency > 1:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.scrape_multiple_stocks_async(
+                    stock_symbols, concurrency=concurrency, start_date=start_date, end_date=end_date
+                ))
+            # asyncio.run cannot nest inside a running loop, such as an async
+            # Lambda adapter or a notebook
+            logger.info("Event loop already running, scraping on a thread pool instead")
+            return self.scrape_multiple_stocks_threaded(
+                stock_symbols, max_workers=concurrency, start_date=start_date, end_date=end_date
+            )
+        
         all_stock_data = []
         
         for symbol in stock_symbols:
-            try:
-                stock_data = self.scrape_stock_data(symbol)
+            all_stock_data.extend(self._scrape_symbol_safe(symbol, start_date, end_date))
+        
+        return all_stock_data
+    
+    async def scrape_multiple_stocks_async(self, stock_symbols, concurrency=DEFAULT_CONCURRENCY,
+                                           start_date=None, end_date=None):
+        """
+        Scrape data for multiple stock symbols concurrently
+        
+        Each symbol is fetched on a worker thread, with at most `concurrency`
+        requests in flight. A failing symbol is logged and skipped without
+        affecting the others, and results keep the order of `stock_symbols`.
+        
+        Args:
+            stock_symbols (list): List of stock symbols or URL suffixes
+            concurrency (int, optional): Maximum number of in-flight requests
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            
+        Returns:
+            list: List of dictionaries containing stock data for all symbols
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        
+        self.batch_summary = BatchSummary()
+        self._size_pool(concurrency)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        scrape_symbol = partial(self._scrape_symbol_safe, start_date=start_date, end_date=end_date)
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            async def scrape_one(symbol):
+                async with semaphore:
+                    return await loop.run_in_executor(executor, scrape_symbol, symbol)
+            
+            results = await asyncio.gather(*(scrape_one(symbol) for symbol in stock_symbols))
+        
+        all_stock_data = []
+        for stock_data in results:
+            all_stock_data.extend(stock_data)
+        
+        return all_stock_data
+    
+    def scrape_multiple_stocks_threaded(self, stock_symbols, max_workers=None, start_date=None, end_date=None):
+        """
+        Scrape data for multiple stock symbols on a thread pool
+        
+        Worker threads share the module-level connection pools, so the pool
+        size is used as the default number of workers.
+        
+        Args:
+            stock_symbols (list): List of stock symbols or URL suffixes
+            max_workers (int, optional): Number of worker threads
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            
+        Returns:
+            list: List of dictionaries containing stock data for all symbols
+        """
+        self.batch_summary = BatchSummary()
+        max_workers = max_workers or self.pool_size
+        self._size_pool(max_workers)
+        all_stock_data = []
+        scrape_symbol = partial(self._scrape_symbol_safe, start_date=start_date, end_date=end_date)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for stock_data in executor.map(scrape_symbol, stock_symbols):
                 all_stock_data.extend(stock_data)
+        
+        return all_stock_data
+    
+    def _scrape_listing(self, url):
+        logger.info(f"Scraping listing page: {url}")
+        
+        if self.retry_policy:
+            html_content = self.retry_policy.call(self._get_page_content, url)
+        else:
+            html_content = self._get_page_content(url)
+        
+        return parse_listing_page(html_content, urlsplit(self.base_url).path)
+    
+    def scrape_from_listings(self, stock_symbols, listing_urls=None, concurrency=DEFAULT_CONCURRENCY):
+        """
+        Scrape current quotes from multi-instrument listing pages
+        
+        Listing pages are fetched in order until every symbol has been found,
+        so one request can replace dozens of instrument page requests. Only
+        symbols that no listing covered are scraped from their own pages.
+        Listing rows carry the short company name shown in the table, e.g.
+        'Nike' rather than 'Nike Inc (NKE)'.
+        
+        Args:
+            stock_symbols (list): List of stock symbols or URL suffixes
+            listing_urls (list, optional): Listing page URLs, defaults to
+                DEFAULT_LISTING_URLS
+            concurrency (int, optional): Maximum number of in-flight requests
+                for symbols scraped from their own pages
+            
+        Returns:
+            list: List of dictionaries containing stock data for all symbols,
+                in the order of stock_symbols
+        """
+        stock_symbols = list(stock_symbols)
+        listing_urls = DEFAULT_LISTING_URLS if listing_urls is None else listing_urls
+        wanted = set(stock_symbols)
+        listed = {}
+        
+        for url in listing_urls:
+            if wanted.issubset(listed):
+                break
+            try:
+                quotes = self.single_flight.do(url, self._scrape_listing, url)
             except Exception as e:
-                logger.error(f"Failed to scrape data for {symbol}: {e}")
+                logger.error(f"Failed to scrape listing page {url}: {e}")
                 continue
+            for symbol in wanted.intersection(quotes):
+                listed.setdefault(symbol, quotes[symbol])
+        
+        missing = [symbol for symbol in dict.fromkeys(stock_symbols) if symbol not in listed]
+        logger.info(f"Listing pages covered {len(listed)} of {len(wanted)} symbols, scraping {len(missing)} individually")
+        
+        fallback = {}
+        for record in self.scrape_multiple_stocks(missing, concurrency=concurrency):
+            fallback.setdefault(record['symbol'], []).append(record)
+        
+        for symbol in listed:
+            self.batch_summary.record('succeeded', symbol)
+        
+        all_stock_data = []
+        for symbol in stock_symbols:
+            if symbol in listed:
+                all_stock_data.append(dict(listed[symbol]))
+            else:
+                all_stock_data.extend(dict(record) for record in fallback.get(symbol, []))
         
         return all_stock_data
     
-    def save_to_csv(self, stock_data, filename="stock_data.csv"):
+    def _fetch_quote_page_safe(self, symbol):
+        """
+        Fetch the quote page for a symbol without parsing it
+        
+        Applies the circuit breaker and retry policy like _scrape_symbol_safe,
+        but only fetch failures are recorded here; parse outcomes are recorded
+        once the parser stage has run.
+        
+        Args:
+            symbol (str): Stock symbol or URL suffix
+            
+        Returns:
+            tuple: (symbol, html_content, fetched_at), or None if skipped or failed
+        """
+        if self.circuit_breaker and not self.circuit_breaker.allow(symbol):
+            logger.warning(f"Skipping {symbol}, circuit is open after repeated failures")
+            self.batch_summary.record('skipped', symbol)
+            return None
+        
+        url = f"{self.base_url}{symbol}"
+        
+        try:
+            if self.retry_policy:
+                def on_retry(attempt, error):
+                    self.batch_summary.record('retried', symbol)
+                
+                html_content = self.retry_policy.call(self._get_page_content, url, on_retry=on_retry)
+            else:
+                html_content = self._get_page_content(url)
+        except Exception as e:
+            logger.error(f"Failed to fetch data for {symbol}: {e}")
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure(symbol)
+            self.batch_summary.record('failed', symbol)
+            return None
+        
+        return symbol, html_content, datetime.now().isoformat()
+    
+    def _record_parsed(self, parsed, records):
+        for symbol, record, error in parsed:
+            if error is not None:
+                logger.error(f"Error parsing stock data for {symbol}: {error}")
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure(symbol)
+                self.batch_summary.record('failed', symbol)
+                continue
+            
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success(symbol)
+            self.batch_summary.record('succeeded', symbol)
+            records[symbol] = record
+    
+    def scrape_multiple_stocks_pipelined(self, stock_symbols, fetch_workers=DEFAULT_CONCURRENCY,
+                                         parse_workers=DEFAULT_PARSE_WORKERS,
+                                         batch_size=DEFAULT_PARSE_BATCH_SIZE):
+        """
+        Scrape current quotes with fetching and parsing in separate stages
+        
+        Worker threads fetch pages and hand them in batches of `batch_size` to
+        a pool of parser processes, so parsing a large batch can use every
+        core instead of serializing on the GIL. Duplicate symbols are fetched
+        once, and results keep the order of `stock_symbols`. If processes
+        cannot be started the batches are parsed in-process.
+        
+        Args:
+            stock_symbols (list): List of stock symbols or URL suffixes
+            fetch_workers (int, optional): Number of fetcher threads
+            parse_workers (int, optional): Number of parser processes, 0 to parse
+                in-process, defaults to one per CPU
+            batch_size (int, optional): Pages sent to a parser process at once
+            
+        Returns:
+            list: List of dictionaries containing stock data for all symbols
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        
+        self.batch_summary = BatchSummary()
+        self._size_pool(fetch_workers)
+        stock_symbols = list(stock_symbols)
+        records = {}
+        parse_pool = _start_parse_pool(parse_workers)
+        
+        def submit_batch(batch):
+            if parse_pool:
+                return parse_pool.submit(parse_quote_batch, batch)
+            future = Future()
+            future.set_result(parse_quote_batch(batch))
+            return future
+        
+        try:
+            parse_futures = []
+            batch = []
+            with ThreadPoolExecutor(max_workers=fetch_workers) as fetcher:
+                fetches = [fetcher.submit(self._fetch_quote_page_safe, symbol) for symbol in dict.fromkeys(stock_symbols)]
+                for future in as_completed(fetches):
+                    page = future.result()
+                    if page is None:
+                        continue
+                    batch.append(page)
+                    if len(batch) >= batch_size:
+                        parse_futures.append(submit_batch(batch))
+                        batch = []
+            if batch:
+                parse_futures.append(submit_batch(batch))
+            
+            for future in parse_futures:
+                self._record_parsed(future.result(), records)
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
+        
+        return [dict(records[symbol]) for symbol in stock_symbols if symbol in records]
+    
+    def iter_stock_data(self, stock_symbols, concurrency=DEFAULT_CONCURRENCY, start_date=None, end_date=None):
+        """
+        Scrape multiple stock symbols, yielding records as each symbol finishes
+        
+        Records come out in completion order, not input order. At most
+        `concurrency` symbols are in flight and only finished symbols are held,
+        so memory stays flat however long the symbol list is.
+        
+        Args:
+            stock_symbols (iterable): Stock symbols or URL suffixes
+            concurrency (int, optional): Maximum number of in-flight requests
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            
+        Yields:
+            dict: Stock data records
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        
+        self.batch_summary = BatchSummary()
+        self._size_pool(concurrency)
+        scrape_symbol = partial(self._scrape_symbol_safe, start_date=start_date, end_date=end_date)
+        symbols = iter(stock_symbols)
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = set()
+            for symbol in islice(symbols, concurrency):
+                pending.add(executor.submit(scrape_symbol, symbol))
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for symbol in islice(symbols, 1):
+                        pending.add(executor.submit(scrape_symbol, symbol))
+                    yield from future.result()
+    
+    def scrape_quote_batch(self, stock_symbols, concurrency=DEFAULT_CONCURRENCY, batch=None):
+        """
+        Scrape multiple stock symbols into a compact QuoteBatch
+        
+        Records are parsed into the batch WRITE_BATCH_SIZE at a time as they
+        arrive, so the scraped dicts never pile up.
+        
+        Args:
+            stock_symbols (iterable): Stock symbols or URL suffixes
+            concurrency (int, optional): Maximum number of in-flight requests
+            batch (QuoteBatch, optional): Batch to add to, such as one holding
+                the earlier ticks of the day
+            
+        Returns:
+            QuoteBatch: Batch holding the scraped quotes
+        """
+        batch = batch if batch is not None else QuoteBatch()
+        records = self.iter_stock_data(stock_symbols, concurrency=concurrency)
+        while True:
+            chunk = list(islice(records, WRITE_BATCH_SIZE))
+            if not chunk:
+                return batch
+            batch.extend(chunk)
+    
+    def stream_to_csv(self, stock_data, filename="stock_data.csv", compression=None):
+        """
+        Write stock data to a CSV file as records arrive
+        
+        Columns are taken from the first record, as in save_to_csv.
+        
+        Args:
+            stock_data (iterable): Dictionaries containing stock data
+            filename (str): Name of the output CSV file
+            compression (str, optional): None, 'gzip' or 'zstd'
+            
+        Returns:
+            int: Number of records written
+        """
+        try:
+            with open_output(filename, compression) as csvfile:
+                count = write_csv(stock_data, csvfile)
+            
+            logger.info(f"Streamed {count} records to {filename}")
+            return count
+        except Exception as e:
+            logger.error(f"Error streaming to CSV: {e}")
+            raise
+    
+    def stream_to_ndjson(self, stock_data, filename="stock_data.ndjson", compression=None, compact=False):
+        """
+        Write stock data to a newline-delimited JSON file as records arrive
+        
+        Args:
+            stock_data (iterable): Dictionaries containing stock data
+            filename (str): Name of the output NDJSON file
+            compression (str, optional): None, 'gzip' or 'zstd'
+            compact (bool, optional): Serialize without separator whitespace
+            
+        Returns:
+            int: Number of records written
+        """
+        try:
+            with open_output(filename, compression) as jsonfile:
+                count = write_ndjson(stock_data, jsonfile, compact=compact)
+            
+            logger.info(f"Streamed {count} records to {filename}")
+            return count
+        except Exception as e:
+            logger.error(f"Error streaming to NDJSON: {e}")
+            raise
+    
+    def save_to_csv(self, stock_data, filename="stock_data.csv", compression=None):
         """
         Save stock data to a CSV file
         
+        Rows are written as they are read, so stock_data can be any iterable.
+        
         Args:
-            stock_data (list): List of dictionaries containing stock data
+            stock_data (iterable): Dictionaries containing stock data
             filename (str): Name of the output CSV file
+            compression (str, optional): None, 'gzip' or 'zstd'
         """
-        if not stock_data:
+        first, stock_data = peek(stock_data)
+        if first is None:
             logger.warning("No stock data to save")
             return
         
         try:
-            with open(filename, 'w', newline='') as csvfile:
-                fieldnames = stock_data[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for data in stock_data:
-                    writer.writerow(data)
+            with open_output(filename, compression) as csvfile:
+                write_csv(stock_data, csvfile)
                 
             logger.info(f"Stock data saved to {filename}")
         except Exception as e:
             logger.error(f"Error saving to CSV: {e}")
             raise
     
-    def save_to_json(self, stock_data, filename="stock_data.json"):
+    def save_to_json(self, stock_data, filename="stock_data.json", compression=None, compact=False):
         """
         Save stock data to a JSON file
         
+        The array is written one record at a time, so stock_data can be any
+        iterable. The default layout is indented by 4 spaces.
+        
         Args:
-            stock_data (list): List of dictionaries containing stock data
+            stock_data (iterable): Dictionaries containing stock data
             filename (str): Name of the output JSON file
+            compression (str, optional): None, 'gzip' or 'zstd'
+            compact (bool, optional): Write the array without whitespace
         """
-        if not stock_data:
+        first, stock_data = peek(stock_data)
+        if first is None:
             logger.warning("No stock data to save")
             return
         
         try:
-            with open(filename, 'w') as jsonfile:
-                json.dump(stock_data, jsonfile, indent=4)
+            with open_output(filename, compression) as jsonfile:
+                write_json_array(stock_data, jsonfile, compact=compact)
                 
             logger.info(f"Stock data saved to {filename}")
         except Exception as e:
             logger.error(f"Error saving to JSON: {e}")
             raise
-
+    
+    def save_to_parquet(self, stock_data, filename="stock_data.parquet", row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        """
+        Save stock data to a Parquet file
+        
+        Args:
+            stock_data (iterable or pandas.DataFrame): Stock data records
+            filename (str): Name of the output Parquet file
+            row_group_size (int, optional): Maximum rows per row group
+        """
+        try:
+            count = write_parquet(stock_data, filename, row_group_size=row_group_size)
+            if count:
+                logger.info(f"Stock data saved to {filename}")
+            else:
+                logger.warning("No stock data to save")
+        except Exception as e:
+            logger.error(f"Error saving to Parquet: {e}")
+            raise
+    
+    def save_to_arrow(self, stock_data, filename="stock_data.arrow", row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        """
+        Save stock data to an Arrow IPC file
+        
+        Args:
+            stock_data (iterable or pandas.DataFrame): Stock data records
+            filename (str): Name of the output Arrow file
+            row_group_size (int, optional): Maximum rows per record batch
+        """
+        try:
+            count = write_arrow(stock_data, filename, row_group_size=row_group_size)
+            if count:
+                logger.info(f"Stock data saved to {filename}")
+            else:
+                logger.warning("No stock data to save")
+        except Exception as e:
+            logger.error(f"Error saving to Arrow: {e}")
+            raise
 
 if __name__ == "__main__":
     scraper = StockScraper(api_key=None)
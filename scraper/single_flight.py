@@ -0,0 +1,139 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEDUP_TTL = float(os.environ.get('SCRAPER_DEDUP_TTL', '5'))
+
+
+class _Call:
+    """
+    A call in flight whose result is shared by every waiter
+    """
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent and repeated calls for the same key
+    
+    While a call for a key is running, further callers for that key wait for
+    it and receive the same result or exception instead of starting their own.
+    Successful results are also kept for `ttl` seconds, so repeats shortly
+    after, such as a symbol listed twice or an overlapping watchlist on a warm
+    container, are served without calling again. Failures are never kept.
+    """
+    
+    def __init__(self, ttl=DEFAULT_DEDUP_TTL, clock=time.monotonic):
+        """
+        Initialize the single-flight group
+        
+        Args:
+            ttl (float, optional): Seconds a successful result is reused, 0 to
+                only coalesce calls that overlap
+            clock (callable, optional): Monotonic time source
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._results = OrderedDict()
+        
+        self.calls = 0
+        self.coalesced = 0
+        self.reused = 0
+    
+    def _expire(self, now):
+        # Results are stored in completion order with a constant TTL, so the
+        # expired ones are always at the front
+        while self._results:
+            key, (stored_at, _) = next(iter(self._results.items()))
+            if now - stored_at < self.ttl:
+                break
+            del self._results[key]
+    
+    def do(self, key, func, *args, **kwargs):
+        """
+        Call a function once for a key, sharing the outcome with duplicates
+        
+        Args:
+            key (hashable): Key identifying the work, e.g. the URL to fetch
+            func (callable): Function doing the work
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            The return value of func, possibly from an earlier or concurrent call
+        """
+        with self._lock:
+            self._expire(self._clock())
+            if key in self._results:
+                self.reused += 1
+                return self._results[key][1]
+            
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.ttl > 0:
+                    self._results[key] = (self._clock(), call.result)
+            call.done.set()
+        
+        return call.result
+    
+    def forget(self, key):
+        """
+        Drop a kept result so the next call for the key runs again
+        
+        Args:
+            key (hashable): Key to forget
+        """
+        with self._lock:
+            self._results.pop(key, None)
+    
+    def stats(self):
+        """
+        Get call counters
+        
+        Returns:
+            dict: Calls made, calls that joined one in flight, calls served
+                from a kept result and the number of kept results
+        """
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'reused': self.reused,
+                'kept': len(self._results),
+            }
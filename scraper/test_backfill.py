@@ -0,0 +1,131 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from backfill import BackfillManager, LocalStore, find_gaps, merge_intervals
+from resilience import CircuitBreaker
+from scraper import HISTORY_DEFAULT_DAYS, StockScraper
+
+def fake_history(symbol, start_date, end_date):
+    day = date.fromisoformat(start_date)
+    rows = []
+    while day <= date.fromisoformat(end_date):
+        rows.append({'symbol': symbol, 'date': day.isoformat(), 'close': '1.00', 'timestamp': day.isoformat()})
+        day += timedelta(days=1)
+    return rows
+
+class TestIntervals(unittest.TestCase):
+    """
+    Test cases for the coverage interval helpers
+    """
+    
+    def test_merge_intervals(self):
+        intervals = [
+            (date(2025, 1, 10), date(2025, 1, 20)),
+            (date(2025, 1, 1), date(2025, 1, 5)),
+            (date(2025, 1, 6), date(2025, 1, 8)),
+            (date(2025, 1, 15), date(2025, 1, 25)),
+        ]
+        
+        self.assertEqual(merge_intervals(intervals), [
+            (date(2025, 1, 1), date(2025, 1, 8)),
+            (date(2025, 1, 10), date(2025, 1, 25)),
+        ])
+    
+    def test_find_gaps(self):
+        covered = [(date(2025, 1, 5), date(2025, 1, 10)), (date(2025, 1, 20), date(2025, 1, 25))]
+        
+        gaps = find_gaps(covered, date(2025, 1, 1), date(2025, 1, 31))
+        
+        self.assertEqual(gaps, [
+            (date(2025, 1, 1), date(2025, 1, 4)),
+            (date(2025, 1, 11), date(2025, 1, 19)),
+            (date(2025, 1, 26), date(2025, 1, 31)),
+        ])
+    
+    def test_find_gaps_fully_covered(self):
+        covered = [(date(2025, 1, 1), date(2025, 1, 31))]
+        
+        self.assertEqual(find_gaps(covered, date(2025, 1, 5), date(2025, 1, 10)), [])
+
+
+class TestBackfillManager(unittest.TestCase):
+    """
+    Test cases for the BackfillManager class
+    """
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.scraper = MagicMock()
+        self.scraper.scrape_historical_data.side_effect = fake_history
+        self.manager = BackfillManager(self.scraper, LocalStore(self.temp_dir.name))
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_fetches_only_missing_intervals(self):
+        self.manager.backfill('nike', '2025-01-01', '2025-01-31')
+        self.scraper.scrape_historical_data.reset_mock()
+        
+        rows = self.manager.backfill('nike', '2024-12-15', '2025-02-10')
+        
+        self.assertEqual(self.scraper.scrape_historical_data.call_args_list, [
+            (('nike', '2024-12-15', '2024-12-31'),),
+            (('nike', '2025-02-01', '2025-02-10'),),
+        ])
+        self.assertEqual(len(rows), 58)
+        self.assertEqual(rows[0]['date'], '2024-12-15')
+        self.assertEqual(rows[-1]['date'], '2025-02-10')
+    
+    def test_covered_range_reads_from_store(self):
+        self.manager.backfill('nike', '2025-01-01', '2025-01-31')
+        self.scraper.scrape_historical_data.reset_mock()
+        
+        rows = self.manager.backfill('nike', '2025-01-10', '2025-01-12')
+        
+        self.scraper.scrape_historical_data.assert_not_called()
+        self.assertEqual([row['date'] for row in rows], ['2025-01-10', '2025-01-11', '2025-01-12'])
+    
+    def test_today_is_refetched(self):
+        today = date.today()
+        start = (today - timedelta(days=5)).isoformat()
+        
+        self.manager.backfill('nike', start, today.isoformat())
+        self.scraper.scrape_historical_data.reset_mock()
+        self.manager.backfill('nike', start, today.isoformat())
+        
+        self.scraper.scrape_historical_data.assert_called_once_with('nike', today.isoformat(), today.isoformat())
+        self.assertEqual(self.manager.load_coverage('nike'), [(today - timedelta(days=5), today - timedelta(days=1))])
+    
+    def test_default_range_matches_scrape_historical_data(self):
+        rows = self.manager.backfill('nike', end_date='2025-03-31')
+        
+        start = date(2025, 3, 31) - timedelta(days=HISTORY_DEFAULT_DAYS)
+        self.scraper.scrape_historical_data.assert_called_once_with('nike', start.isoformat(), '2025-03-31')
+        self.assertEqual(len(rows), HISTORY_DEFAULT_DAYS + 1)
+    
+    def test_backfill_many_skips_and_records_failures(self):
+        def history(symbol, start_date, end_date):
+            if symbol == 'broken':
+                raise ValueError('No historical data table found')
+            return fake_history(symbol, start_date, end_date)
+        
+        scraper = StockScraper(circuit_breaker=CircuitBreaker(failure_threshold=1))
+        scraper.scrape_historical_data = MagicMock(side_effect=history)
+        manager = BackfillManager(scraper, LocalStore(self.temp_dir.name))
+        
+        rows = manager.backfill_many(['nike', 'broken'], '2025-01-01', '2025-01-02')
+        
+        self.assertEqual([row['symbol'] for row in rows], ['nike', 'nike'])
+        self.assertEqual(manager.load_coverage('broken'), [])
+        summary = scraper.batch_summary.to_dict()
+        self.assertEqual((summary['succeeded'], summary['failed']), (1, ['broken']))
+        self.assertFalse(scraper.circuit_breaker.allow('broken'))
+
+if __name__ == '__main__':
+    unittest.main()
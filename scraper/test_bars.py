@@ -0,0 +1,176 @@
+import unittest
+import os
+import random
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import pandas as pd
+
+from bars import BarAggregator
+from data_processor import DataProcessor, parse_interval
+
+INTERVALS = ('1m', '5m', '1h', '1d')
+
+def ticks(symbols=('nike', 'nestlé', 'coca-cola-co'), count=600, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for symbol in symbols:
+        price = rng.uniform(20, 500)
+        at = pd.Timestamp('2025-05-08 21:40')
+        for _ in range(count):
+            # Irregular gaps leave some minutes without quotes and cross midnight
+            at += pd.Timedelta(seconds=rng.choice([1, 7, 20, 45, 190]))
+            price = round(max(1.0, price * (1 + rng.gauss(0, 0.01))), 2)
+            rows.append({'symbol': symbol, 'current_price': price, 'timestamp': at.isoformat()})
+    return rows
+
+def naive_bars(rows, interval):
+    """Bars of an interval from pandas resampling, one symbol at a time"""
+    df = pd.DataFrame(rows).assign(timestamp=lambda frame: pd.to_datetime(frame['timestamp']))
+    frames = []
+    for symbol, group in df.groupby('symbol', sort=True):
+        resampled = group.set_index('timestamp')['current_price'].resample(f'{parse_interval(interval)}s')
+        bars = resampled.ohlc().assign(ticks=resampled.count()).dropna().reset_index()
+        frames.append(bars.assign(symbol=symbol))
+    bars = pd.concat(frames, ignore_index=True)
+    return bars[['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'ticks']]
+
+class TestResampleBars(unittest.TestCase):
+    """
+    Test cases for resampling quotes into bars
+    """
+    
+    def setUp(self):
+        self.processor = DataProcessor()
+        self.rows = ticks()
+    
+    def test_parse_interval(self):
+        self.assertEqual(parse_interval('30s'), 30)
+        self.assertEqual(parse_interval('5m'), 300)
+        self.assertEqual(parse_interval('1D'), 86400)
+        self.assertEqual(parse_interval(90), 90)
+        for interval in ('m', '0m', '5w', 0, '1.5h'):
+            with self.assertRaises(ValueError):
+                parse_interval(interval)
+    
+    def test_matches_pandas_resample(self):
+        shuffled = random.Random(1).sample(self.rows, len(self.rows))
+        
+        bars = self.processor.resample_bars(pd.DataFrame(shuffled), INTERVALS)
+        
+        self.assertEqual(list(bars), list(INTERVALS))
+        self.assertEqual(len(bars['1d']), 6)
+        for interval in INTERVALS:
+            with self.subTest(interval=interval):
+                pd.testing.assert_frame_equal(bars[interval], naive_bars(self.rows, interval),
+                                              check_dtype=False, check_index_type=False)
+    
+    def test_skips_quotes_without_price_or_time(self):
+        df = pd.DataFrame([
+            {'symbol': 'nike', 'current_price': 98.0, 'timestamp': '2025-05-08T14:00:10'},
+            {'symbol': 'nike', 'current_price': None, 'timestamp': '2025-05-08T14:00:20'},
+            {'symbol': 'nike', 'current_price': 99.5, 'timestamp': None},
+            {'symbol': None, 'current_price': 99.5, 'timestamp': '2025-05-08T14:00:30'},
+            {'symbol': 'nike', 'current_price': 97.0, 'timestamp': '2025-05-08T14:00:50'},
+        ])
+        
+        bars = self.processor.resample_bars(df, ['1m'])['1m']
+        
+        self.assertEqual(bars[['open', 'high', 'low', 'close', 'ticks']].values.tolist(), [[98.0, 98.0, 97.0, 97.0, 2]])
+        self.assertTrue(self.processor.resample_bars(df.iloc[:0], ['1m'])['1m'].empty)
+    
+    def test_timezone_aware_days_follow_the_wall_clock(self):
+        df = pd.DataFrame({
+            'symbol': ['nike'] * 2,
+            'current_price': [98.0, 99.0],
+            'timestamp': pd.to_datetime(['2025-05-08T23:30:00-04:00', '2025-05-09T00:30:00-04:00']),
+        })
+        
+        bars = self.processor.resample_bars(df, ['1d'])['1d']
+        
+        self.assertEqual(bars['timestamp'].tolist(), [pd.Timestamp('2025-05-08', tz='UTC-04:00'),
+                                                      pd.Timestamp('2025-05-09', tz='UTC-04:00')])
+
+class TestBarAggregator(unittest.TestCase):
+    """
+    Test cases for building bars quote by quote
+    """
+    
+    def test_streaming_matches_resample_bars(self):
+        rows = ticks()
+        aggregator = BarAggregator(INTERVALS)
+        
+        closed = []
+        for row in sorted(rows, key=lambda row: row['timestamp']):
+            closed += aggregator.update_record(row)
+        closed += aggregator.flush()
+        expected = DataProcessor().resample_bars(pd.DataFrame(rows), INTERVALS)
+        
+        streamed = pd.DataFrame(closed)
+        for interval in INTERVALS:
+            with self.subTest(interval=interval):
+                result = streamed[streamed['interval'] == interval].drop(columns='interval')
+                result = result.sort_values(['symbol', 'timestamp']).reset_index(drop=True)
+                pd.testing.assert_frame_equal(result.assign(timestamp=pd.to_datetime(result['timestamp'])),
+                                              expected[interval], check_dtype=False)
+    
+    def test_open_bars_update_and_close(self):
+        aggregator = BarAggregator(['1m', '1h'])
+        
+        self.assertEqual(aggregator.update('nike', 98.0, '2025-05-08T14:00:10'), [])
+        self.assertEqual(aggregator.update('nike', 99.5, '2025-05-08T14:00:40'), [])
+        self.assertEqual(aggregator.current('nike')['1m']['high'], 99.5)
+        
+        closed = aggregator.update('nike', 97.0, datetime(2025, 5, 8, 14, 1, 5))
+        
+        self.assertEqual(closed, [{
+            'symbol': 'nike', 'interval': '1m', 'timestamp': datetime(2025, 5, 8, 14, 0),
+            'open': 98.0, 'high': 99.5, 'low': 98.0, 'close': 99.5, 'ticks': 2,
+        }])
+        self.assertEqual(aggregator.current('nike')['1h']['ticks'], 3)
+        self.assertEqual(aggregator.current('nike')['1h']['low'], 97.0)
+    
+    def test_late_quotes_are_left_out(self):
+        aggregator = BarAggregator(['1m', '1h'])
+        aggregator.update('nike', 98.0, '2025-05-08T14:01:10')
+        
+        aggregator.update('nike', 50.0, '2025-05-08T14:00:59')
+        
+        self.assertEqual(aggregator.late, 1)
+        self.assertEqual(aggregator.current('nike')['1m']['low'], 98.0)
+        self.assertEqual(aggregator.current('nike')['1h']['low'], 50.0)
+    
+    def test_update_record_parses_prices_and_keeps_timezones(self):
+        aggregator = BarAggregator(['5m'])
+        
+        aggregator.update_record({'symbol': 'nike', 'current_price': '$1,098.50', 'timestamp': '2025-05-08T14:03:00+00:00'})
+        aggregator.update_record({'symbol': 'nike', 'current_price': 'N/A', 'timestamp': '2025-05-08T14:04:00+00:00'})
+        aggregator.update_record({'symbol': 'nike', 'current_price': '1,099.00'})
+        
+        bar = aggregator.current('nike')['5m']
+        self.assertEqual((bar['close'], bar['ticks']), (1098.5, 1))
+        self.assertEqual(bar['timestamp'], datetime(2025, 5, 8, 14, 0, tzinfo=timezone.utc))
+    
+    def test_warm_up_continues_stored_bars(self):
+        rows = ticks(count=200)
+        history, live = rows[:150], rows[150:]
+        processor = DataProcessor()
+        aggregator = BarAggregator(INTERVALS)
+        
+        seeded = aggregator.warm_up(processor.resample_bars(pd.DataFrame(history), INTERVALS))
+        for row in live:
+            aggregator.update_record(row)
+        
+        self.assertEqual(seeded, 4)
+        expected = processor.resample_bars(pd.DataFrame(rows), INTERVALS)
+        for interval in INTERVALS:
+            last = expected[interval].iloc[-1]
+            bar = aggregator.current('nike')[interval]
+            self.assertEqual((bar['open'], bar['high'], bar['low'], bar['close'], bar['ticks']),
+                             (last['open'], last['high'], last['low'], last['close'], last['ticks']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+import pandas as pd
+
+import cross_section
+from cross_section import align_prices, correlation_matrix, rank_screen, rolling_beta, rolling_correlation, to_returns
+
+def factor_returns(rows=240, symbols=8, seed=5):
+    """Returns of symbols that load differently on one market factor"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, rows)
+    loadings = np.linspace(0.2, 1.8, symbols)
+    values = market[:, None] * loadings + rng.normal(0, 0.005, (rows, symbols))
+    index = pd.date_range('2025-01-01', periods=rows, freq='D')
+    returns = pd.DataFrame(values, index=index, columns=[f'stock-{i}' for i in range(symbols)])
+    returns.iloc[0] = np.nan
+    return returns, pd.Series(market, index=index)
+
+def with_gaps(returns):
+    gapped = returns.copy()
+    gapped.iloc[10:70, 2] = np.nan
+    gapped.iloc[100:104, 5] = np.nan
+    gapped.iloc[:150, 7] = np.nan
+    return gapped
+
+class TestCrossSection(unittest.TestCase):
+    """
+    Test cases for cross-sectional analytics
+    """
+    
+    def setUp(self):
+        self.returns, self.market = factor_returns()
+    
+    def test_align_prices_on_a_common_grid(self):
+        df = pd.DataFrame([
+            {'symbol': 'nike', 'current_price': 98.0, 'timestamp': '2025-05-08T14:00:05'},
+            {'symbol': 'nike', 'current_price': 99.0, 'timestamp': '2025-05-08T14:00:50'},
+            {'symbol': 'nestle', 'current_price': 80.0, 'timestamp': '2025-05-08T14:01:10'},
+            {'symbol': 'nike', 'current_price': 97.0, 'timestamp': '2025-05-08T14:03:00'},
+            {'symbol': 'nike', 'current_price': 96.0, 'timestamp': '2025-05-08T14:04:30'},
+        ])
+        
+        prices = align_prices(df, '1m')
+        limited = align_prices(df, '1m', fill_limit=1)
+        
+        self.assertEqual(list(prices.columns), ['nestle', 'nike'])
+        self.assertEqual(prices.index.strftime('%H:%M').tolist(), ['14:00', '14:01', '14:03', '14:04'])
+        self.assertEqual(prices['nike'].tolist(), [99.0, 99.0, 97.0, 96.0])
+        self.assertEqual(prices['nestle'].tolist()[1:], [80.0, 80.0, 80.0])
+        self.assertTrue(np.isnan(prices['nestle'].iloc[0]))
+        self.assertEqual(limited['nestle'].iloc[2], 80.0)
+        self.assertTrue(np.isnan(limited['nestle'].iloc[3]))
+        self.assertEqual(to_returns(prices)['nike'].iloc[2], 97.0 / 99.0 - 1)
+    
+    def test_correlation_matrix_matches_pandas(self):
+        for returns in (self.returns, with_gaps(self.returns)):
+            with patch.object(cross_section, 'CROSS_SECTION_BLOCK_ROWS', 50):
+                correlation = correlation_matrix(returns, min_periods=100)
+                covariance = correlation_matrix(returns, covariance=True)
+            
+            pd.testing.assert_frame_equal(correlation, returns.corr(min_periods=100), rtol=1e-9)
+            pd.testing.assert_frame_equal(covariance, returns.cov(), rtol=1e-9)
+        self.assertTrue(np.isnan(correlation.loc['stock-7', 'stock-2']))
+    
+    def test_rolling_correlation_matches_pandas_windows(self):
+        for returns in (self.returns, with_gaps(self.returns)):
+            for step in (1, 7, 60):
+                # Rebuilding the sums every other window exercises both paths
+                with patch.object(cross_section, 'RESUM_WINDOWS', 2):
+                    results = list(rolling_correlation(returns, 30, step=step, min_periods=20))
+                
+                self.assertEqual(len(results), len(range(30, len(returns) + 1, step)))
+                for end, matrix in results:
+                    window = returns.loc[:end].iloc[-30:]
+                    pd.testing.assert_frame_equal(matrix, window.corr(min_periods=20), rtol=1e-8, atol=1e-12)
+        
+        end, covariance = next(rolling_correlation(self.returns, 30, step=5, min_periods=29, covariance=True))
+        self.assertEqual(end, self.returns.index[29])
+        pd.testing.assert_frame_equal(covariance, self.returns.iloc[:30].cov(), rtol=1e-9)
+        with self.assertRaises(ValueError):
+            next(rolling_correlation(self.returns, 1))
+    
+    def test_tiles_match_the_whole_matrix(self):
+        for returns in (self.returns, with_gaps(self.returns)):
+            with patch.object(cross_section, 'CROSS_SECTION_TILE_COLUMNS', 3):
+                tiled = correlation_matrix(returns, min_periods=100)
+                tiled_covariance = correlation_matrix(returns, covariance=True)
+                tiled_windows = list(rolling_correlation(returns, 30, step=40, min_periods=20))
+            with patch.object(cross_section, 'CROSS_SECTION_TILE_COLUMNS', returns.shape[1]):
+                whole = correlation_matrix(returns, min_periods=100)
+                whole_covariance = correlation_matrix(returns, covariance=True)
+                whole_windows = list(rolling_correlation(returns, 30, step=40, min_periods=20))
+            
+            pd.testing.assert_frame_equal(tiled, whole, rtol=1e-12)
+            pd.testing.assert_frame_equal(tiled_covariance, whole_covariance, rtol=1e-12)
+            for (_, tiled_window), (_, whole_window) in zip(tiled_windows, whole_windows):
+                pd.testing.assert_frame_equal(tiled_window, whole_window, rtol=1e-12)
+    
+    def test_rolling_beta(self):
+        returns = with_gaps(self.returns)
+        
+        betas = rolling_beta(returns, self.market, 60, min_periods=40)
+        
+        for position in (59, 120, 239):
+            window = returns.iloc[position - 59:position + 1]
+            market = self.market.iloc[position - 59:position + 1]
+            for symbol in returns.columns:
+                common = window[symbol].notna()
+                expected = window[symbol].cov(market) / market[common].var() if common.sum() >= 40 else np.nan
+                np.testing.assert_allclose(betas[symbol].iloc[position], expected, rtol=1e-9, err_msg=symbol)
+        # Loadings rise from 0.2 to 1.8 across the symbols
+        self.assertLess(betas['stock-0'].iloc[-1], 0.5)
+        self.assertGreater(betas['stock-6'].iloc[-1], 1.3)
+        self.assertTrue(betas.iloc[:39].isna().all().all())
+        
+        with_market = returns.assign(index=self.market)
+        pd.testing.assert_series_equal(rolling_beta(with_market, 'index', 60)['stock-3'],
+                                       rolling_beta(returns, self.market, 60)['stock-3'])
+        numbered = with_market.set_axis(range(with_market.shape[1]), axis=1)
+        pd.testing.assert_series_equal(rolling_beta(numbered, 8, 60)[3], rolling_beta(returns, self.market, 60)['stock-3'],
+                                       check_names=False)
+    
+    def test_rank_screen(self):
+        prices = pd.DataFrame(
+            {'a': [10.0, 11.0, 12.0], 'b': [10.0, 9.0, 11.0], 'c': [10.0, 12.0, np.nan], 'd': [5.0, 5.5, 6.0]},
+            index=pd.date_range('2025-05-01', periods=3, freq='D'),
+        )
+        
+        screen = rank_screen(prices, lookback=1, top=2)
+        bottom = rank_screen(prices, lookback=2, top=1, ascending=True)
+        
+        self.assertEqual(screen['symbol'].tolist(), ['c', 'a', 'b', 'a'])
+        self.assertEqual(screen['rank'].tolist(), [1, 2, 1, 2])
+        self.assertAlmostEqual(screen['trailing_return'].iloc[2], 11.0 / 9.0 - 1)
+        self.assertEqual(bottom[['symbol', 'rank']].values.tolist(), [['b', 1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
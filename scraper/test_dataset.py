@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import pandas as pd
+
+try:
+    from moto import mock_aws
+except ImportError:
+    from moto import mock_s3 as mock_aws
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+
+from dataset import PartitionedReader, partition_key, write_partitioned
+from s3_manager import S3Manager
+
+RECORDS = [
+    {'symbol': symbol, 'company_name': name, 'current_price': price, 'price_change': 0.5, 'timestamp': timestamp}
+    for symbol, name in [('nike', 'Nike Inc (NKE)'), ('coca-cola-co', 'Coca-Cola Co (KO)')]
+    for price, timestamp in [(98.76, '2025-05-07T20:00:00'), (99.10, '2025-05-08T15:30:00'), (99.25, '2025-05-08T20:00:00')]
+]
+
+@mock_aws
+class TestPartitionedDataset(unittest.TestCase):
+    """
+    Test cases for the Hive-partitioned dataset against a local S3 stand-in
+    """
+    
+    def setUp(self):
+        self.s3_manager = S3Manager('test-dataset-bucket')
+        self.reader = PartitionedReader(self.s3_manager, prefix='dataset/')
+    
+    def test_partition_key(self):
+        self.assertEqual(
+            partition_key('dataset/', 'nike', '2025-05-08', 'abc', 'parquet'),
+            'dataset/symbol=nike/date=2025-05-08/part-abc.parquet'
+        )
+    
+    def test_write_lays_out_one_file_per_symbol_and_day(self):
+        uris = write_partitioned(self.s3_manager, RECORDS, prefix='dataset/', file_format='json', run_id='run1')
+        
+        keys = sorted(self.s3_manager.list_objects('dataset/'))
+        self.assertEqual(len(uris), 4)
+        self.assertEqual(keys, [
+            'dataset/symbol=coca-cola-co/date=2025-05-07/part-run1.json',
+            'dataset/symbol=coca-cola-co/date=2025-05-08/part-run1.json',
+            'dataset/symbol=nike/date=2025-05-07/part-run1.json',
+            'dataset/symbol=nike/date=2025-05-08/part-run1.json',
+        ])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_round_trip(self):
+        write_partitioned(self.s3_manager, RECORDS, prefix='dataset/')
+        
+        df = self.reader.read()
+        
+        self.assertEqual(len(df), len(RECORDS))
+        self.assertEqual(sorted(df['symbol'].unique()), ['coca-cola-co', 'nike'])
+        self.assertEqual(sorted(df['current_price'].tolist()), sorted(record['current_price'] for record in RECORDS))
+        self.assertEqual(sorted(str(day) for day in df['date'].unique()), ['2025-05-07', '2025-05-08'])
+    
+    def test_reader_prunes_before_downloading(self):
+        write_partitioned(self.s3_manager, RECORDS, prefix='dataset/', file_format='json', run_id='run1')
+        write_partitioned(self.s3_manager, RECORDS, prefix='dataset/', file_format='json', run_id='run2')
+        
+        with patch.object(self.s3_manager, 'download_data', wraps=self.s3_manager.download_data) as download, \
+                patch.object(self.s3_manager, 'list_partition', wraps=self.s3_manager.list_partition) as listing:
+            df = self.reader.read(symbols=['nike'], start_date='2025-05-08', end_date='2025-05-08')
+        
+        downloaded = sorted(call.args[0] for call in download.call_args_list)
+        self.assertEqual(downloaded, [
+            'dataset/symbol=nike/date=2025-05-08/part-run1.json',
+            'dataset/symbol=nike/date=2025-05-08/part-run2.json',
+        ])
+        listed = [call.args[0] for call in listing.call_args_list]
+        self.assertNotIn('dataset/', listed)
+        self.assertNotIn('dataset/symbol=coca-cola-co/', listed)
+        self.assertNotIn('dataset/symbol=nike/date=2025-05-07/', listed)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(set(df['symbol']), {'nike'})
+    
+    def test_missing_partitions_read_as_empty(self):
+        df = self.reader.read(symbols=['nike'])
+        
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), ['symbol', 'date'])
+    
+    def test_symbols(self):
+        write_partitioned(self.s3_manager, RECORDS, prefix='dataset/', file_format='json')
+        
+        self.assertEqual(self.reader.symbols(), ['coca-cola-co', 'nike'])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_layout_is_readable_by_pyarrow_dataset(self):
+        write_partitioned(self.s3_manager, pd.DataFrame(RECORDS), prefix='dataset/')
+        
+        # Copy the objects to disk and read them the way external tools would
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for key in self.s3_manager.list_objects('dataset/'):
+                path = os.path.join(temp_dir, key)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(self.s3_manager.download_data(key))
+            
+            dataset = ds.dataset(os.path.join(temp_dir, 'dataset'), format='parquet', partitioning='hive')
+            table = dataset.to_table(filter=(ds.field('symbol') == 'nike'))
+        
+        self.assertEqual(table.num_rows, 3)
+        self.assertIn('date', table.column_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
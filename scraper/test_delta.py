@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from backfill import LocalStore
+from delta import DeltaTracker, state_key
+
+def quotes(*prices):
+    return [
+        {'symbol': symbol, 'current_price': price, 'price_change': '+0.10', 'timestamp': '2025-05-08T20:00:00'}
+        for symbol, price in zip(['nike', 'coca-cola-co', 'microsoft-corp'], prices)
+    ]
+
+class TestDeltaTracker(unittest.TestCase):
+    """
+    Test cases for the DeltaTracker class
+    """
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = LocalStore(self.temp_dir.name)
+        self.now = 1000.0
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def make_tracker(self, snapshot_interval=3600):
+        return DeltaTracker(self.store, 'state/watchlist.json', snapshot_interval=snapshot_interval, clock=lambda: self.now)
+    
+    def test_first_run_is_a_full_snapshot(self):
+        records, snapshot = self.make_tracker().filter(quotes('98.76', '62.45', '3,456.78'))
+        
+        self.assertTrue(snapshot)
+        self.assertEqual(len(records), 3)
+    
+    def test_only_moved_quotes_are_emitted(self):
+        tracker = self.make_tracker()
+        tracker.filter(quotes('98.76', '62.45', '3,456.78'))
+        tracker.save()
+        
+        self.now += 60
+        records, snapshot = self.make_tracker().filter(quotes('98.80', '62.45', '3,456.78'))
+        
+        self.assertFalse(snapshot)
+        self.assertEqual([record['symbol'] for record in records], ['nike'])
+    
+    def test_unsaved_state_is_not_kept(self):
+        tracker = self.make_tracker()
+        tracker.filter(quotes('98.76', '62.45', '3,456.78'))
+        tracker.save()
+        
+        self.now += 60
+        self.make_tracker().filter(quotes('98.80', '62.45', '3,456.78'))
+        records, _ = self.make_tracker().filter(quotes('98.80', '62.45', '3,456.78'))
+        
+        self.assertEqual([record['symbol'] for record in records], ['nike'])
+    
+    def test_periodic_full_snapshot(self):
+        tracker = self.make_tracker(snapshot_interval=300)
+        tracker.filter(quotes('98.76', '62.45', '3,456.78'))
+        tracker.save()
+        
+        self.now += 301
+        records, snapshot = tracker.filter(quotes('98.76', '62.45', '3,456.78'))
+        
+        self.assertTrue(snapshot)
+        self.assertEqual(len(records), 3)
+    
+    def test_forced_snapshot(self):
+        tracker = self.make_tracker()
+        tracker.filter(quotes('98.76', '62.45', '3,456.78'))
+        tracker.save()
+        
+        records, snapshot = tracker.filter(quotes('98.76', '62.45', '3,456.78'), full_snapshot=True)
+        
+        self.assertTrue(snapshot)
+        self.assertEqual(len(records), 3)
+    
+    def test_state_key_ignores_order_and_duplicates(self):
+        self.assertEqual(state_key(['nike', 'coca-cola-co']), state_key(['coca-cola-co', 'nike', 'nike']))
+        self.assertNotEqual(state_key(['nike']), state_key(['nike', 'coca-cola-co']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+from history import PriceHistory
+
+def history():
+    rows = []
+    for day in range(1, 11):
+        for symbol in ('nike', 'coca-cola-co', 'microsoft-corp'):
+            rows.append({
+                'symbol': symbol,
+                'timestamp': f'2025-05-{day:02d}T20:00:00',
+                'current_price': float(day),
+            })
+    # Stored out of order, as appended partitions would be
+    return pd.DataFrame(rows[::-1])
+
+class TestPriceHistory(unittest.TestCase):
+    """
+    Test cases for the PriceHistory class
+    """
+    
+    def test_between_matches_filter_by_date(self):
+        df = history()
+        index = PriceHistory(df)
+        processor = DataProcessor()
+        
+        for start_date, end_date in [('2025-05-03', '2025-05-07'), (None, '2025-05-02'), ('2025-05-09', None), ('2025-06-01', None)]:
+            filtered = processor.filter_by_date(df[df['symbol'] == 'nike'], start_date, end_date).sort_values('timestamp')
+            result = index.between('nike', start_date, end_date)
+            self.assertEqual(list(result['current_price']), list(filtered['current_price']))
+            self.assertTrue(result['timestamp'].is_monotonic_increasing)
+    
+    def test_between_returns_a_view(self):
+        index = PriceHistory(history())
+        
+        result = index.between('nike', '2025-05-03', '2025-05-05')
+        
+        self.assertEqual(len(result), 2)
+        self.assertTrue(np.shares_memory(result['current_price'].to_numpy(), index.frame['current_price'].to_numpy()))
+    
+    def test_range_over_symbols(self):
+        df = history()
+        index = PriceHistory(df)
+        
+        result = index.range('2025-05-09', symbols=['nike', 'microsoft-corp', 'unknown'])
+        
+        self.assertEqual(list(result['symbol']), ['microsoft-corp', 'microsoft-corp', 'nike', 'nike'])
+        self.assertEqual(len(index.range()), len(df))
+        self.assertEqual(len(index.range('2026-01-01')), 0)
+        self.assertEqual(index.symbols(), ['coca-cola-co', 'microsoft-corp', 'nike'])
+        self.assertFalse(pd.api.types.is_datetime64_any_dtype(df['timestamp']))
+
+
+if __name__ == '__main__':
+    unittest.main()
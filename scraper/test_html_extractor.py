@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from html_extractor import extract_quote_fast
+from scraper import extract_quote, extract_quote_with_soup
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+class TestHtmlExtractor(unittest.TestCase):
+    """
+    Test cases for the streaming quote extractor
+    """
+    
+    def test_matches_beautifulsoup_on_fixtures(self):
+        for name in sorted(os.listdir(FIXTURE_DIR)):
+            if not name.endswith('.html') or name.startswith('listing-'):
+                continue
+            with self.subTest(fixture=name):
+                html = load_fixture(name)
+                self.assertEqual(extract_quote_fast(html), extract_quote_with_soup(html))
+    
+    def test_extracts_nested_title_text_and_entities(self):
+        html = load_fixture('microsoft-corp.html')
+        
+        self.assertEqual(
+            extract_quote_fast(html),
+            ('Microsoft Corporation (MSFT) & Co', '3,456.78', '+45.67')
+        )
+    
+    def test_missing_price_returns_not_available(self):
+        html = load_fixture('delisted-holdings.html')
+        
+        self.assertEqual(extract_quote_fast(html), ('Delisted Holdings (DLH)', 'N/A', 'N/A'))
+    
+    def test_stops_after_quote_is_found(self):
+        html = load_fixture('nike.html')
+        truncated = html[:html.index('<section class="overview-section">')] + '<div><span>unterminated'
+        
+        self.assertEqual(extract_quote_fast(truncated), ('Nike Inc (NKE)', '98.76', '+1.23'))
+    
+    def test_returns_none_without_title(self):
+        self.assertIsNone(extract_quote_fast('<html><body><h1>Other page</h1></body></html>'))
+    
+    def test_extract_quote_falls_back_to_beautifulsoup(self):
+        html = load_fixture('nike.html')
+        
+        with patch('scraper.extract_quote_fast', return_value=None), \
+                patch('scraper.extract_quote_with_soup', wraps=extract_quote_with_soup) as mock_soup:
+            result = extract_quote(html)
+        
+        mock_soup.assert_called_once_with(html)
+        self.assertEqual(result, ('Nike Inc (NKE)', '98.76', '+1.23'))
+    
+    def test_extract_quote_raises_when_no_title_anywhere(self):
+        with self.assertRaises(AttributeError):
+            extract_quote('<html><body>Not an instrument page</body></html>')
+
+
+if __name__ == '__main__':
+    unittest.main()
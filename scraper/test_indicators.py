@@ -0,0 +1,157 @@
+import unittest
+import math
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from indicators import ChunkedIndicators, IndicatorEngine, compute_indicators, indicator_columns
+
+WINDOWS = {'sma': (3, 5), 'ema': (4,), 'volatility': (4,), 'rsi': (3,), 'channel': (4,)}
+
+def history(symbols=('nike', 'coca-cola-co', 'microsoft-corp'), days=30, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for symbol in symbols:
+        price = rng.uniform(20, 500)
+        for hour in range(days * 3):
+            price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+            rows.append({
+                'symbol': symbol,
+                'timestamp': pd.Timestamp('2025-05-01 14:00') + pd.Timedelta(hours=hour * 8),
+                'close': round(price, 2),
+                'high': round(price * 1.01, 2),
+                'low': round(price * 0.99, 2),
+                'volume': float(rng.randint(1000, 100000)),
+            })
+    rng.shuffle(rows)
+    return pd.DataFrame(rows)
+
+def naive(rows):
+    """Indicators of one symbol's rows in time order, computed from scratch at every row"""
+    results = []
+    for end in range(1, len(rows) + 1):
+        seen = rows[:end]
+        prices = [row['close'] for row in seen]
+        values = {}
+        for length in WINDOWS['sma']:
+            values[f'sma_{length}'] = sum(prices[-length:]) / length if end >= length else None
+        for length in WINDOWS['ema']:
+            ema = prices[0]
+            for price in prices[1:]:
+                ema = 2 / (length + 1) * price + (1 - 2 / (length + 1)) * ema
+            values[f'ema_{length}'] = ema if end >= length else None
+        returns = [b / a - 1 for a, b in zip(prices, prices[1:])]
+        for length in WINDOWS['volatility']:
+            values[f'volatility_{length}'] = statistics.stdev(returns[-length:]) if len(returns) >= length else None
+        for length in WINDOWS['rsi']:
+            changes = [b - a for a, b in zip(prices, prices[1:])]
+            if len(changes) < length:
+                values[f'rsi_{length}'] = None
+            else:
+                gain, loss = max(changes[0], 0), max(-changes[0], 0)
+                for change in changes[1:]:
+                    gain = (gain * (length - 1) + max(change, 0)) / length
+                    loss = (loss * (length - 1) + max(-change, 0)) / length
+                values[f'rsi_{length}'] = 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+        for length in WINDOWS['channel']:
+            window = seen[-length:]
+            values[f'channel_high_{length}'] = max(row['high'] for row in window) if end >= length else None
+            values[f'channel_low_{length}'] = min(row['low'] for row in window) if end >= length else None
+        day = seen[-1]['timestamp'].normalize()
+        session = [row for row in seen if row['timestamp'].normalize() == day]
+        values['vwap'] = sum(row['close'] * row['volume'] for row in session) / sum(row['volume'] for row in session)
+        results.append(values)
+    return results
+
+class TestIndicators(unittest.TestCase):
+    """
+    Test cases for the vectorized and incremental indicator engines
+    """
+    
+    def assertClose(self, actual, expected, label):
+        if expected is None:
+            self.assertTrue(actual is None or math.isnan(actual), f"{label}: expected no value, got {actual}")
+        else:
+            self.assertIsNotNone(actual, label)
+            self.assertAlmostEqual(actual, expected, places=7, msg=label)
+    
+    def test_vectorized_matches_naive(self):
+        df = history()
+        result = compute_indicators(df, windows=WINDOWS)
+        
+        self.assertEqual(list(result.columns), list(df.columns) + indicator_columns(WINDOWS))
+        for symbol, rows in result.groupby('symbol', sort=False):
+            expected = naive(rows.to_dict('records'))
+            for (_, row), values in zip(rows.iterrows(), expected):
+                for column, value in values.items():
+                    self.assertClose(row[column], value, f"{symbol} {row['timestamp']} {column}")
+    
+    def test_incremental_matches_naive(self):
+        df = history().sort_values(['symbol', 'timestamp'])
+        engine = IndicatorEngine(WINDOWS)
+        
+        for symbol, rows in df.groupby('symbol', sort=False):
+            records = rows.to_dict('records')
+            for record, expected in zip(records, naive(records)):
+                values = engine.update(symbol, record['close'], timestamp=record['timestamp'],
+                                       volume=record['volume'], high=record['high'], low=record['low'])
+                for column, value in expected.items():
+                    self.assertClose(values[column], value, f"{symbol} {record['timestamp']} {column}")
+    
+    def test_warm_up_continues_the_history(self):
+        df = history()
+        df = df.sort_values(['symbol', 'timestamp'])
+        stored, fresh = df.groupby('symbol').head(60), df.groupby('symbol').tail(30)
+        full = compute_indicators(df, windows=WINDOWS).groupby('symbol').tail(30)
+        
+        engine = IndicatorEngine(WINDOWS)
+        engine.warm_up(stored)
+        for record, (_, row) in zip(fresh.to_dict('records'), full.iterrows()):
+            self.assertEqual(record['symbol'], row['symbol'])
+            values = engine.update(record['symbol'], record['close'], timestamp=record['timestamp'],
+                                   volume=record['volume'], high=record['high'], low=record['low'])
+            for column in indicator_columns(WINDOWS):
+                self.assertClose(values[column], row[column], column)
+        self.assertEqual(engine.symbols(), ['coca-cola-co', 'microsoft-corp', 'nike'])
+    
+    def test_update_record_parses_scraped_strings(self):
+        engine = IndicatorEngine({'sma': (2,)})
+        
+        self.assertEqual(engine.update_record({'symbol': 'nike', 'current_price': '1,000.00'}), {'sma_2': None})
+        self.assertEqual(engine.update_record({'symbol': 'nike', 'current_price': '$1,002.00'}), {'sma_2': 1001.0})
+        self.assertEqual(engine.update_record({'symbol': 'nike', 'current_price': 'N/A'}), {})
+    
+    def test_chunks_match_the_whole_history(self):
+        df = history(symbols=('nike', 'coca-cola-co', 'microsoft-corp', 'nestle')).sort_values('timestamp')
+        # Nestle only trades in the middle chunks
+        df = df[(df['symbol'] != 'nestle') | df['timestamp'].between('2025-05-10', '2025-05-20')]
+        expected = compute_indicators(df, windows=WINDOWS)
+        
+        chunked = ChunkedIndicators(WINDOWS)
+        bounds = [0, 1, 7, 40, 41, 180, len(df)]
+        chunks = [chunked.compute(df.iloc[start:stop]) for start, stop in zip(bounds, bounds[1:])]
+        result = pd.concat(chunks).sort_values(['symbol', 'timestamp'], kind='stable').reset_index(drop=True)
+        
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertEqual(len(chunked._tail), 4 * chunked.tail_length)
+        for column in indicator_columns(WINDOWS):
+            np.testing.assert_allclose(result[column], expected[column], rtol=1e-9, err_msg=column)
+    
+    def test_missing_prices_are_dropped(self):
+        df = history(symbols=('nike',), days=3)
+        df.loc[df.index[:5], 'close'] = np.nan
+        
+        result = compute_indicators(df, windows=WINDOWS)
+        
+        self.assertEqual(len(result), len(df) - 5)
+        self.assertTrue(result['close'].notna().all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import pickle
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import pandas as pd
+
+import parallel
+from data_processor import DataProcessor
+from indicators import compute_indicators
+from parallel import assign_shards, pack_column, pack_frame, process_sharded, to_columns, unpack_column, unpack_frame
+
+WINDOWS = {'sma': (3,), 'ema': (4,), 'rsi': (3,)}
+
+def scraped_quotes(days=10):
+    records = []
+    for day in range(1, days + 1):
+        for symbol, base in [('nike', 98.0), ('nestlé', 1234.0), ('coca-cola-co', 61.0), ('microsoft-corp', 410.0)]:
+            records.append({
+                'symbol': symbol,
+                'company_name': f'{symbol.title()} Inc',
+                'current_price': f'{base + day * 1.7:,.2f}' if day != 4 else 'N/A',
+                'price_change': f'{(day % 3) - 1:+.2f}',
+                'timestamp': f'2025-05-{day:02d}T20:00:00',
+            })
+    return records
+
+def without_processed_at(df):
+    return df.drop(columns='processed_at').reset_index(drop=True)
+
+class TestParallel(unittest.TestCase):
+    """
+    Test cases for processing sharded by symbol
+    """
+    
+    def test_pack_column_round_trip(self):
+        records = scraped_quotes(2) + [{'symbol': 'nike', 'volume': 1200, 'open': None, 'extra': [1]}]
+        columns = to_columns(records)
+        
+        packed = pickle.loads(pickle.dumps({name: pack_column(column) for name, column in columns.items()}))
+        
+        self.assertEqual({name: column[0] for name, column in packed.items()}, {
+            'symbol': 'dictionary', 'company_name': 'dictionary', 'current_price': 'strings',
+            'price_change': 'dictionary', 'timestamp': 'dictionary', 'volume': 'numbers',
+            'open': 'dictionary', 'extra': 'pickle',
+        })
+        for name, column in columns.items():
+            self.assertEqual(unpack_column(packed[name]).tolist(), column.tolist(), name)
+        self.assertEqual(unpack_column(packed['symbol'])[1], 'nestlé')
+    
+    def test_pack_frame_round_trip(self):
+        df = DataProcessor().process_data(scraped_quotes())
+        
+        packed = pack_frame(df)
+        
+        self.assertEqual(packed['current_price'][0], 'array')
+        pd.testing.assert_frame_equal(unpack_frame(packed), df.reset_index(drop=True))
+    
+    def test_assign_shards_balances_rows(self):
+        symbols = pd.Series(['a'] * 5 + ['b'] * 3 + ['c'] * 3 + ['d'] * 1)
+        
+        shards = assign_shards(symbols, 2)
+        
+        self.assertEqual(shards.tolist(), [0] * 5 + [1] * 3 + [1] * 3 + [0])
+        self.assertEqual(assign_shards(symbols.sample(frac=1, random_state=1), 2).tolist(),
+                         pd.Series(shards, index=symbols.index).loc[symbols.sample(frac=1, random_state=1).index].tolist())
+    
+    def test_matches_process_data(self):
+        records = scraped_quotes()
+        expected = DataProcessor().process_data(records, '2025-05-03', '2025-05-09')
+        
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                result = process_sharded(records, '2025-05-03', '2025-05-09', workers=workers, shards=3)
+                pd.testing.assert_frame_equal(without_processed_at(result), without_processed_at(expected))
+    
+    def test_integer_columns_keep_their_dtype(self):
+        records = [dict(record, shares=index * 1000) for index, record in enumerate(scraped_quotes())]
+        expected = DataProcessor().process_data(records)
+        
+        result = process_sharded(records, workers=2)
+        
+        self.assertEqual(expected['shares'].dtype, 'int64')
+        pd.testing.assert_frame_equal(without_processed_at(result), without_processed_at(expected))
+    
+    def test_indicators_match_compute_indicators(self):
+        records = scraped_quotes()
+        expected = compute_indicators(DataProcessor().process_data(records), price_column='current_price', windows=WINDOWS)
+        
+        result = process_sharded(records, workers=2, windows=WINDOWS)
+        
+        pd.testing.assert_frame_equal(without_processed_at(result), without_processed_at(expected))
+    
+    def test_falls_back_without_a_process_pool(self):
+        records = scraped_quotes()
+        
+        with patch.object(parallel, 'ProcessPoolExecutor', side_effect=OSError("no /dev/shm")):
+            result = process_sharded(records, workers=4)
+        
+        self.assertEqual(len(result), len(records))
+        self.assertEqual(result['symbol'].tolist()[:4], ['nike', 'nestlé', 'coca-cola-co', 'microsoft-corp'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from bars import BarAggregator
+from indicators import IndicatorEngine
+from poller import QuotePoller
+
+class FakeClock:
+    """
+    A manually advanced clock whose sleep moves time forward
+    """
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def quote(symbol, price):
+    return [{'symbol': symbol, 'current_price': price, 'price_change': '+0.00'}]
+
+
+class TestQuotePoller(unittest.TestCase):
+    """
+    Test cases for the QuotePoller class
+    """
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scraper = MagicMock()
+        self.scraper.scrape_stock_data.side_effect = lambda symbol: quote(symbol, '1.00')
+        self.emitted = []
+    
+    def make_poller(self, intervals, budget=100):
+        return QuotePoller(
+            self.scraper, intervals, budget=budget, emit=self.emitted.append,
+            clock=self.clock, sleep=self.clock.sleep
+        )
+    
+    def fetched(self):
+        return [call.args[0] for call in self.scraper.scrape_stock_data.call_args_list]
+    
+    def test_symbols_refresh_at_their_own_interval(self):
+        poller = self.make_poller({'nike': 10, 'coca-cola-co': 30})
+        
+        poller.run(duration=59)
+        
+        fetched = self.fetched()
+        self.assertEqual(fetched.count('nike'), 6)
+        self.assertEqual(fetched.count('coca-cola-co'), 2)
+    
+    def test_only_changed_quotes_are_emitted(self):
+        prices = iter(['1.00', '1.00', '1.05', '1.05'])
+        self.scraper.scrape_stock_data.side_effect = lambda symbol: quote(symbol, next(prices))
+        poller = self.make_poller({'nike': 10})
+        
+        poller.run(duration=35)
+        
+        self.assertEqual([record['current_price'] for record in self.emitted], ['1.00', '1.05'])
+        self.assertEqual(poller.lag_report()['symbols']['nike']['changes'], 2)
+    
+    def test_indicators_update_on_every_fetch(self):
+        prices = iter(['1.00', '1.00', '1.06', '1.06'])
+        self.scraper.scrape_stock_data.side_effect = lambda symbol: quote(symbol, next(prices))
+        poller = QuotePoller(
+            self.scraper, {'nike': 10}, emit=self.emitted.append, indicators=IndicatorEngine({'sma': (3,)}),
+            clock=self.clock, sleep=self.clock.sleep
+        )
+        
+        poller.run(duration=35)
+        
+        self.assertEqual([record.get('sma_3') for record in self.emitted], [None, 1.02])
+    
+    def test_bars_update_on_every_fetch(self):
+        prices = iter(['1.00', '1.00', '1.06', '1.02'])
+        times = iter(['2025-05-08T14:00:05', '2025-05-08T14:00:15', '2025-05-08T14:00:25', '2025-05-08T14:00:35'])
+        self.scraper.scrape_stock_data.side_effect = lambda symbol: [dict(quote(symbol, next(prices))[0], timestamp=next(times))]
+        bars = BarAggregator(['1m'])
+        poller = QuotePoller(
+            self.scraper, {'nike': 10}, emit=self.emitted.append, bars=bars,
+            clock=self.clock, sleep=self.clock.sleep
+        )
+        
+        poller.run(duration=35)
+        
+        bar = bars.current('nike')['1m']
+        self.assertEqual((bar['open'], bar['high'], bar['low'], bar['close'], bar['ticks']), (1.0, 1.06, 1.0, 1.02, 4))
+    
+    def test_budget_caps_fetch_rate_and_stalest_goes_first(self):
+        intervals = {f'stock-{i}': 1 for i in range(5)}
+        poller = self.make_poller(intervals, budget=1)
+        
+        poller.run(duration=10)
+        
+        fetched = self.fetched()
+        self.assertLessEqual(len(fetched), 11)
+        self.assertEqual(fetched[:10], [f'stock-{i}' for i in range(5)] * 2)
+        
+        report = poller.lag_report()
+        self.assertEqual(report['required_rate'], 5)
+        self.assertEqual(report['budget'], 1)
+        self.assertGreater(report['symbols']['stock-0']['max_lag'], 3)
+    
+    def test_failures_are_counted_and_rescheduled(self):
+        self.scraper.scrape_stock_data.side_effect = ValueError('parse failure')
+        poller = self.make_poller({'nike': 10})
+        
+        poller.run(duration=25)
+        
+        stats = poller.lag_report()['symbols']['nike']
+        self.assertEqual(stats['fetches'], 3)
+        self.assertEqual(stats['errors'], 3)
+        self.assertEqual(self.emitted, [])
+    
+    def test_removed_symbols_are_not_fetched(self):
+        poller = self.make_poller({'nike': 10, 'coca-cola-co': 10})
+        poller.remove_symbol('coca-cola-co')
+        
+        poller.run(duration=25)
+        
+        self.assertEqual(self.fetched(), ['nike', 'nike', 'nike'])
+        self.assertEqual(list(poller.lag_report()['symbols']), ['nike'])
+
+
+if __name__ == '__main__':
+    unittest.main()
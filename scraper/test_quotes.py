@@ -0,0 +1,136 @@
+import unittest
+import io
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from data_processor import DataProcessor
+from poller import QuotePoller
+from quotes import Quote, QuoteBatch
+from scraper import StockScraper
+from writers import write_parquet
+
+RECORDS = [
+    {'symbol': 'nike', 'company_name': 'Nike Inc (NKE)', 'current_price': '98.76', 'price_change': '+1.23', 'timestamp': '2025-05-08T20:00:00'},
+    {'symbol': 'nestle', 'company_name': 'Nestlé SA (NESN)', 'current_price': '1,234.50', 'price_change': '−0.50', 'timestamp': '2025-05-08T20:00:01.250000'},
+    {'symbol': 'nike', 'company_name': 'Nike Inc (NKE)', 'current_price': 'N/A', 'price_change': '(0.25)', 'timestamp': '2025-05-08T20:00:05'},
+]
+
+class TestQuoteBatch(unittest.TestCase):
+    """
+    Test cases for the Quote and QuoteBatch classes
+    """
+    
+    def test_prices_parsed_once_like_clean_data(self):
+        batch = QuoteBatch.from_records(RECORDS)
+        cleaned = DataProcessor().clean_data(RECORDS)
+        
+        self.assertEqual(len(batch), 3)
+        for quote, record in zip(batch, cleaned):
+            self.assertEqual(quote.current_price, record['current_price'])
+            self.assertEqual(quote.price_change, record['price_change'])
+        self.assertEqual(batch[1].timestamp, datetime(2025, 5, 8, 20, 0, 1, 250000))
+        self.assertEqual(batch[-1], Quote('nike', 'Nike Inc (NKE)', None, -0.25, datetime(2025, 5, 8, 20, 0, 5)))
+    
+    def test_offsets_become_utc_on_either_parse_path(self):
+        expected = [datetime(2025, 5, 8, 18), datetime(2025, 5, 8, 20, 30), datetime(2025, 5, 8, 20), None]
+        fast = ['2025-05-08T20:00:00+02:00', '2025-05-08T15:30:00-05:00', '2025-05-08T20:00:00', None]
+        # The basic ISO format only parses value by value
+        fallback = ['20250508T200000+0200', '2025-05-08T15:30:00-05:00', '2025-05-08T20:00:00', None]
+        
+        for timestamps in (fast, fallback):
+            with self.subTest(first=timestamps[0]):
+                batch = QuoteBatch.from_records([{'symbol': 'nike', 'timestamp': value} for value in timestamps])
+                self.assertEqual([quote.timestamp for quote in batch], expected)
+    
+    def test_symbols_are_interned(self):
+        batch = QuoteBatch.from_records(RECORDS)
+        
+        self.assertEqual(batch.symbols, ['nike', 'nestle'])
+        self.assertEqual(batch.column('symbol').tolist(), [0, 1, 0])
+        self.assertIs(batch[0].symbol, batch[2].symbol)
+    
+    def test_grows_past_capacity(self):
+        batch = QuoteBatch(capacity=2)
+        for _ in range(5):
+            batch.extend(RECORDS)
+        batch.append(Quote('nike', current_price=99.0, timestamp=datetime(2025, 5, 8, 21)))
+        
+        self.assertEqual(len(batch), 16)
+        self.assertEqual(batch[15].current_price, 99.0)
+        self.assertEqual(batch.column('current_price')[:2].tolist(), [98.76, 1234.5])
+        self.assertLessEqual(batch.nbytes, 28 * 16 * 2)
+    
+    def test_to_records_round_trip(self):
+        batch = QuoteBatch.from_records(RECORDS)
+        
+        self.assertEqual(QuoteBatch.from_records(batch.to_records()).to_records(), batch.to_records())
+        self.assertEqual(batch.to_records()[0], {
+            'symbol': 'nike', 'company_name': 'Nike Inc (NKE)', 'current_price': 98.76,
+            'price_change': 1.23, 'timestamp': '2025-05-08T20:00:00',
+        })
+    
+    def test_to_dataframe_shares_buffers(self):
+        batch = QuoteBatch.from_records(RECORDS)
+        df = batch.to_dataframe()
+        
+        self.assertEqual(list(df.columns), ['symbol', 'company_name', 'current_price', 'price_change', 'timestamp'])
+        self.assertEqual(str(df['symbol'].dtype), 'category')
+        self.assertEqual(df['company_name'].tolist(), ['Nike Inc (NKE)', 'Nestlé SA (NESN)', 'Nike Inc (NKE)'])
+        self.assertTrue(np.shares_memory(df['current_price'].to_numpy(), batch.column('current_price')))
+        self.assertTrue(np.shares_memory(df['timestamp'].to_numpy(), batch.column('timestamp')))
+    
+    def test_process_data_accepts_a_batch(self):
+        df = DataProcessor().process_data(QuoteBatch.from_records(RECORDS))
+        
+        self.assertEqual(len(df), 3)
+        self.assertIn('processed_at', df.columns)
+        self.assertAlmostEqual(df['percent_change'].iloc[0], 1.23 / (98.76 - 1.23) * 100)
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_write_parquet_accepts_a_batch(self):
+        buffer = io.BytesIO()
+        count = write_parquet(QuoteBatch.from_records(RECORDS), buffer)
+        table = pq.read_table(pa.BufferReader(buffer.getvalue()))
+        
+        self.assertEqual(count, 3)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field('symbol').type))
+        self.assertEqual(table.column('current_price').to_pylist(), [98.76, 1234.5, None])
+        self.assertEqual(table.column('timestamp').type, pa.timestamp('us'))
+    
+    def test_scrape_quote_batch(self):
+        scraper = StockScraper()
+        
+        with patch.object(scraper, 'iter_stock_data', return_value=iter(RECORDS)) as iter_stock_data:
+            batch = scraper.scrape_quote_batch(['nike', 'nestle'], concurrency=2)
+        
+        iter_stock_data.assert_called_once_with(['nike', 'nestle'], concurrency=2)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.symbols, ['nike', 'nestle'])
+    
+    def test_poller_keeps_ticks(self):
+        scraper = MagicMock()
+        scraper.scrape_stock_data.return_value = [RECORDS[0]]
+        now = [0.0]
+        ticks = QuoteBatch()
+        poller = QuotePoller(scraper, {'nike': 10}, ticks=ticks, clock=lambda: now[0], sleep=lambda seconds: None)
+        
+        poller.poll_once()
+        
+        self.assertEqual(len(ticks), 1)
+        self.assertEqual(ticks[0].current_price, 98.76)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import requests
+from unittest.mock import patch, MagicMock
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import rate_limiter
+from rate_limiter import AdaptiveRateLimiter, get_rate_limiter, is_throttle_status, parse_retry_after
+from scraper import StockScraper, close_sessions
+
+class FakeClock:
+    """
+    A manually advanced clock whose sleep moves time forward
+    """
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """
+    Test cases for the AdaptiveRateLimiter class
+    """
+    
+    def setUp(self):
+        self.clock = FakeClock()
+    
+    def make_limiter(self, **kwargs):
+        return AdaptiveRateLimiter(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+    
+    def test_acquire_paces_requests(self):
+        limiter = self.make_limiter(initial_rate=4.0)
+        
+        for _ in range(5):
+            limiter.acquire()
+        
+        self.assertAlmostEqual(self.clock.now, 1.0)
+    
+    def test_success_increases_rate_additively(self):
+        limiter = self.make_limiter(initial_rate=2.0, increase=0.5)
+        
+        limiter.record_success()
+        
+        self.assertAlmostEqual(limiter.rate, 2.25)
+    
+    def test_rate_is_capped(self):
+        limiter = self.make_limiter(initial_rate=2.0, max_rate=2.5, increase=5.0)
+        
+        limiter.record_success()
+        
+        self.assertEqual(limiter.rate, 2.5)
+    
+    def test_throttle_decreases_rate_once_per_cooldown(self):
+        limiter = self.make_limiter(initial_rate=8.0, decrease_factor=0.5, decrease_cooldown=1.0)
+        
+        limiter.record_throttle()
+        limiter.record_throttle()
+        self.assertEqual(limiter.rate, 4.0)
+        
+        self.clock.now += 1.5
+        limiter.record_throttle()
+        self.assertEqual(limiter.rate, 2.0)
+        self.assertEqual(limiter.stats()['throttles'], 3)
+    
+    def test_rate_has_floor(self):
+        limiter = self.make_limiter(initial_rate=0.3, min_rate=0.2, decrease_cooldown=0)
+        
+        limiter.record_throttle()
+        limiter.record_throttle()
+        
+        self.assertEqual(limiter.rate, 0.2)
+    
+    def test_retry_after_blocks_callers(self):
+        limiter = self.make_limiter(initial_rate=10.0)
+        limiter.record_throttle(retry_after=30)
+        
+        self.assertAlmostEqual(limiter.stats()['blocked_for'], 30)
+        limiter.acquire()
+        
+        self.assertGreaterEqual(self.clock.now, 30)
+
+
+class TestRateLimitHelpers(unittest.TestCase):
+    """
+    Test cases for the rate limiter helper functions
+    """
+    
+    def tearDown(self):
+        rate_limiter.reset_rate_limiters()
+    
+    def test_is_throttle_status(self):
+        self.assertTrue(is_throttle_status(429))
+        self.assertTrue(is_throttle_status(403))
+        self.assertTrue(is_throttle_status(503))
+        self.assertFalse(is_throttle_status(200))
+        self.assertFalse(is_throttle_status(404))
+    
+    def test_parse_retry_after(self):
+        now = datetime(2025, 5, 8, 21, 30, tzinfo=timezone.utc)
+        
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after('Thu, 08 May 2025 21:31:00 GMT', now=now), 60.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+    
+    def test_limiters_are_shared_per_host(self):
+        self.assertIs(get_rate_limiter('www.investing.com'), get_rate_limiter('www.investing.com'))
+        self.assertIsNot(get_rate_limiter('www.investing.com'), get_rate_limiter('api.scraperapi.com'))
+
+
+class TestStockScraperRateLimiting(unittest.TestCase):
+    """
+    Test cases for StockScraper requests under the shared rate limiter
+    """
+    
+    def tearDown(self):
+        rate_limiter.reset_rate_limiters()
+        close_sessions()
+    
+    @patch('scraper.requests.Session.get')
+    def test_throttling_response_cuts_rate(self, mock_get):
+        response = MagicMock(status_code=429, headers={'Retry-After': '0'})
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError('429 Too Many Requests')
+        mock_get.return_value = response
+        
+        limiter = get_rate_limiter('www.investing.com')
+        initial_rate = limiter.rate
+        
+        with self.assertRaises(requests.exceptions.HTTPError):
+            StockScraper(rate_limit=True)._get_page_content('https://www.investing.com/equities/nike')
+        
+        self.assertLess(limiter.rate, initial_rate)
+        self.assertEqual(limiter.stats()['throttles'], 1)
+    
+    @patch('scraper.requests.Session.get')
+    def test_success_grows_rate(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, text='<html></html>', headers={})
+        
+        limiter = get_rate_limiter('www.investing.com')
+        initial_rate = limiter.rate
+        
+        StockScraper(rate_limit=True)._get_page_content('https://www.investing.com/equities/nike')
+        
+        self.assertGreater(limiter.rate, initial_rate)
+        self.assertEqual(limiter.stats()['successes'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
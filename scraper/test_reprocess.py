@@ -0,0 +1,186 @@
+import unittest
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+import pandas as pd
+
+try:
+    from moto import mock_aws
+except ImportError:
+    from moto import mock_s3 as mock_aws
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+import readers
+from data_processor import DataProcessor
+from indicators import ChunkedIndicators, compute_indicators
+from readers import infer_format, read_chunks
+from reprocess import frame_records, reprocess
+from s3_manager import S3Manager
+
+WINDOWS = {'sma': (3,), 'ema': (4,), 'rsi': (3,)}
+
+def stored_quotes(days=20):
+    records = []
+    for day in range(1, days + 1):
+        for hour, symbol, base in [(15, 'nike', 98.0), (15, 'nestle', 1234.0), (20, 'nike', 99.0), (20, 'nestle', 1200.0)]:
+            records.append({
+                'symbol': symbol,
+                'current_price': f'{base + day * 0.37 + hour:,.2f}',
+                'price_change': f'{(day % 5) - 2:+.2f}',
+                'timestamp': f'2025-03-{day:02d}T{hour}:00:00',
+            })
+    return records
+
+class TestReaders(unittest.TestCase):
+    """
+    Test cases for reading stored data in chunks
+    """
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.records = stored_quotes()
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+    
+    def test_infer_format(self):
+        self.assertEqual(infer_format('data/quotes.json'), ('json', None))
+        self.assertEqual(infer_format('quotes.ndjson.gz'), ('json', 'gzip'))
+        self.assertEqual(infer_format('quotes.CSV.zst'), ('csv', 'zstd'))
+        with self.assertRaises(ValueError):
+            infer_format('quotes.txt')
+    
+    def test_json_array_records_split_across_reads(self):
+        with open(self.path('quotes.json'), 'w') as f:
+            json.dump(self.records, f)
+        
+        with patch.object(readers, 'JSON_READ_SIZE', 7):
+            chunks = list(read_chunks(self.path('quotes.json'), chunk_size=30))
+        
+        self.assertEqual([len(chunk) for chunk in chunks], [30, 30, 20])
+        self.assertEqual(sum(chunks, []), self.records)
+    
+    def test_compressed_ndjson(self):
+        with gzip.open(self.path('quotes.ndjson.gz'), 'wt') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in self.records))
+        
+        chunks = list(read_chunks(self.path('quotes.ndjson.gz'), chunk_size=50))
+        
+        self.assertEqual(sum(chunks, []), self.records)
+    
+    def test_csv_from_a_stream(self):
+        content = pd.DataFrame(self.records).to_csv(index=False).encode('utf-8')
+        
+        chunks = list(read_chunks(io.BytesIO(content), file_format='csv', chunk_size=64))
+        
+        self.assertEqual([len(chunk) for chunk in chunks], [64, 16])
+        self.assertEqual(chunks[0][0], self.records[0])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_parquet_from_an_unseekable_stream(self):
+        buffer = io.BytesIO()
+        pq.write_table(pa.Table.from_pylist(self.records), buffer, row_group_size=25)
+        stream = io.BufferedReader(io.BytesIO(buffer.getvalue()))
+        stream.seekable = lambda: False
+        
+        chunks = list(read_chunks(stream, file_format='parquet', chunk_size=10))
+        
+        self.assertTrue(all(len(chunk) <= 10 for chunk in chunks))
+        self.assertEqual(sum(chunks, []), self.records)
+
+class TestReprocess(unittest.TestCase):
+    """
+    Test cases for chunked reprocessing of stored data
+    """
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        records = stored_quotes()
+        # Stored as two files, each in time order
+        self.sources = []
+        for index, part in enumerate((records[:44], records[44:])):
+            path = os.path.join(self.temp_dir.name, f'quotes-{index}.json')
+            with open(path, 'w') as f:
+                json.dump(part, f)
+            self.sources.append(path)
+        self.records = records
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_chunks_match_processing_everything_at_once(self):
+        processor = DataProcessor()
+        output = os.path.join(self.temp_dir.name, 'out.ndjson')
+        
+        count = reprocess(self.sources, output, start_date='2025-03-03', chunk_size=7,
+                          indicators=ChunkedIndicators(WINDOWS, price_column='current_price'))
+        with open(output) as f:
+            result = pd.DataFrame([json.loads(line) for line in f])
+        expected = compute_indicators(processor.process_data(self.records, start_date='2025-03-03'),
+                                      price_column='current_price', windows=WINDOWS)
+        
+        self.assertEqual(count, len(expected))
+        result = result.sort_values(['symbol', 'timestamp'], kind='stable').reset_index(drop=True)
+        self.assertEqual(result['timestamp'].iloc[0], '2025-03-03T15:00:00')
+        for column in ('current_price', 'percent_change', 'sma_3', 'ema_4', 'rsi_3'):
+            np.testing.assert_allclose(result[column].astype(float), expected[column], rtol=1e-9, err_msg=column)
+    
+    def test_csv_keeps_going_when_later_sources_add_columns(self):
+        with_volume = os.path.join(self.temp_dir.name, 'quotes-volume.json')
+        with open(with_volume, 'w') as f:
+            json.dump([dict(record, volume='1.2M') for record in self.records[:8]], f)
+        output = os.path.join(self.temp_dir.name, 'out.csv')
+        
+        with self.assertLogs('writers', level='WARNING') as logs:
+            count = reprocess([self.sources[0], with_volume], output, chunk_size=10)
+        with open(output) as f:
+            result = pd.read_csv(f)
+        
+        self.assertEqual(count, 52)
+        self.assertEqual(len(result), 52)
+        self.assertNotIn('volume', result.columns)
+        self.assertIn('volume', logs.output[0])
+    
+    def test_frame_records_serialize(self):
+        df = DataProcessor().process_data(self.records[:2])
+        
+        records = frame_records(df)
+        
+        self.assertEqual(records[0]['timestamp'], '2025-03-01T15:00:00')
+        self.assertEqual(json.loads(json.dumps(records))[1]['current_price'], 1249.37)
+    
+    @mock_aws
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_reprocess_s3_objects(self):
+        s3_manager = S3Manager('test-reprocess-bucket')
+        for index, source in enumerate(self.sources):
+            with open(source) as f:
+                s3_manager.upload_data(json.load(f), f'data/quotes-{index}.json')
+        
+        count = reprocess(['data/quotes-0.json', 'data/quotes-1.json', 'data/missing.json'],
+                          'reprocessed/quotes.parquet', chunk_size=16, s3_manager=s3_manager)
+        table = pq.read_table(pa.BufferReader(s3_manager.download_data('reprocessed/quotes.parquet')))
+        
+        self.assertEqual(count, len(self.records))
+        self.assertEqual(table.num_rows, len(self.records))
+        self.assertEqual(table.schema.field('timestamp').type, pa.timestamp('us'))
+
+
+if __name__ == '__main__':
+    unittest.main()
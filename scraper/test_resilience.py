@@ -0,0 +1,142 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from resilience import CircuitBreaker, RetryPolicy, is_transient_error
+from scraper import StockScraper
+
+def http_error(status_code):
+    response = MagicMock(status_code=status_code)
+    return requests.exceptions.HTTPError(f"{status_code} error", response=response)
+
+class TestRetryPolicy(unittest.TestCase):
+    """
+    Test cases for the RetryPolicy class
+    """
+    
+    def setUp(self):
+        self.sleeps = []
+        self.policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=3.0,
+                                  sleep=self.sleeps.append, random_fn=lambda: 0.5)
+    
+    def test_is_transient_error(self):
+        self.assertTrue(is_transient_error(requests.exceptions.ConnectionError()))
+        self.assertTrue(is_transient_error(requests.exceptions.Timeout()))
+        self.assertTrue(is_transient_error(http_error(429)))
+        self.assertTrue(is_transient_error(http_error(502)))
+        self.assertFalse(is_transient_error(http_error(404)))
+        self.assertFalse(is_transient_error(AttributeError()))
+    
+    def test_backoff_is_jittered_and_capped(self):
+        self.assertEqual(self.policy.backoff(1), 0.5)
+        self.assertEqual(self.policy.backoff(2), 1.0)
+        self.assertEqual(self.policy.backoff(5), 1.5)
+    
+    def test_retries_transient_errors_until_success(self):
+        func = MagicMock(side_effect=[requests.exceptions.Timeout(), http_error(503), 'ok'])
+        retries = []
+        
+        result = self.policy.call(func, 'nike', on_retry=lambda attempt, error: retries.append(attempt))
+        
+        self.assertEqual(result, 'ok')
+        self.assertEqual(retries, [1, 2])
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+    
+    def test_gives_up_after_max_attempts(self):
+        func = MagicMock(side_effect=requests.exceptions.ConnectionError())
+        
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.policy.call(func)
+        
+        self.assertEqual(func.call_count, 3)
+    
+    def test_does_not_retry_permanent_errors(self):
+        func = MagicMock(side_effect=http_error(404))
+        
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.policy.call(func)
+        
+        func.assert_called_once()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Test cases for the CircuitBreaker class
+    """
+    
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(failure_threshold=2, cooldown=60, clock=lambda: self.now)
+    
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure('broken')
+        self.assertTrue(self.breaker.allow('broken'))
+        
+        self.breaker.record_failure('broken')
+        
+        self.assertFalse(self.breaker.allow('broken'))
+        self.assertEqual(self.breaker.state('broken'), 'open')
+        self.assertEqual(self.breaker.open_keys(), ['broken'])
+    
+    def test_success_resets_failures(self):
+        self.breaker.record_failure('nike')
+        self.breaker.record_success('nike')
+        self.breaker.record_failure('nike')
+        
+        self.assertEqual(self.breaker.state('nike'), 'closed')
+    
+    def test_half_open_allows_single_trial(self):
+        self.breaker.record_failure('broken')
+        self.breaker.record_failure('broken')
+        self.now = 61
+        
+        self.assertEqual(self.breaker.state('broken'), 'half-open')
+        self.assertTrue(self.breaker.allow('broken'))
+        self.assertFalse(self.breaker.allow('broken'))
+        
+        self.breaker.record_failure('broken')
+        self.assertEqual(self.breaker.state('broken'), 'open')
+
+
+class TestStockScraperResilience(unittest.TestCase):
+    """
+    Test cases for retries, circuit breaking and batch summaries in StockScraper
+    """
+    
+    def test_batch_summary_reports_retried_skipped_and_failed(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+        breaker.record_failure('delisted')
+        policy = RetryPolicy(max_attempts=2, sleep=lambda seconds: None)
+        scraper = StockScraper(retry_policy=policy, circuit_breaker=breaker)
+        
+        attempts = {}
+        
+        def fake_scrape(symbol):
+            attempts[symbol] = attempts.get(symbol, 0) + 1
+            if symbol == 'flaky' and attempts[symbol] == 1:
+                raise requests.exceptions.Timeout()
+            if symbol == 'broken':
+                raise AttributeError("'NoneType' object has no attribute 'text'")
+            return [{'symbol': symbol}]
+        
+        with patch.object(scraper, 'scrape_stock_data', side_effect=fake_scrape):
+            result = scraper.scrape_multiple_stocks(['nike', 'flaky', 'broken', 'delisted'])
+        
+        self.assertEqual([item['symbol'] for item in result], ['nike', 'flaky'])
+        self.assertEqual(scraper.batch_summary.to_dict(), {
+            'succeeded': 2,
+            'retried': ['flaky'],
+            'skipped': ['delisted'],
+            'failed': ['broken'],
+        })
+        self.assertNotIn('delisted', attempts)
+        self.assertEqual(breaker.state('broken'), 'open')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from response_cache import ResponseCache
+from scraper import StockScraper
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Test cases for the ResponseCache class
+    """
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_put_and_get_fresh_entry(self):
+        cache = ResponseCache(self.cache_dir, ttl=60)
+        
+        cache.put('https://example.com/a', '<html>a</html>', etag='"abc"')
+        entry = cache.get('https://example.com/a')
+        
+        self.assertTrue(entry['fresh'])
+        self.assertEqual(entry['body'], '<html>a</html>')
+        self.assertEqual(entry['etag'], '"abc"')
+        self.assertEqual(cache.stats()['hits'], 1)
+    
+    def test_expired_entry_is_stale_miss(self):
+        cache = ResponseCache(self.cache_dir, ttl=60)
+        cache.put('https://example.com/a', '<html>a</html>')
+        
+        with patch('response_cache.time.time', return_value=time.time() + 120):
+            entry = cache.get('https://example.com/a')
+        
+        self.assertFalse(entry['fresh'])
+        self.assertEqual(cache.stats()['misses'], 1)
+    
+    def test_missing_entry_is_miss(self):
+        cache = ResponseCache(self.cache_dir)
+        
+        self.assertIsNone(cache.get('https://example.com/missing'))
+        self.assertEqual(cache.stats()['misses'], 1)
+    
+    def test_lru_eviction(self):
+        cache = ResponseCache(self.cache_dir, max_bytes=1000)
+        body = 'x' * 300
+        
+        cache.put('https://example.com/a', body)
+        cache.put('https://example.com/b', body)
+        cache.get('https://example.com/a')
+        cache.put('https://example.com/c', body)
+        
+        self.assertIsNotNone(cache.get('https://example.com/a'))
+        self.assertIsNone(cache.get('https://example.com/b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertLessEqual(cache.stats()['bytes'], 1000)
+    
+    def test_index_survives_restart(self):
+        ResponseCache(self.cache_dir).put('https://example.com/a', '<html>a</html>')
+        
+        cache = ResponseCache(self.cache_dir)
+        
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertEqual(cache.get('https://example.com/a')['body'], '<html>a</html>')
+
+
+class TestStockScraperWithCache(unittest.TestCase):
+    """
+    Test cases for StockScraper page fetching through a ResponseCache
+    """
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.temp_dir.name, ttl=60)
+        self.url = 'https://www.investing.com/equities/nike'
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _response(self, status_code=200, text='', headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.text = text
+        response.headers = headers or {}
+        return response
+    
+    @patch('scraper.requests.Session.get')
+    def test_fresh_entry_skips_request(self, mock_get):
+        mock_get.return_value = self._response(text='<html>v1</html>')
+        scraper = StockScraper(cache=self.cache)
+        
+        scraper._get_page_content(self.url)
+        result = scraper._get_page_content(self.url)
+        
+        self.assertEqual(result, '<html>v1</html>')
+        mock_get.assert_called_once()
+    
+    @patch('scraper.requests.Session.get')
+    def test_stale_entry_is_revalidated(self, mock_get):
+        mock_get.return_value = self._response(
+            text='<html>v1</html>',
+            headers={'ETag': '"v1"', 'Last-Modified': 'Thu, 08 May 2025 21:30:00 GMT'}
+        )
+        scraper = StockScraper(cache=self.cache)
+        scraper._get_page_content(self.url)
+        
+        self.cache.ttl = 0
+        mock_get.return_value = self._response(status_code=304)
+        result = scraper._get_page_content(self.url)
+        
+        headers = mock_get.call_args[1]['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Thu, 08 May 2025 21:30:00 GMT')
+        self.assertEqual(result, '<html>v1</html>')
+        self.assertEqual(self.cache.stats()['revalidations'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,19 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import boto3
+import io
 import json
 import os
 import sys
+import pandas as pd
 from botocore.exceptions import ClientError
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from s3_manager import S3Manager
@@ -124,6 +132,56 @@ class TestS3Manager(unittest.TestCase):
         expected_uri = f"s3://{self.bucket_name}/{object_key}"
         self.assertEqual(result, expected_uri)
     
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_upload_data_parquet(self):
+        """Test upload_data method with Parquet format"""
+        test_data = pd.DataFrame(list(MOCK_STOCK_DATA.values()))
+        object_key = 'data/test_data.parquet'
+        
+        result = self.s3_manager.upload_data(test_data, object_key, file_format='parquet', row_group_size=2)
+        
+        call_args = self.mock_s3_client.put_object.call_args[1]
+        self.assertEqual(call_args['ContentType'], 'application/vnd.apache.parquet')
+        
+        parquet_file = pq.ParquetFile(io.BytesIO(call_args['Body']))
+        self.assertEqual(parquet_file.metadata.num_rows, len(test_data))
+        self.assertEqual(parquet_file.num_row_groups, (len(test_data) + 1) // 2)
+        self.assertTrue(pa.types.is_dictionary(parquet_file.schema_arrow.field('symbol').type))
+        self.assertEqual(result, f"s3://{self.bucket_name}/{object_key}")
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_upload_data_arrow(self):
+        """Test upload_data method with Arrow IPC format"""
+        test_data = list(MOCK_STOCK_DATA.values())
+        
+        self.s3_manager.upload_data(test_data, 'data/test_data.arrow', file_format='arrow')
+        
+        call_args = self.mock_s3_client.put_object.call_args[1]
+        self.assertEqual(call_args['ContentType'], 'application/vnd.apache.arrow.file')
+        table = pa.ipc.open_file(io.BytesIO(call_args['Body'])).read_all()
+        self.assertEqual(table.column('symbol').to_pylist(), [record['symbol'] for record in test_data])
+    
+    def test_download_data(self):
+        """Test download_data method"""
+        body = MagicMock()
+        body.read.return_value = b'{"key": "value"}'
+        self.mock_s3_client.get_object.return_value = {'Body': body}
+        
+        result = self.s3_manager.download_data('data/test_data.json')
+        
+        self.mock_s3_client.get_object.assert_called_once_with(
+            Bucket=self.bucket_name,
+            Key='data/test_data.json'
+        )
+        self.assertEqual(result, b'{"key": "value"}')
+    
+    def test_download_data_missing_object(self):
+        """Test download_data returns None for a missing object"""
+        error_response = {'Error': {'Code': 'NoSuchKey'}}
+        self.mock_s3_client.get_object.side_effect = ClientError(error_response, 'GetObject')
+        
+        self.assertIsNone(self.s3_manager.download_data('data/missing.json'))
+    
     def test_generate_presigned_url(self):
         """Test generate_presigned_url method"""
         expected_url = 'https://test-bucket.s3.amazonaws.com/test-object?signature=abc123'
@@ -1,22 +1,35 @@
+import asyncio
 import unittest
 from unittest.mock import patch, MagicMock
 import json
 import os
 import sys
+import tempfile
+import time
+from datetime import date
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from scraper import StockScraper
+import numpy as np
+import pandas as pd
+
+import scraper as scraper_module
+from scraper import StockScraper, close_sessions, get_session, parse_history_page, parse_listing_page, split_date_range
 from data_processor import DataProcessor
 from s3_manager import S3Manager
 from lambda_handler import lambda_handler
 
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
 class TestStockScraper(unittest.TestCase):
     """
     Test cases for the StockScraper class
     """
     
-    @patch('scraper.requests.get')
+    def tearDown(self):
+        close_sessions()
+    
+    @patch('scraper.requests.Session.get')
     def test_get_page_content(self, mock_get):
         mock_response = MagicMock()
         mock_response.text = '<html><body>Test HTML</body></html>'
@@ -30,6 +43,54 @@ class TestStockScraper(unittest.TestCase):
         self.assertEqual(result, '<html><body>Test HTML</body></html>')
         mock_get.assert_called_once()
     
+    def test_sessions_are_shared_per_host(self):
+        first = get_session('https://www.investing.com/equities/nike')
+        second = get_session('https://www.investing.com/equities/coca-cola-co')
+        other_host = get_session('http://api.scraperapi.com/')
+        
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_host)
+        self.assertEqual(first.get_adapter('https://www.investing.com/')._pool_maxsize, 10)
+    
+    @patch('scraper.requests.Session.get')
+    def test_get_page_content_reuses_session_across_scrapers(self, mock_get):
+        mock_get.return_value = MagicMock(text='<html></html>')
+        
+        StockScraper()._get_page_content('https://www.investing.com/equities/nike')
+        StockScraper()._get_page_content('https://www.investing.com/equities/nike')
+        
+        self.assertEqual(len(scraper_module._sessions), 1)
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('scraper.requests.Session.get')
+    def test_get_page_content_with_api_key_uses_scraperapi_pool(self, mock_get):
+        mock_get.return_value = MagicMock(text='<html></html>')
+        
+        StockScraper(api_key='key', pool_size=4)._get_page_content('https://www.investing.com/equities/nike')
+        
+        self.assertEqual(mock_get.call_args[0][0], 'http://api.scraperapi.com/')
+        self.assertIn(('http', 'api.scraperapi.com', 4), scraper_module._sessions)
+    
+    @patch('scraper.requests.Session.get')
+    def test_batches_size_the_pool_to_their_workers(self, mock_get):
+        mock_get.return_value = MagicMock(text='<html></html>')
+        scraper = StockScraper(pool_size=4)
+        
+        with patch.object(scraper_module, 'extract_quote_fast', return_value=('Nike Inc', '98.76', '+1.23')):
+            scraper.scrape_multiple_stocks(['nike', 'nestle'], concurrency=20)
+        
+        self.assertIn(('https', 'www.investing.com', 20), scraper_module._sessions)
+        self.assertNotIn(('https', 'www.investing.com', 4), scraper_module._sessions)
+    
+    def test_scrape_multiple_stocks_threaded_preserves_order(self):
+        scraper = StockScraper()
+        symbols = [f'stock-{i}' for i in range(10)]
+        
+        with patch.object(scraper, 'scrape_stock_data', side_effect=lambda symbol: [{'symbol': symbol}]):
+            result = scraper.scrape_multiple_stocks_threaded(symbols, max_workers=3)
+        
+        self.assertEqual([item['symbol'] for item in result], symbols)
+    
     @patch('scraper.StockScraper._get_page_content')
     @patch('scraper.BeautifulSoup')
     def test_scrape_stock_data(self, mock_bs, mock_get_content):
@@ -58,7 +119,213 @@ class TestStockScraper(unittest.TestCase):
         self.assertEqual(result[0]['company_name'], 'Test Company')
         self.assertEqual(result[0]['current_price'], '100.00')
         self.assertEqual(result[0]['price_change'], '+2.50')
-
+    
+    def test_scrape_multiple_stocks_async_preserves_order(self):
+        scraper = StockScraper()
+        
+        def fake_scrape(symbol):
+            if symbol == 'broken':
+                raise ValueError('parse failure')
+            return [{'symbol': symbol}]
+        
+        symbols = [f'stock-{i}' for i in range(20)]
+        symbols.insert(5, 'broken')
+        
+        with patch.object(scraper, 'scrape_stock_data', side_effect=fake_scrape):
+            result = scraper.scrape_multiple_stocks(symbols, concurrency=4)
+        
+        self.assertEqual([item['symbol'] for item in result], [s for s in symbols if s != 'broken'])
+    
+    def test_scrape_multiple_stocks_inside_running_loop(self):
+        scraper = StockScraper()
+        symbols = [f'stock-{i}' for i in range(6)]
+        
+        async def caller():
+            return scraper.scrape_multiple_stocks(symbols, concurrency=3)
+        
+        with patch.object(scraper, 'scrape_stock_data', side_effect=lambda symbol: [{'symbol': symbol}]):
+            result = asyncio.run(caller())
+        
+        self.assertEqual([item['symbol'] for item in result], symbols)
+    
+    def test_scrape_multiple_stocks_async_rejects_invalid_concurrency(self):
+        scraper = StockScraper()
+        
+        with self.assertRaises(ValueError):
+            asyncio.run(scraper.scrape_multiple_stocks_async(['nike'], concurrency=0))
+    
+    
+    def test_split_date_range(self):
+        shards = split_date_range(date(2025, 1, 1), date(2025, 1, 10), shard_days=4)
+        
+        self.assertEqual(shards, [
+            (date(2025, 1, 1), date(2025, 1, 4)),
+            (date(2025, 1, 5), date(2025, 1, 8)),
+            (date(2025, 1, 9), date(2025, 1, 10)),
+        ])
+    
+    def test_parse_history_page(self):
+        with open(os.path.join(FIXTURE_DIR, 'nike-historical-data.html')) as f:
+            history = parse_history_page(f.read(), 'nike')
+        
+        self.assertEqual(len(history), 49)
+        self.assertEqual(history[0]['date'], '2025-05-08')
+        self.assertEqual(set(history[0]), {
+            'symbol', 'date', 'open', 'high', 'low', 'close', 'volume', 'change_percent', 'timestamp'
+        })
+        self.assertTrue(history[0]['volume'].endswith('M'))
+    
+    def test_scrape_historical_data_merges_shards(self):
+        with open(os.path.join(FIXTURE_DIR, 'nike-historical-data.html')) as f:
+            page = f.read()
+        
+        scraper = StockScraper()
+        with patch.object(scraper, '_get_page_content', return_value=page) as mock_get:
+            history = scraper.scrape_historical_data('nike', '2025-03-10', '2025-04-30', shard_days=10)
+        
+        dates = [row['date'] for row in history]
+        self.assertEqual(mock_get.call_count, 6)
+        self.assertEqual(dates, sorted(set(dates)))
+        self.assertEqual(dates[0], '2025-03-10')
+        self.assertEqual(dates[-1], '2025-04-30')
+        self.assertEqual(len(dates), 38)
+    
+    def test_scrape_stock_data_with_dates_returns_history(self):
+        scraper = StockScraper()
+        
+        with patch.object(scraper, 'scrape_historical_data', return_value=[{'date': '2025-01-02'}]) as mock_history:
+            result = scraper.scrape_stock_data('nike', '2025-01-01', '2025-01-31')
+        
+        mock_history.assert_called_once_with('nike', '2025-01-01', '2025-01-31')
+        self.assertEqual(result, [{'date': '2025-01-02'}])
+    
+    def test_iter_stock_data_yields_in_completion_order(self):
+        scraper = StockScraper()
+        delays = {'slow': 0.2, 'medium': 0.1, 'fast': 0.0, 'broken': 0.0}
+        
+        def fake_scrape(symbol):
+            time.sleep(delays[symbol])
+            if symbol == 'broken':
+                raise ValueError('parse failure')
+            return [{'symbol': symbol}]
+        
+        with patch.object(scraper, 'scrape_stock_data', side_effect=fake_scrape):
+            result = [item['symbol'] for item in scraper.iter_stock_data(['slow', 'medium', 'broken', 'fast'], concurrency=4)]
+        
+        self.assertEqual(result, ['fast', 'medium', 'slow'])
+        self.assertEqual(scraper.batch_summary.to_dict()['failed'], ['broken'])
+    
+    def test_iter_stock_data_bounds_in_flight_symbols(self):
+        scraper = StockScraper()
+        consumed = []
+        
+        def symbols():
+            for i in range(10):
+                consumed.append(i)
+                yield f'stock-{i}'
+        
+        with patch.object(scraper, 'scrape_stock_data', side_effect=lambda symbol: [{'symbol': symbol}]):
+            stream = scraper.iter_stock_data(symbols(), concurrency=2)
+            next(stream)
+            self.assertLessEqual(len(consumed), 3)
+            rest = list(stream)
+        
+        self.assertEqual(len(rest), 9)
+    
+    def test_stream_writers(self):
+        scraper = StockScraper()
+        records = ({'symbol': f'stock-{i}', 'current_price': str(i)} for i in range(3))
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'out.csv')
+            ndjson_path = os.path.join(temp_dir, 'out.ndjson')
+            
+            self.assertEqual(scraper.stream_to_csv(records, csv_path), 3)
+            self.assertEqual(scraper.stream_to_ndjson([{'symbol': 'nike'}, {'symbol': 'ko'}], ndjson_path), 2)
+            
+            with open(csv_path) as f:
+                self.assertEqual(f.read().splitlines(), ['symbol,current_price', 'stock-0,0', 'stock-1,1', 'stock-2,2'])
+            with open(ndjson_path) as f:
+                self.assertEqual([json.loads(line) for line in f], [{'symbol': 'nike'}, {'symbol': 'ko'}])
+    
+    def test_scrape_multiple_stocks_pipelined(self):
+        with open(os.path.join(FIXTURE_DIR, 'nike.html')) as f:
+            nike_html = f.read()
+        with open(os.path.join(FIXTURE_DIR, 'coca-cola-co.html')) as f:
+            coca_cola_html = f.read()
+        pages = {
+            'https://www.investing.com/equities/nike': nike_html,
+            'https://www.investing.com/equities/coca-cola-co': coca_cola_html,
+            'https://www.investing.com/equities/broken': '<html><body></body></html>',
+        }
+        
+        for parse_workers in (0, 2):
+            with self.subTest(parse_workers=parse_workers):
+                scraper = StockScraper()
+                with patch.object(scraper, '_get_page_content', side_effect=pages.get) as mock_get_page_content:
+                    result = scraper.scrape_multiple_stocks_pipelined(
+                        ['nike', 'broken', 'coca-cola-co', 'nike'], parse_workers=parse_workers, batch_size=2
+                    )
+                
+                self.assertEqual(mock_get_page_content.call_count, 3)
+                self.assertEqual([item['symbol'] for item in result], ['nike', 'coca-cola-co', 'nike'])
+                self.assertEqual(result[0]['current_price'], '98.76')
+                self.assertIsNot(result[0], result[2])
+                self.assertEqual(scraper.batch_summary.to_dict()['failed'], ['broken'])
+    
+    def test_parse_listing_page(self):
+        with open(os.path.join(FIXTURE_DIR, 'listing-united-states.html')) as f:
+            quotes = parse_listing_page(f.read(), timestamp='2025-05-08T20:00:00')
+        
+        self.assertEqual(sorted(quotes), ['apple-computer-inc', 'coca-cola-co', 'microsoft-corp', 'nike'])
+        self.assertEqual(quotes['nike'], {
+            'symbol': 'nike',
+            'company_name': 'Nike',
+            'current_price': '98.76',
+            'price_change': '+1.23',
+            'timestamp': '2025-05-08T20:00:00',
+        })
+        self.assertEqual(quotes['microsoft-corp']['current_price'], '3,456.78')
+    
+    def test_scrape_from_listings_falls_back_for_missing_symbols(self):
+        with open(os.path.join(FIXTURE_DIR, 'listing-united-states.html')) as f:
+            listing_html = f.read()
+        with open(os.path.join(FIXTURE_DIR, 'delisted-holdings.html')) as f:
+            delisted_html = f.read()
+        pages = {
+            'https://www.investing.com/equities/united-states': listing_html,
+            'https://www.investing.com/equities/delisted-holdings': delisted_html,
+        }
+        scraper = StockScraper()
+        
+        with patch.object(scraper, '_get_page_content', side_effect=pages.get) as mock_get_page_content:
+            result = scraper.scrape_from_listings(
+                ['nike', 'delisted-holdings', 'coca-cola-co', 'nike'],
+                listing_urls=['https://www.investing.com/equities/united-states'],
+                concurrency=1
+            )
+        
+        self.assertEqual(
+            [call.args[0] for call in mock_get_page_content.call_args_list],
+            ['https://www.investing.com/equities/united-states', 'https://www.investing.com/equities/delisted-holdings']
+        )
+        self.assertEqual([item['symbol'] for item in result], ['nike', 'delisted-holdings', 'coca-cola-co', 'nike'])
+        self.assertEqual(result[1]['company_name'], 'Delisted Holdings (DLH)')
+        self.assertEqual(scraper.batch_summary.to_dict()['succeeded'], 3)
+    
+    def test_scrape_from_listings_stops_once_all_symbols_found(self):
+        with open(os.path.join(FIXTURE_DIR, 'listing-united-states.html')) as f:
+            listing_html = f.read()
+        scraper = StockScraper()
+        
+        with patch.object(scraper, '_get_page_content', return_value=listing_html) as mock_get_page_content:
+            result = scraper.scrape_from_listings(
+                ['nike', 'apple-computer-inc'],
+                listing_urls=['https://www.investing.com/equities/united-states', 'https://www.investing.com/indices/us-spx-500-components']
+            )
+        
+        mock_get_page_content.assert_called_once_with('https://www.investing.com/equities/united-states')
+        self.assertEqual([item['current_price'] for item in result], ['98.76', '211.45'])
 
 class TestDataProcessor(unittest.TestCase):
     """
@@ -76,6 +343,65 @@ class TestDataProcessor(unittest.TestCase):
         self.assertIsNone(processor._clean_price('N/A'))
         self.assertIsNone(processor._clean_price(''))
     
+    def test_clean_price_unicode_minus(self):
+        processor = DataProcessor()
+        
+        self.assertEqual(processor._clean_price('\u22125.25'), -5.25)
+        self.assertEqual(processor._clean_price('\u20131.50%'), -1.5)
+    
+    def test_clean_price_passes_numbers_through(self):
+        processor = DataProcessor()
+        
+        self.assertEqual(processor._clean_price(98.76), 98.76)
+        self.assertEqual(processor._clean_price(0.0), 0.0)
+        self.assertIsNone(processor._clean_price(float('nan')))
+        self.assertEqual(processor._clean_volume(1500), 1500.0)
+        self.assertEqual(processor.clean_data([{'symbol': 'NKE', 'current_price': 98.76}])[0]['current_price'], 98.76)
+    
+    def test_clean_price_column_matches_clean_price(self):
+        processor = DataProcessor()
+        values = [
+            '$100.00', '$1,234.56', '+10.5%', '-5.25', '(2.75)', '\u22120.50', '1 234.5',
+            'N/A', '', '-', '(3', 'abc', '1e3', '.5', '1_000', 'inf',
+        ]
+        
+        for column in (values, values[:5], ['N/A', ''], [], ['98.76', None], ['98.76', 12.5], ['1\n2']):
+            with self.subTest(column=column):
+                try:
+                    expected = [processor._clean_price(value) for value in column]
+                except AttributeError:
+                    with self.assertRaises(AttributeError):
+                        processor.clean_price_column(column)
+                    continue
+                self.assertEqual(processor.clean_price_column(column), expected)
+    
+    def test_clean_data_matches_iter_clean_data(self):
+        processor = DataProcessor()
+        test_data = [
+            {'symbol': 'AAPL', 'current_price': '$150.25', 'price_change': '+2.75', 'volume': '7.81M'},
+            {'symbol': 'MSFT', 'current_price': 'N/A', 'price_change': '(1.25)'},
+            {'symbol': 'NKE', 'current_price': '98.76', 'price_change': '\u22121.23', 'open': '97.50'},
+            {'symbol': 'BAD', 'current_price': ['98.76'], 'price_change': '+0.10'},
+        ]
+        
+        def without_processed_at(records):
+            return [{key: value for key, value in record.items() if key != 'processed_at'} for record in records]
+        
+        expected = without_processed_at(processor.iter_clean_data(test_data))
+        
+        self.assertEqual(without_processed_at(processor.clean_data(test_data)), expected)
+        self.assertEqual(without_processed_at(processor.clean_data(test_data[:3])), expected)
+        self.assertEqual([item['symbol'] for item in expected], ['AAPL', 'MSFT', 'NKE'])
+        self.assertEqual(test_data[0]['current_price'], '$150.25')
+    
+    def test_clean_volume(self):
+        processor = DataProcessor()
+        
+        self.assertEqual(processor._clean_volume('7.81M'), 7810000.0)
+        self.assertEqual(processor._clean_volume('950.20K'), 950200.0)
+        self.assertEqual(processor._clean_volume('1,234'), 1234.0)
+        self.assertIsNone(processor._clean_volume('-'))
+    
     def test_clean_data(self):
         processor = DataProcessor()
         
@@ -98,7 +424,53 @@ class TestDataProcessor(unittest.TestCase):
         self.assertEqual(result[0]['price_change'], 2.75)
         self.assertEqual(result[0]['timestamp'], '2023-01-01T12:00:00')
         self.assertIn('processed_at', result[0])
-
+    
+    
+    def test_process_stream_matches_process_data(self):
+        processor = DataProcessor()
+        test_data = [
+            {'symbol': 'AAPL', 'current_price': '$150.25', 'price_change': '+2.75', 'timestamp': '2023-01-01T12:00:00'},
+            {'symbol': 'MSFT', 'current_price': '$245.50', 'price_change': '-1.25', 'timestamp': '2023-01-02T12:00:00'},
+            {'symbol': 'NKE', 'current_price': '98.76', 'price_change': '+1.23', 'timestamp': '2023-02-02T12:00:00'},
+            {'symbol': 'ZERO', 'current_price': '1.50', 'price_change': '+1.50', 'timestamp': '2023-01-03T12:00:00'},
+            {'symbol': 'NA', 'current_price': 'N/A', 'price_change': '+0.50', 'timestamp': '2023-01-04T12:00:00'},
+        ]
+        
+        streamed = list(processor.process_stream(iter(test_data), '2023-01-01', '2023-01-31'))
+        df = processor.process_data(test_data, '2023-01-01', '2023-01-31')
+        
+        self.assertEqual([item['symbol'] for item in streamed], list(df['symbol']))
+        self.assertTrue(all('percent_change' in item for item in streamed))
+        self.assertEqual([item['percent_change'] for item in streamed[2:]], [None, None])
+        self.assertTrue(df['percent_change'].iloc[2:].isna().all())
+        np.testing.assert_allclose(pd.DataFrame(streamed)['percent_change'].astype(float), df['percent_change'])
+    
+    def test_process_columns_matches_process_data(self):
+        processor = DataProcessor()
+        test_data = [
+            {'symbol': 'AAPL', 'current_price': '$150.25', 'price_change': '+2.75', 'volume': '7.81M', 'timestamp': '2023-01-01T12:00:00'},
+            {'symbol': 'MSFT', 'current_price': 'N/A', 'price_change': '(1.25)', 'volume': None, 'timestamp': '2023-01-02T12:00:00'},
+        ]
+        columns = {name: [item[name] for item in test_data] for name in test_data[0]}
+        
+        df = processor.process_columns(columns, '2023-01-01', '2023-01-31')
+        expected = processor.process_data(test_data, '2023-01-01', '2023-01-31')
+        
+        pd.testing.assert_frame_equal(df.drop(columns='processed_at'), expected.drop(columns='processed_at'))
+    
+    def test_filter_by_date_leaves_input_untouched(self):
+        processor = DataProcessor()
+        df = pd.DataFrame({
+            'symbol': ['AAPL', 'MSFT', 'NKE', 'AAPL'],
+            'timestamp': ['2023-01-03T12:00:00', '2023-01-01T12:00:00', '2023-02-02T12:00:00', '2023-01-02T12:00:00'],
+        })
+        
+        unsorted = processor.filter_by_date(df, '2023-01-02', '2023-01-31')
+        ordered = processor.filter_by_date(df.sort_values('timestamp'), '2023-01-02', '2023-01-31')
+        
+        self.assertFalse(pd.api.types.is_datetime64_any_dtype(df['timestamp']))
+        self.assertEqual(list(unsorted['timestamp'].dt.day), [3, 2])
+        self.assertEqual(list(ordered['timestamp'].dt.day), [2, 3])
 
 class TestS3Manager(unittest.TestCase):
     """
@@ -146,6 +518,7 @@ class TestLambdaHandler(unittest.TestCase):
         mock_scraper_instance = MagicMock()
         mock_scraper.return_value = mock_scraper_instance
         mock_scraper_instance.scrape_multiple_stocks.return_value = [{'symbol': 'TEST'}]
+        mock_scraper_instance.batch_summary.to_dict.return_value = {'succeeded': 1, 'retried': [], 'skipped': [], 'failed': []}
         
         mock_processor_instance = MagicMock()
         mock_processor.return_value = mock_processor_instance
@@ -173,7 +546,70 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertEqual(response_body['data']['stock_symbols'], ['test-stock'])
         self.assertEqual(response_body['data']['s3_uri'], 's3://test-bucket/test-key.json')
         self.assertEqual(response_body['data']['download_url'], 'https://presigned-url.example.com')
-
+    
+    
+    @patch('lambda_handler.HISTORY_BACKFILL', True)
+    @patch('lambda_handler.BackfillManager')
+    @patch('lambda_handler.StockScraper')
+    @patch('lambda_handler.DataProcessor')
+    @patch('lambda_handler.S3Manager')
+    def test_lambda_handler_backfills_history(self, mock_s3_manager, mock_processor, mock_scraper, mock_backfill):
+        mock_backfill.return_value.backfill_many.return_value = [{'symbol': 'nike', 'date': '2023-01-03'}]
+        mock_scraper.return_value.batch_summary.to_dict.return_value = {}
+        mock_s3_manager.return_value.upload_data.return_value = 's3://test-bucket/test-key.json'
+        mock_s3_manager.return_value.generate_presigned_url.return_value = 'https://presigned-url.example.com'
+        
+        test_event = {
+            'body': json.dumps({
+                'stock_symbols': ['nike'],
+                'start_date': '2023-01-01',
+                'end_date': '2023-01-31'
+            })
+        }
+        
+        response = lambda_handler(test_event, None)
+        
+        self.assertEqual(response['statusCode'], 200)
+        mock_backfill.return_value.backfill_many.assert_called_once_with(['nike'], '2023-01-01', '2023-01-31')
+        mock_scraper.return_value.scrape_multiple_stocks.assert_not_called()
+    
+    @patch('lambda_handler.DEFAULT_LISTING_URLS', ['https://www.investing.com/equities/united-states'])
+    @patch('lambda_handler.StockScraper')
+    @patch('lambda_handler.DataProcessor')
+    @patch('lambda_handler.S3Manager')
+    def test_lambda_handler_uses_listing_pages(self, mock_s3_manager, mock_processor, mock_scraper):
+        mock_scraper.return_value.scrape_from_listings.return_value = [{'symbol': 'nike'}]
+        mock_scraper.return_value.batch_summary.to_dict.return_value = {}
+        mock_s3_manager.return_value.upload_data.return_value = 's3://test-bucket/test-key.json'
+        mock_s3_manager.return_value.generate_presigned_url.return_value = 'https://presigned-url.example.com'
+        
+        response = lambda_handler({'body': json.dumps({'stock_symbols': ['nike']})}, None)
+        
+        self.assertEqual(response['statusCode'], 200)
+        mock_scraper.return_value.scrape_from_listings.assert_called_once_with(
+            ['nike'], listing_urls=['https://www.investing.com/equities/united-states'], concurrency=10
+        )
+        mock_scraper.return_value.scrape_multiple_stocks.assert_not_called()
+    
+    @patch('lambda_handler.LOCAL_TESTING', False)
+    @patch('lambda_handler.DELTA_MODE', True)
+    @patch('lambda_handler.DeltaTracker')
+    @patch('lambda_handler.StockScraper')
+    @patch('lambda_handler.DataProcessor')
+    @patch('lambda_handler.S3Manager')
+    def test_lambda_handler_skips_upload_without_changes(self, mock_s3_manager, mock_processor, mock_scraper, mock_tracker):
+        mock_scraper.return_value.scrape_multiple_stocks.return_value = [{'symbol': 'nike'}]
+        mock_scraper.return_value.batch_summary.to_dict.return_value = {}
+        mock_tracker.return_value.filter.return_value = ([], False)
+        
+        response = lambda_handler({'body': json.dumps({'stock_symbols': ['nike']})}, None)
+        
+        self.assertEqual(response['statusCode'], 200)
+        response_body = json.loads(response['body'])
+        self.assertEqual(response_body['data']['delta'], {'snapshot': False, 'changed': 0, 'unchanged': 1})
+        mock_processor.return_value.process_data.assert_not_called()
+        mock_s3_manager.return_value.upload_data.assert_not_called()
+        mock_tracker.return_value.save.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from single_flight import SingleFlight
+from scraper import StockScraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+class FakeClock:
+    """
+    A manually advanced clock
+    """
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Test cases for the SingleFlight class
+    """
+    
+    def test_concurrent_calls_share_one_result(self):
+        group = SingleFlight(ttl=0)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return 'page'
+        
+        results = []
+        leader = threading.Thread(target=lambda: results.append(group.do('nike', fetch)))
+        leader.start()
+        started.wait()
+        
+        followers = [threading.Thread(target=lambda: results.append(group.do('nike', fetch))) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        while group.stats()['coalesced'] < 3:
+            pass
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+        
+        self.assertEqual(results, ['page'] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(group.stats()['kept'], 0)
+    
+    def test_results_are_reused_within_ttl(self):
+        clock = FakeClock()
+        group = SingleFlight(ttl=5, clock=clock)
+        fetch = MagicMock(side_effect=['first', 'second'])
+        
+        self.assertEqual(group.do('nike', fetch), 'first')
+        clock.now = 4
+        self.assertEqual(group.do('nike', fetch), 'first')
+        clock.now = 10
+        self.assertEqual(group.do('nike', fetch), 'second')
+        
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(group.stats()['reused'], 1)
+    
+    def test_failures_are_not_kept(self):
+        group = SingleFlight(ttl=5)
+        fetch = MagicMock(side_effect=[ValueError('boom'), 'page'])
+        
+        with self.assertRaises(ValueError):
+            group.do('nike', fetch)
+        
+        self.assertEqual(group.do('nike', fetch), 'page')
+    
+    def test_forget(self):
+        group = SingleFlight(ttl=5)
+        fetch = MagicMock(side_effect=['first', 'second'])
+        
+        group.do('nike', fetch)
+        group.forget('nike')
+        
+        self.assertEqual(group.do('nike', fetch), 'second')
+
+
+class TestStockScraperSingleFlight(unittest.TestCase):
+    """
+    Test cases for duplicate symbols in StockScraper batches
+    """
+    
+    def setUp(self):
+        with open(os.path.join(FIXTURE_DIR, 'nike.html')) as f:
+            self.html = f.read()
+    
+    @patch('scraper.StockScraper._get_page_content')
+    def test_duplicate_symbols_fetch_once(self, mock_get_page_content):
+        mock_get_page_content.return_value = self.html
+        scraper = StockScraper(single_flight=SingleFlight(ttl=5))
+        
+        result = scraper.scrape_multiple_stocks_threaded(['nike', 'nike', 'nike'], max_workers=3)
+        
+        mock_get_page_content.assert_called_once()
+        self.assertEqual([item['symbol'] for item in result], ['nike', 'nike', 'nike'])
+        
+        result[0]['current_price'] = 'changed'
+        self.assertNotEqual(result[1]['current_price'], 'changed')
+    
+    @patch('scraper.StockScraper._get_page_content')
+    def test_default_group_does_not_reuse_results(self, mock_get_page_content):
+        mock_get_page_content.return_value = self.html
+        scraper = StockScraper()
+        
+        scraper.scrape_stock_data('nike')
+        scraper.scrape_stock_data('nike')
+        
+        self.assertEqual(mock_get_page_content.call_count, 2)
+        self.assertEqual(scraper.single_flight.ttl, 0)
+    
+    @patch('scraper.StockScraper._get_page_content')
+    def test_shared_group_spans_scrapers(self, mock_get_page_content):
+        mock_get_page_content.return_value = self.html
+        group = SingleFlight(ttl=60)
+        
+        StockScraper(single_flight=group).scrape_multiple_stocks(['nike'])
+        StockScraper(single_flight=group).scrape_multiple_stocks(['nike', 'adidas'])
+        
+        self.assertEqual(
+            [call.args[0] for call in mock_get_page_content.call_args_list],
+            ['https://www.investing.com/equities/nike', 'https://www.investing.com/equities/adidas']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from scraper import StockScraper
+from writers import open_output, write_arrow, write_csv, write_json_array, write_ndjson, write_parquet
+
+RECORDS = [
+    {'symbol': 'nike', 'company_name': 'Nike Inc (NKE)', 'current_price': '98.76', 'price_change': '+1.23', 'timestamp': '2025-05-08T20:00:00'},
+    {'symbol': 'nestle', 'company_name': 'Nestlé SA (NESN)', 'current_price': '1,234.50', 'price_change': '-0.50', 'timestamp': '2025-05-08T20:00:01'},
+]
+
+class TestWriters(unittest.TestCase):
+    """
+    Test cases for the streaming writers
+    """
+    
+    def test_json_array_matches_json_dump(self):
+        for records in ([], RECORDS[:1], RECORDS):
+            with self.subTest(count=len(records)):
+                expected = io.StringIO()
+                json.dump(records, expected, indent=4)
+                
+                output = io.StringIO()
+                count = write_json_array(iter(records), output)
+                
+                self.assertEqual(output.getvalue(), expected.getvalue())
+                self.assertEqual(count, len(records))
+    
+    def test_compact_json_array(self):
+        output = io.StringIO()
+        write_json_array(RECORDS, output, compact=True)
+        
+        self.assertEqual(json.loads(output.getvalue()), RECORDS)
+        self.assertNotIn(', ', output.getvalue())
+        self.assertIn('Nestlé', output.getvalue())
+    
+    def test_csv_matches_dict_writer(self):
+        expected = io.StringIO()
+        writer = csv.DictWriter(expected, fieldnames=RECORDS[0].keys())
+        writer.writeheader()
+        writer.writerows(RECORDS)
+        
+        output = io.StringIO()
+        count = write_csv(iter(RECORDS), output)
+        
+        self.assertEqual(output.getvalue(), expected.getvalue())
+        self.assertEqual(count, 2)
+    
+    def test_ndjson(self):
+        output = io.StringIO()
+        write_ndjson(iter(RECORDS), output, compact=True)
+        
+        self.assertEqual([json.loads(line) for line in output.getvalue().splitlines()], RECORDS)
+    
+    def test_gzip_output_round_trips(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'quotes.ndjson.gz')
+            with open_output(path, 'gzip') as f:
+                write_ndjson(RECORDS, f)
+            
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                self.assertEqual([json.loads(line) for line in f], RECORDS)
+    
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd_output_round_trips(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'quotes.csv.zst')
+            with open_output(path, 'zstd') as f:
+                write_csv(RECORDS, f)
+            
+            with open(path, 'rb') as f:
+                content = zstandard.ZstdDecompressor().stream_reader(f).read().decode('utf-8')
+            self.assertEqual(list(csv.DictReader(io.StringIO(content))), RECORDS)
+    
+    def test_unsupported_compression(self):
+        with self.assertRaises(ValueError):
+            open_output('quotes.ndjson.bz2', 'bz2')
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_parquet_dtypes_and_row_groups(self):
+        records = [dict(record, current_price=float(index)) for index, record in enumerate(RECORDS * 3)]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'quotes.parquet')
+            count = write_parquet(iter(records), path, row_group_size=4)
+            parquet_file = pq.ParquetFile(path)
+            schema = parquet_file.schema_arrow
+            table = parquet_file.read()
+        
+        self.assertEqual(count, 6)
+        self.assertEqual(parquet_file.num_row_groups, 2)
+        self.assertEqual(schema.names, list(RECORDS[0].keys()))
+        self.assertTrue(pa.types.is_dictionary(schema.field('symbol').type))
+        self.assertTrue(pa.types.is_dictionary(schema.field('company_name').type))
+        self.assertEqual(schema.field('current_price').type, pa.float64())
+        self.assertEqual(schema.field('timestamp').type, pa.timestamp('us'))
+        self.assertEqual(table.column('company_name').to_pylist(), [record['company_name'] for record in records])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_parquet_parses_scraped_prices(self):
+        scraper = StockScraper()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'quotes.parquet')
+            scraper.save_to_parquet(RECORDS, path)
+            table = pq.read_table(path)
+        
+        self.assertEqual(table.schema.field('current_price').type, pa.float64())
+        self.assertEqual(table.schema.field('price_change').type, pa.float64())
+        self.assertEqual(table.column('current_price').to_pylist(), [98.76, 1234.5])
+        self.assertEqual(table.column('price_change').to_pylist(), [1.23, -0.5])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_columns_missing_from_the_first_row_group(self):
+        history = [
+            {'symbol': 'nike', 'date': f'2025-05-0{day}', 'close': '98.10', 'volume': None, 'note': None}
+            for day in range(1, 4)
+        ] + [
+            {'symbol': 'nike', 'date': f'2025-05-0{day}', 'close': '99.20', 'volume': '1.2M', 'note': 'split'}
+            for day in range(4, 7)
+        ]
+        
+        buffer = io.BytesIO()
+        count = write_parquet(iter(history), buffer, row_group_size=3)
+        table = pq.read_table(buffer)
+        arrow_buffer = io.BytesIO()
+        write_arrow(iter(history), arrow_buffer, row_group_size=3)
+        
+        self.assertEqual(count, 6)
+        self.assertEqual(table.schema.field('volume').type, pa.float64())
+        self.assertEqual(table.schema.field('note').type, pa.string())
+        self.assertEqual(table.column('volume').to_pylist(), [None] * 3 + [1.2e6] * 3)
+        self.assertEqual(table.column('note').to_pylist(), [None] * 3 + ['split'] * 3)
+        self.assertEqual(pa.ipc.open_file(arrow_buffer).read_all().num_rows, 6)
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_arrow_record_batches(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'quotes.arrow')
+            write_arrow(RECORDS * 3, path, row_group_size=2)
+            reader = pa.ipc.open_file(path)
+            batches = reader.num_record_batches
+            table = reader.read_all()
+        
+        self.assertEqual(batches, 3)
+        self.assertEqual(table.column('symbol').to_pylist(), ['nike', 'nestle'] * 3)
+    
+    def test_save_to_json_accepts_generators(self):
+        scraper = StockScraper()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'quotes.json.gz')
+            scraper.save_to_json((record for record in RECORDS), path, compression='gzip')
+            
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                self.assertEqual(json.load(f), RECORDS)
+            
+            empty_path = os.path.join(temp_dir, 'empty.json')
+            scraper.save_to_json(iter([]), empty_path)
+            self.assertFalse(os.path.exists(empty_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
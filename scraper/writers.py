@@ -0,0 +1,375 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+from functools import partial
+from itertools import chain, islice
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from data_processor import PRICE_FIELDS, DataProcessor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+COMPRESSION_EXTENSIONS = {
+    None: '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+# Records serialized per write call
+WRITE_BATCH_SIZE = 1000
+
+DEFAULT_ROW_GROUP_SIZE = int(os.environ.get('PARQUET_ROW_GROUP_SIZE', '100000'))
+
+# Low-cardinality text columns stored as dictionaries in columnar output
+DICTIONARY_COLUMNS = ('symbol', 'company_name')
+TIMESTAMP_COLUMNS = ('timestamp', 'processed_at')
+DATE_COLUMNS = ('date',)
+# Scraped text columns parsed to numbers in columnar output
+NUMERIC_COLUMNS = PRICE_FIELDS + ('volume',)
+
+_processor = DataProcessor()
+
+
+def open_output(filename, compression=None, level=None):
+    """
+    Open a text file for writing, optionally compressed
+    
+    Args:
+        filename (str): Path of the output file
+        compression (str, optional): None, 'gzip' or 'zstd'
+        level (int, optional): Compression level, defaults to 6 for gzip and 3 for zstd
+    
+    Returns:
+        file: Text file object to write to
+    """
+    if compression is None:
+        return open(filename, 'w', newline='', encoding='utf-8')
+    
+    if compression == 'gzip':
+        return gzip.open(filename, 'wt', compresslevel=level or 6, newline='', encoding='utf-8')
+    
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+        compressor = zstandard.ZstdCompressor(level=level or 3)
+        stream = compressor.stream_writer(open(filename, 'wb'), closefd=True)
+        return io.TextIOWrapper(stream, newline='', encoding='utf-8')
+    
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def peek(records):
+    """
+    Get the first record of an iterable without losing it
+    
+    Args:
+        records (iterable): Records
+    
+    Returns:
+        tuple: (first record or None, iterator over all records)
+    """
+    iterator = iter(records)
+    for first in iterator:
+        return first, chain([first], iterator)
+    return None, iterator
+
+
+def _dumps(compact):
+    if compact:
+        return json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, check_circular=False).encode
+    return json.dumps
+
+
+def write_csv(records, fileobj, fieldnames=None):
+    """
+    Write records as CSV rows
+    
+    The header is written before the rest of the records are seen, so
+    columns that only later records have are left out and logged rather than
+    failing partway through the file.
+    
+    Args:
+        records (iterable): Dictionaries to write
+        fileobj (file): Text file object
+        fieldnames (list, optional): Columns, defaults to the keys of the first record
+    
+    Returns:
+        int: Number of records written
+    """
+    first, records = peek(records)
+    if first is None:
+        return 0
+    
+    fieldnames = fieldnames or list(first.keys())
+    writer = csv.DictWriter(fileobj, fieldnames=fieldnames, extrasaction='ignore')
+    writer.writeheader()
+    
+    known = set(fieldnames)
+    count = 0
+    while True:
+        batch = list(islice(records, WRITE_BATCH_SIZE))
+        if not batch:
+            return count
+        dropped = set().union(*batch) - known
+        if dropped:
+            logger.warning(f"Dropping columns not in the CSV header: {', '.join(sorted(map(str, dropped)))}")
+            known |= dropped
+        writer.writerows(batch)
+        count += len(batch)
+
+
+def write_ndjson(records, fileobj, compact=False):
+    """
+    Write records as newline-delimited JSON
+    
+    Args:
+        records (iterable): Dictionaries to write
+        fileobj (file): Text file object
+        compact (bool, optional): Drop the spaces after separators and keep
+            non-ASCII characters unescaped
+    
+    Returns:
+        int: Number of records written
+    """
+    dumps = _dumps(compact)
+    records = iter(records)
+    
+    count = 0
+    while True:
+        batch = list(islice(records, WRITE_BATCH_SIZE))
+        if not batch:
+            return count
+        fileobj.write(''.join(dumps(record) + '\n' for record in batch))
+        count += len(batch)
+
+
+def write_json_array(records, fileobj, compact=False):
+    """
+    Write records as a JSON array one element at a time
+    
+    Without compact the output is byte for byte what json.dump(records,
+    indent=4) produces, as written by save_to_json.
+    
+    Args:
+        records (iterable): Dictionaries to write
+        fileobj (file): Text file object
+        compact (bool, optional): Write the array without whitespace
+    
+    Returns:
+        int: Number of records written
+    """
+    # Each batch is encoded as one array and its brackets trimmed, which is
+    # as fast as encoding the whole list at once
+    if compact:
+        encode = _dumps(True)
+        opening, separator, closing, trim = '[', ',', ']', 1
+    else:
+        encode = partial(json.dumps, indent=4)
+        opening, separator, closing, trim = '[\n', ',\n', '\n]', 2
+    
+    records = iter(records)
+    count = 0
+    while True:
+        batch = list(islice(records, WRITE_BATCH_SIZE))
+        if not batch:
+            break
+        prefix = opening if count == 0 else separator
+        fileobj.write(prefix + encode(batch)[trim:-trim])
+        count += len(batch)
+    
+    fileobj.write(closing if count else '[]')
+    return count
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet and Arrow output require the pyarrow package")
+
+
+def _empty_column_type(name):
+    """
+    Get the type of a column that has no values yet
+    
+    The first batch of a stream fixes the schema every later batch is cast
+    to, and nothing casts to the null type Arrow infers for an all-missing
+    column, so such columns take the type their values would get.
+    """
+    if name in NUMERIC_COLUMNS:
+        return pa.float64()
+    if name in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if name in TIMESTAMP_COLUMNS:
+        return pa.timestamp('us')
+    if name in DATE_COLUMNS:
+        return pa.date32()
+    return pa.string()
+
+
+def _parse_numbers(name, column):
+    values = column.to_pylist()
+    if name == 'volume':
+        values = [_processor._clean_volume(value) for value in values]
+    else:
+        values = _processor.clean_price_column(values)
+    return pa.array(values, type=pa.float64())
+
+
+def _apply_dtypes(table):
+    for index, name in enumerate(table.column_names):
+        column = table.column(index)
+        if pa.types.is_null(column.type):
+            column = column.cast(_empty_column_type(name))
+        elif not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+            continue
+        elif name in NUMERIC_COLUMNS:
+            column = _parse_numbers(name, column)
+        elif name in DICTIONARY_COLUMNS:
+            column = column.dictionary_encode()
+        elif name in TIMESTAMP_COLUMNS or name in DATE_COLUMNS:
+            target = pa.timestamp('us') if name in TIMESTAMP_COLUMNS else pa.date32()
+            try:
+                column = column.cast(target)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                # Values that are not plain ISO dates stay as text
+                continue
+        else:
+            continue
+        
+        table = table.set_column(index, name, column)
+    return table
+
+
+def to_arrow_table(data, schema=None):
+    """
+    Convert records or a DataFrame to an Arrow table with analytics dtypes
+    
+    symbol and company_name become dictionary columns, scraped price and
+    volume strings become floats, and ISO timestamp and date strings become
+    timestamp and date columns. Columns without any values get the type
+    their values would have, or string for unknown columns.
+    
+    Args:
+        data (iterable or pandas.DataFrame): Records to convert
+        schema (pyarrow.Schema, optional): Schema to cast the table to, so
+            every batch of a stream matches the first
+    
+    Returns:
+        pyarrow.Table: Converted table
+    """
+    _require_pyarrow()
+    
+    if hasattr(data, 'columns'):
+        table = pa.Table.from_pandas(data, preserve_index=False)
+    else:
+        table = pa.Table.from_pylist(list(data))
+    
+    table = _apply_dtypes(table)
+    if schema is not None:
+        table = table.cast(schema)
+    return table
+
+
+def _iter_tables(records, batch_size):
+    if hasattr(records, 'to_arrow'):
+        # A QuoteBatch is already columnar
+        yield records.to_arrow()
+        return
+    if hasattr(records, 'columns'):
+        yield to_arrow_table(records)
+        return
+    
+    first, records = peek(records)
+    if hasattr(first, 'columns'):
+        # A stream of DataFrames, such as DataProcessor.process_chunks yields
+        schema = None
+        for frame in records:
+            table = to_arrow_table(frame, schema)
+            schema = table.schema
+            yield table
+        return
+    
+    schema = None
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        table = to_arrow_table(batch, schema)
+        schema = table.schema
+        yield table
+
+
+def write_parquet(records, where, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression='snappy'):
+    """
+    Write records as Parquet, one row group per row_group_size records
+    
+    Args:
+        records (iterable, pandas.DataFrame or QuoteBatch): Records to write,
+            or DataFrames to write one after another
+        where (str or file): Output path or binary file object
+        row_group_size (int, optional): Maximum rows per row group
+        compression (str, optional): Parquet compression codec
+    
+    Returns:
+        int: Number of records written
+    """
+    _require_pyarrow()
+    
+    writer = None
+    count = 0
+    try:
+        for table in _iter_tables(records, row_group_size):
+            if writer is None:
+                writer = pq.ParquetWriter(where, table.schema, compression=compression)
+            writer.write_table(table, row_group_size=row_group_size)
+            count += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def write_arrow(records, where, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Write records as an Arrow IPC file, one record batch per row_group_size records
+    
+    Args:
+        records (iterable, pandas.DataFrame or QuoteBatch): Records to write,
+            or DataFrames to write one after another
+        where (str or file): Output path or binary file object
+        row_group_size (int, optional): Maximum rows per record batch
+    
+    Returns:
+        int: Number of records written
+    """
+    _require_pyarrow()
+    
+    writer = None
+    count = 0
+    try:
+        for table in _iter_tables(records, row_group_size):
+            if writer is None:
+                writer = pa.ipc.new_file(where, table.schema)
+            writer.write_table(table, max_chunksize=row_group_size)
+            count += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
@@ -9,7 +9,7 @@ interface FormValues {
   stockSymbols: string[];
   startDate: Date;
   endDate: Date;
-  outputFormat: "json" | "csv";
+  outputFormat: "json" | "csv" | "parquet" | "arrow";
 }
 
 interface StockData {
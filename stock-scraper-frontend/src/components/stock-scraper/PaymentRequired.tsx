@@ -25,7 +25,7 @@ export function PaymentRequired({ onProceedToPayment }: PaymentRequiredProps) {
             <li>Scrape historical stock price data from multiple sources</li>
             <li>Support for multiple stock symbols in a single request</li>
             <li>Customizable date ranges for targeted data collection</li>
-            <li>Export data in JSON or CSV format</li>
+            <li>Export data in JSON, CSV, Parquet or Arrow format</li>
             <li>Secure storage of results in Amazon S3</li>
             <li>Download links valid for 1 hour</li>
           </ul>
@@ -22,7 +22,7 @@ const formSchema = z.object({
   endDate: z.date({
     required_error: "End date is required",
   }),
-  outputFormat: z.enum(["json", "csv"], {
+  outputFormat: z.enum(["json", "csv", "parquet", "arrow"], {
     required_error: "Please select an output format",
   }),
 });
@@ -231,6 +231,18 @@ export function StockScraperForm({ onSubmit, isPending }: StockScraperFormProps)
                         </FormControl>
                         <FormLabel className="font-normal">CSV</FormLabel>
                       </FormItem>
+                      <FormItem className="flex items-center space-x-2 space-y-0">
+                        <FormControl>
+                          <RadioGroupItem value="parquet" />
+                        </FormControl>
+                        <FormLabel className="font-normal">Parquet</FormLabel>
+                      </FormItem>
+                      <FormItem className="flex items-center space-x-2 space-y-0">
+                        <FormControl>
+                          <RadioGroupItem value="arrow" />
+                        </FormControl>
+                        <FormLabel className="font-normal">Arrow</FormLabel>
+                      </FormItem>
                     </RadioGroup>
                   </FormControl>
                   <FormMessage />
@@ -7,7 +7,7 @@ export interface ScrapeRequestParams {
   stockSymbols: string[];
   startDate: string;
   endDate: string;
-  outputFormat: 'json' | 'csv';
+  outputFormat: 'json' | 'csv' | 'parquet' | 'arrow';
 }
 
 export interface ScrapeResponse {